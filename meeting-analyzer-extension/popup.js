@@ -23,6 +23,9 @@ document.addEventListener('DOMContentLoaded', () => {
   const jsonBodyInput = document.getElementById('json-body');
 
   let currentInputMode = 'transcript';
+  // 'captions' while the transcript box holds captions scraped from Google Meet
+  let transcriptSource = null;
+  transcriptInput.addEventListener('input', () => { transcriptSource = null; });
 
   // Check for auto-loaded transcript from Google Meet
   loadTranscriptFromGoogleMeet();
@@ -60,6 +63,61 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   });
 
+  // SHA-256 of the transcript with whitespace runs collapsed, matching the server's transcript hash
+  async function transcriptHash(transcript) {
+    const normalized = transcript.split(/\s+/).filter(Boolean).join(' ');
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(normalized));
+    return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+  }
+
+  function getStored(key) {
+    return new Promise(resolve => {
+      if (typeof chrome === 'undefined' || !chrome.storage) {
+        resolve(undefined);
+        return;
+      }
+      chrome.storage.local.get([key], data => resolve(data[key]));
+    });
+  }
+
+  // Look up an existing analysis of this transcript by hash before uploading it.
+  // The last result is kept with its ETag, so reopening the popup only costs a 304.
+  // Returns null if there is none (or the lookup fails), so the caller POSTs as usual.
+  async function findStoredAnalysis(endpoint, payload) {
+    const base = endpoint.match(/^(.*)\/analyze\/?$/);
+    if (!base || typeof crypto === 'undefined' || !crypto.subtle) return null;
+
+    try {
+      const hash = await transcriptHash(payload.transcript);
+      // Only an analysis made with the same options matches
+      const params = new URLSearchParams();
+      if (payload.model && payload.model !== 'auto') params.set('model', payload.model);
+      for (const key of ['meeting_duration_minutes', 'meeting_booked_duration', 'expected_attendees', 'output_mode', 'source']) {
+        if (payload[key] !== undefined && payload[key] !== null) params.set(key, payload[key]);
+      }
+      const query = params.toString();
+      const url = `${base[1]}/analyses/${hash}${query ? `?${query}` : ''}`;
+      const cached = await getStored('lastAnalysis');
+      const headers = {};
+      if (cached && cached.url === url && cached.etag) {
+        headers['If-None-Match'] = cached.etag;
+      }
+
+      const response = await fetch(url, { headers });
+      if (response.status === 304) return cached.result;
+      if (!response.ok) return null;
+
+      const result = await response.json();
+      if (typeof chrome !== 'undefined' && chrome.storage) {
+        chrome.storage.local.set({ lastAnalysis: { url, etag: response.headers.get('ETag'), result } });
+      }
+      return result;
+    } catch (e) {
+      console.log('[Meeting Analyzer] Stored analysis lookup failed:', e);
+      return null;
+    }
+  }
+
   // Core analyze function - can be called programmatically or via button
   async function analyzeTranscript() {
     let payload;
@@ -99,6 +157,7 @@ document.addEventListener('DOMContentLoaded', () => {
         expected_attendees: parseInt(attendeesInput.value) || 4,
         meeting_booked_duration: parseInt(bookedDurationInput.value) || 50
       };
+      if (transcriptSource) payload.source = transcriptSource;
     }
 
     // Show loading state
@@ -107,6 +166,12 @@ document.addEventListener('DOMContentLoaded', () => {
 
     try {
       const endpoint = endpointInput.value.trim() || 'http://localhost:8001/analyze';
+
+      const stored = await findStoredAnalysis(endpoint, payload);
+      if (stored) {
+        showResults(stored);
+        return;
+      }
       
       const response = await fetch(endpoint, {
         method: 'POST',
@@ -136,13 +201,7 @@ document.addEventListener('DOMContentLoaded', () => {
       }
 
       const data = await response.json();
-      displayResults(data);
-      
-      // Switch to results tab
-      tabs.forEach(t => t.classList.remove('active'));
-      tabs[1].classList.add('active');
-      inputTab.classList.remove('active');
-      resultsTab.classList.add('active');
+      showResults(data);
 
     } catch (error) {
       console.error('Analysis error:', error);
@@ -155,6 +214,16 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
 
+  function showResults(data) {
+    displayResults(data);
+    
+    // Switch to results tab
+    tabs.forEach(t => t.classList.remove('active'));
+    tabs[1].classList.add('active');
+    inputTab.classList.remove('active');
+    resultsTab.classList.add('active');
+  }
+
   // Analyze button click
   analyzeBtn.addEventListener('click', analyzeTranscript);
 
@@ -373,6 +442,7 @@ document.addEventListener('DOMContentLoaded', () => {
           
           // Fill in the transcript mode form
           transcriptInput.value = transcriptText;
+          transcriptSource = 'captions';
           durationInput.value = duration;
           attendeesInput.value = attendees;
           
@@ -382,7 +452,8 @@ document.addEventListener('DOMContentLoaded', () => {
             model: modelSelect.value || 'gpt-4.1',
             meeting_duration_minutes: duration,
             expected_attendees: attendees,
-            meeting_booked_duration: parseInt(bookedDurationInput.value) || 50
+            meeting_booked_duration: parseInt(bookedDurationInput.value) || 50,
+            source: 'captions'
           };
           jsonBodyInput.value = JSON.stringify(jsonPayload, null, 2);
           
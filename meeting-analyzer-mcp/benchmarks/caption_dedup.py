@@ -0,0 +1,134 @@
+"""Measure caption de-duplication on simulated multi-hour Meet caption dumps.
+
+Meet captions are simulated from the sample transcript: each turn is
+revealed a few words at a time, the last word is sometimes rendered wrong
+and then corrected, the caption box scrolls once it holds more than --box
+words, and some renders are captured twice. Turns are repeated (with their
+words rotated) until the dump covers --hours of speech at 150 words per
+minute.
+
+For each dump size the benchmark reports the fragments and words in the
+dump, the words left after dedup_captions() compared with the words
+actually spoken (inflation; 1.00 is perfect), the share of spoken words kept
+(recall), and the time taken. A naive de-duplicator that compares every
+fragment with all earlier fragments of its speaker, word by word, is timed
+on the smaller dumps for comparison.
+
+Run from the meeting-analyzer-mcp directory:
+
+    uv run python benchmarks/caption_dedup.py
+    uv run python benchmarks/caption_dedup.py --hours 0.25 1 4 8 --naive-max-hours 4
+"""
+
+import argparse
+import random
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+from meeting_analyzer.compaction import iter_turns, split_speaker
+from meeting_analyzer.dedup import dedup_captions
+
+ROOT = Path(__file__).parent.parent
+WORDS_PER_MINUTE = 150
+MISHEARD = ["uh", "the", "a", "and", "so", "to"]
+
+
+def simulate_captions(turns: list[tuple[str, str]], words: int, box: int, rng: random.Random) -> tuple[str, list[str]]:
+    """A caption dump of about `words` spoken words, and the words actually spoken."""
+    lines, spoken = [], []
+    repetition = 0
+    while len(spoken) < words:
+        repetition += 1
+        for speaker, text in turns:
+            # Rotate the words on every repetition so later hours don't repeat earlier speech verbatim
+            turn_words = text.split()
+            shift = repetition % len(turn_words)
+            turn_words = turn_words[shift:] + turn_words[:shift]
+            spoken.extend(turn_words)
+            shown = 0
+            while shown < len(turn_words):
+                shown = min(len(turn_words), shown + rng.randint(1, 4))
+                visible = turn_words[max(0, shown - box):shown]
+                if shown < len(turn_words) and rng.random() < 0.2:
+                    # Misheard last word, corrected by the next render
+                    lines.append(f"**{speaker}:** {' '.join(visible[:-1] + [rng.choice(MISHEARD)])}")
+                lines.append(f"**{speaker}:** {' '.join(visible)}")
+                if rng.random() < 0.1:
+                    lines.append(lines[-1])
+    return "\n\n".join(lines), spoken
+
+
+def naive_dedup(transcript: str) -> int:
+    """Word-level de-duplication without rolling hashes: every fragment is compared
+    with all earlier fragments of its speaker at every offset (quadratic).
+
+    Returns:
+        Words kept
+    """
+    history: dict[str, list[list[str]]] = {}
+    kept = 0
+    for line in transcript.splitlines():
+        speaker, text = split_speaker(line)
+        words = [re.sub(r"[^\w']+", "", word.lower()) for word in text.split()]
+        if not words:
+            continue
+        earlier = history.setdefault(speaker, [])
+        size = len(words)
+        if any(fragment[i:i + size] == words for fragment in earlier for i in range(len(fragment) - size + 1)):
+            continue
+        overlap = 0
+        if earlier:
+            for k in range(min(len(earlier[-1]), size - 1), 0, -1):
+                if earlier[-1][-k:] == words[:k]:
+                    overlap = k
+                    break
+        earlier.append(words)
+        kept += size - overlap
+    return kept
+
+
+def normalized(words: list[str]) -> Counter:
+    return Counter(re.sub(r"[^\w']+", "", word.lower()) for word in words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.25, 0.5, 1, 2, 4])
+    parser.add_argument("--naive-max-hours", type=float, default=1, help="Largest dump to run the naive baseline on")
+    parser.add_argument("--box", type=int, default=30, help="Words the caption box shows before scrolling")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--transcript", type=Path, default=ROOT / "examples" / "sample_transcript.txt")
+    args = parser.parse_args()
+
+    turns = [(speaker, text) for speaker, text in iter_turns(args.transcript.read_text().splitlines()) if speaker]
+    print(
+        f"{'hours':>5} {'fragments':>9} {'MB':>6} {'words':>9} {'kept':>8} {'inflation':>9} {'recall':>7} "
+        f"{'dedup s':>8} {'MB/s':>6} {'naive s':>8}"
+    )
+    for hours in args.hours:
+        dump, spoken = simulate_captions(turns, int(hours * 60 * WORDS_PER_MINUTE), args.box, random.Random(args.seed))
+        megabytes = len(dump.encode("utf-8")) / 1e6
+
+        started = time.perf_counter()
+        result = dedup_captions(dump)
+        seconds = time.perf_counter() - started
+
+        kept = [word for line in result.text.splitlines() for word in split_speaker(line)[1].split()]
+        truth = normalized(spoken)
+        recall = sum((normalized(kept) & truth).values()) / sum(truth.values())
+
+        naive = "-"
+        if hours <= args.naive_max_hours:
+            started = time.perf_counter()
+            naive_dedup(dump)
+            naive = f"{time.perf_counter() - started:.2f}"
+        print(
+            f"{hours:>5g} {result.fragments:>9} {megabytes:>6.2f} {result.words_before:>9} {result.words_after:>8} "
+            f"{result.words_after / len(spoken):>9.2f} {recall:>7.1%} {seconds:>8.3f} {megabytes / seconds:>6.1f} {naive:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure the local rule-based extractor against recorded LLM analyses.
+
+Throughput: runs extract_analysis() over the transcript (and a version
+repeated to --scale times its length) and reports analyses per second and
+tokens per second.
+
+Agreement: compares the extractor's output for the transcript with each
+saved model response in responses/ (recorded for the same transcript).
+Action items are matched on the overlap of their task words; for matched
+items the owner and deadline are compared. Follow-up and verdict agreement
+and the fruitfulness score difference are reported as well.
+
+Run from the meeting-analyzer-mcp directory:
+
+    uv run python benchmarks/local_extractor.py
+    uv run python benchmarks/local_extractor.py --runs 2000 --scale 50
+"""
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from meeting_analyzer.extractor import extract_analysis
+from meeting_analyzer.tokens import count_tokens
+
+ROOT = Path(__file__).parent.parent
+STOPWORDS = {"a", "an", "the", "to", "of", "for", "with", "about", "and", "on", "in", "from", "that", "by"}
+MATCH_THRESHOLD = 0.34
+
+
+def task_words(task: str) -> set[str]:
+    return {word for word in re.findall(r"[a-z0-9]+", task.lower()) if word not in STOPWORDS}
+
+
+def similarity(a: str, b: str) -> float:
+    a_words, b_words = task_words(a), task_words(b)
+    if not a_words or not b_words:
+        return 0.0
+    return len(a_words & b_words) / len(a_words | b_words)
+
+
+def match_items(local: list[dict], reference: list[dict]) -> list[tuple[dict, dict]]:
+    """Greedily pair local and reference action items by task similarity."""
+    pairs = sorted(
+        ((similarity(l["task"], r["task"]), i, j) for i, l in enumerate(local) for j, r in enumerate(reference)),
+        reverse=True,
+    )
+    used_local, used_reference, matches = set(), set(), []
+    for score, i, j in pairs:
+        if score < MATCH_THRESHOLD or i in used_local or j in used_reference:
+            continue
+        used_local.add(i)
+        used_reference.add(j)
+        matches.append((local[i], reference[j]))
+    return matches
+
+
+def throughput(transcript: str, runs: int) -> tuple[float, int]:
+    """Mean seconds per analysis, and the transcript's token count."""
+    started = time.perf_counter()
+    for _ in range(runs):
+        extract_analysis(transcript)
+    return (time.perf_counter() - started) / runs, count_tokens(transcript)
+
+
+def agreement(transcript: str) -> None:
+    local = extract_analysis(transcript)
+    print(f"{'response':<40} {'prec':>5} {'recall':>6} {'owner':>6} {'deadline':>8} {'follow':>6} {'verdict':>7} {'score Δ':>7}")
+    for path in sorted((ROOT / "responses").glob("*.txt")):
+        reference = json.loads(path.read_text())
+        matches = match_items(local["action_items"], reference["action_items"])
+        precision = len(matches) / len(local["action_items"]) if local["action_items"] else 0.0
+        recall = len(matches) / len(reference["action_items"]) if reference["action_items"] else 1.0
+        owners = sum(l["owner"] == r["owner"] for l, r in matches) / len(matches) if matches else 0.0
+        deadlines = (
+            sum(l["deadline"].lower() == r["deadline"].lower() for l, r in matches) / len(matches) if matches else 0.0
+        )
+        follow_up = local["follow_up_assessment"]["follow_up_needed"] == reference["follow_up_assessment"]["follow_up_needed"]
+        verdict = local["fruitfulness"]["verdict"] == reference["fruitfulness"]["verdict"]
+        score_diff = local["fruitfulness"]["score"] - reference["fruitfulness"]["score"]
+        print(
+            f"{path.name:<40} {precision:>5.0%} {recall:>6.0%} {owners:>6.0%} {deadlines:>8.0%} "
+            f"{'yes' if follow_up else 'no':>6} {'yes' if verdict else 'no':>7} {score_diff:>+7}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=500, help="Analyses per throughput measurement")
+    parser.add_argument("--scale", type=int, default=20, help="Repeat the transcript this often for the long run")
+    parser.add_argument("--transcript", type=Path, default=ROOT / "examples" / "sample_transcript.txt")
+    args = parser.parse_args()
+
+    transcript = args.transcript.read_text()
+    print(f"{'transcript':<12} {'tokens':>8} {'ms/analysis':>12} {'analyses/s':>11} {'tokens/s':>11}")
+    for label, text, runs in (
+        ("sample", transcript, args.runs),
+        (f"x{args.scale}", "\n\n".join([transcript] * args.scale), max(1, args.runs // args.scale)),
+    ):
+        seconds, tokens = throughput(text, runs)
+        print(f"{label:<12} {tokens:>8} {seconds * 1000:>12.3f} {1 / seconds:>11.0f} {tokens / seconds:>11.0f}")
+    print()
+    agreement(transcript)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare the output size and latency of the analysis output modes.
+
+Offline (default): re-encodes the saved analyses in responses/ in the regular
+and compact formats and counts their tokens locally, which is what the model
+would have had to generate for each.
+
+Live (--live): runs real analyses of a transcript in each output
+mode and reports completion tokens and latency. Needs the provider keys from .env.
+
+Run from the meeting-analyzer-mcp directory:
+
+    uv run python benchmarks/output_format.py
+    uv run python benchmarks/output_format.py --live --runs 5 --model gpt-4.1
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from meeting_analyzer.prompts import compact_analysis, expand_compact_analysis
+from meeting_analyzer.tokens import count_tokens
+
+ROOT = Path(__file__).parent.parent
+ANALYSIS_KEYS = ("action_items", "open_points", "follow_up_assessment", "fruitfulness")
+
+
+def offline(model: str) -> None:
+    rows = []
+    for path in sorted((ROOT / "responses").glob("*.txt")):
+        analysis = json.loads(path.read_text())
+        analysis = {key: analysis[key] for key in ANALYSIS_KEYS}
+        compact = compact_analysis(analysis)
+        assert expand_compact_analysis(compact)["action_items"] == analysis["action_items"]
+        full_tokens = count_tokens(json.dumps(analysis), model)
+        compact_tokens = count_tokens(json.dumps(compact, separators=(",", ":")), model)
+        rows.append((path.name, full_tokens, compact_tokens))
+
+    print(f"{'response':<40} {'regular':>8} {'compact':>8} {'saved':>6}")
+    for name, full_tokens, compact_tokens in rows:
+        print(f"{name:<40} {full_tokens:>8} {compact_tokens:>8} {1 - compact_tokens / full_tokens:>6.0%}")
+    if rows:
+        full_total = sum(row[1] for row in rows)
+        compact_total = sum(row[2] for row in rows)
+        print(f"{'total':<40} {full_total:>8} {compact_total:>8} {1 - compact_total / full_total:>6.0%}")
+
+
+async def live(model: str, runs: int, transcript: str) -> None:
+    from meeting_analyzer import service
+
+    async with service.app.router.lifespan_context(service.app):
+        print(f"{'mode':<12} {'runs':>4} {'out tokens':>10} {'p50 s':>7} {'max s':>7}")
+        for mode in ("prompt", "structured", "compact"):
+            request = service.TranscriptRequest(transcript=transcript, model=model, output_mode=mode)
+            latencies, completion_tokens = [], []
+            for _ in range(runs):
+                started = time.perf_counter()
+                _, usage = await service.generate_analysis(request)
+                latencies.append(time.perf_counter() - started)
+                completion_tokens.append(usage.get("completion_tokens", 0))
+            print(
+                f"{mode:<12} {runs:>4} {statistics.mean(completion_tokens):>10.0f} "
+                f"{statistics.median(latencies):>7.2f} {max(latencies):>7.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="Call the model instead of counting offline")
+    parser.add_argument("--model", default="gpt-4.1", choices=["gpt-4.1", "gpt-5", "gemini-2.5-pro"])
+    parser.add_argument("--runs", type=int, default=3, help="Analyses per output mode (live only)")
+    parser.add_argument("--transcript", type=Path, default=ROOT / "examples" / "sample_transcript.txt")
+    args = parser.parse_args()
+
+    if args.live:
+        asyncio.run(live(args.model, args.runs, args.transcript.read_text()))
+    else:
+        offline(args.model)
+
+
+if __name__ == "__main__":
+    main()
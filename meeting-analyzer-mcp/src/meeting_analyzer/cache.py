@@ -0,0 +1,148 @@
+"""In-process cache for meeting analysis results.
+
+Results are content-addressed: the key is a hash of the normalized transcript,
+the model, the meeting context fields and the prompt version, so re-analyzing
+the same notes returns the stored result instead of paying for another LLM call.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Normalize a transcript so trivially different copies hash the same.
+
+    Collapses all runs of whitespace (including line breaks) to single spaces
+    and strips leading/trailing whitespace.
+    """
+    return " ".join(transcript.split())
+
+
+def transcript_hash(transcript: str) -> str:
+    """SHA-256 hex digest of the normalized transcript."""
+    return hashlib.sha256(normalize_transcript(transcript).encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    transcript: str,
+    model: str,
+    prompt_version: str,
+    meeting_duration_minutes: Optional[int] = None,
+    meeting_booked_duration: Optional[int] = None,
+    expected_attendees: Optional[int] = None,
+    digest: Optional[str] = None,
+) -> str:
+    """Build the content-addressed cache key for an analysis request.
+
+    `digest` is the transcript_hash() of the transcript, for callers that only
+    know the hash (the transcript is then ignored).
+    """
+    material = json.dumps(
+        {
+            "transcript": digest or transcript_hash(transcript),
+            "model": model,
+            "prompt_version": prompt_version,
+            "meeting_duration_minutes": meeting_duration_minutes,
+            "meeting_booked_duration": meeting_booked_duration,
+            "expected_attendees": expected_attendees,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def wants_no_cache(cache_control: Optional[str]) -> bool:
+    """Return True if a Cache-Control header asks to bypass the cache."""
+    if not cache_control:
+        return False
+    directives = {part.strip().lower() for part in cache_control.split(",")}
+    return "no-cache" in directives or "no-store" in directives
+
+
+def entity_tag(body: bytes) -> str:
+    """Strong ETag for a response body: changes whenever any byte of it does."""
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True if an If-None-Match header matches an ETag.
+
+    Uses weak comparison (a W/ prefix is ignored), as RFC 9110 specifies for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class AnalysisCache:
+    """LRU cache with a per-entry TTL and hit/miss counters.
+
+    Args:
+        max_entries: Maximum number of results kept; least recently used
+            entries are evicted first.
+        ttl_seconds: How long an entry stays valid after it is stored.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def newest(self, keys: Iterable[str]) -> Optional[Any]:
+        """Return the most recently stored live value among keys, without counting a lookup."""
+        now = time.monotonic()
+        live = [self._entries[key] for key in keys if key in self._entries and self._entries[key][0] >= now]
+        return max(live, key=lambda entry: entry[0])[1] if live else None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Counters for the health endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
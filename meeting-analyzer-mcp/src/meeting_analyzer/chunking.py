@@ -0,0 +1,216 @@
+"""Map-reduce analysis support for very long transcripts.
+
+Long transcripts are split on speaker-turn boundaries into token-budgeted,
+overlapping windows. Each window is analyzed independently (the "map" step) and
+the per-window results are merged into one analysis (the "reduce" step):
+duplicate action items and open points coming from overlapping windows are
+collapsed and the fruitfulness score is recomputed.
+"""
+
+import re
+from typing import Optional
+
+from meeting_analyzer.tokens import count_tokens
+
+# Matches the start of a "**Speaker:** text" turn
+TURN_PATTERN = re.compile(r"^\*\*[^*\n]+?:\*\*", re.MULTILINE)
+
+# Placeholders the prompt tells the model to use when information is missing
+UNASSIGNED = "unassigned"
+NOT_SPECIFIED = "not specified"
+
+# Minimum word-set overlap for two items to count as the same item
+DUPLICATE_SIMILARITY = 0.6
+
+
+def split_turns(transcript: str, max_turn_tokens: Optional[int] = None) -> list[str]:
+    """Split a transcript into speaker turns.
+
+    Turns start at each "**Speaker:**" marker; any preamble before the first
+    marker is kept as its own turn. Transcripts without markers are split on
+    blank lines. Turns longer than max_turn_tokens are cut into pieces so that
+    every turn fits in a window.
+    """
+    starts = [match.start() for match in TURN_PATTERN.finditer(transcript)]
+    if starts:
+        bounds = ([0] if starts[0] > 0 else []) + starts + [len(transcript)]
+        turns = [transcript[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+    else:
+        turns = [part.strip() for part in re.split(r"\n\s*\n", transcript)]
+    turns = [turn for turn in turns if turn]
+
+    if max_turn_tokens is None:
+        return turns
+
+    max_chars = max_turn_tokens * 3
+    pieces = []
+    for turn in turns:
+        while count_tokens(turn) > max_turn_tokens:
+            cut = turn.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(turn[:cut].strip())
+            turn = turn[cut:].strip()
+        if turn:
+            pieces.append(turn)
+    return pieces
+
+
+def make_windows(transcript: str, window_tokens: int, overlap_tokens: int) -> list[str]:
+    """Group turns into windows of at most window_tokens with overlap between them.
+
+    Each window after the first starts with the trailing turns of the previous
+    window (up to overlap_tokens), so commitments made across a window boundary
+    are seen whole by at least one window. The overlap is capped at half a
+    window so every window makes progress.
+    """
+    overlap_tokens = min(overlap_tokens, window_tokens // 2)
+    turns = split_turns(transcript, max_turn_tokens=window_tokens)
+    sizes = [count_tokens(turn) for turn in turns]
+
+    windows = []
+    start = 0
+    while start < len(turns):
+        end = start
+        used = 0
+        while end < len(turns) and (end == start or used + sizes[end] <= window_tokens):
+            used += sizes[end]
+            end += 1
+        windows.append("\n\n".join(turns[start:end]))
+        if end >= len(turns):
+            break
+
+        # Step back over trailing turns that fit in the overlap budget
+        next_start = end
+        overlap = 0
+        while next_start - 1 > start and overlap + sizes[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            overlap += sizes[next_start]
+        start = next_start
+
+    return windows
+
+
+def window_transcript(window: str, index: int, total: int) -> str:
+    """Label a window so the model knows it is seeing part of a longer meeting."""
+    return (
+        f"[Part {index + 1} of {total} of a longer meeting transcript. "
+        f"Analyze only this part.]\n\n{window}"
+    )
+
+
+def segment_transcript(segment: str, index: int) -> str:
+    """Label a live-session segment; the number of segments is not known yet."""
+    return (
+        f"[Part {index + 1} of a meeting transcript that is still in progress. "
+        f"Analyze only this part.]\n\n{segment}"
+    )
+
+
+def _words(text: str) -> set[str]:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _similar(a: set[str], b: set[str]) -> bool:
+    if not a or not b:
+        return a == b
+    return len(a & b) / len(a | b) >= DUPLICATE_SIMILARITY
+
+
+def _specificity(item: dict) -> int:
+    """How many of an action item's owner/deadline fields are actually filled in."""
+    owner = str(item.get("owner", "")).strip().lower()
+    deadline = str(item.get("deadline", "")).strip().lower()
+    return int(owner not in ("", UNASSIGNED)) + int(deadline not in ("", NOT_SPECIFIED))
+
+
+def _dedupe(items: list[dict], field: str) -> list[dict]:
+    kept: list[tuple[set[str], dict]] = []
+    for item in items:
+        words = _words(str(item.get(field, "")))
+        for index, (seen_words, seen) in enumerate(kept):
+            if _similar(words, seen_words):
+                kept[index] = (seen_words, _prefer(seen, item, field))
+                break
+        else:
+            kept.append((words, dict(item)))
+    return [item for _, item in kept]
+
+
+def _prefer(current: dict, candidate: dict, field: str) -> dict:
+    if field == "task":
+        return candidate if _specificity(candidate) > _specificity(current) else current
+    # Open points: an item is blocking if any window saw it as blocking
+    merged = dict(current)
+    merged["blocking"] = bool(current.get("blocking")) or bool(candidate.get("blocking"))
+    return merged
+
+
+def verdict_for_score(score: int) -> str:
+    """Map a fruitfulness score to the verdict bands used in the prompt."""
+    if score >= 80:
+        return "Fruitful"
+    if score >= 50:
+        return "Partially Productive"
+    return "Not Fruitful"
+
+
+def merge_analyses(parts: list[dict], weights: Optional[list[int]] = None) -> dict:
+    """Reduce per-window analyses into a single analysis dict.
+
+    Args:
+        parts: Parsed analysis JSON for each window, in transcript order.
+        weights: Relative size of each window (e.g. token counts), used to
+            weight the fruitfulness score. Defaults to equal weights.
+    """
+    if weights is None:
+        weights = [1] * len(parts)
+
+    action_items = _dedupe(
+        [item for part in parts for item in part.get("action_items", [])], "task"
+    )
+    open_points = _dedupe(
+        [point for part in parts for point in part.get("open_points", [])], "topic"
+    )
+
+    follow_ups = [part.get("follow_up_assessment") or {} for part in parts]
+    needed = [f for f in follow_ups if f.get("follow_up_needed")]
+    suggested_topics: list[str] = []
+    for follow_up in follow_ups:
+        for topic in follow_up.get("suggested_topics", []):
+            if topic not in suggested_topics:
+                suggested_topics.append(topic)
+    follow_up_needed = bool(needed) or any(point.get("blocking") for point in open_points)
+    if needed:
+        reason = " ".join(dict.fromkeys(f.get("reason", "") for f in needed if f.get("reason")))
+    elif follow_up_needed:
+        reason = "Blocking open points remain unresolved."
+    else:
+        reason = "No segment of the meeting left items requiring a follow-up."
+
+    scored = [
+        (part["fruitfulness"], weight)
+        for part, weight in zip(parts, weights)
+        if isinstance(part.get("fruitfulness"), dict) and "score" in part["fruitfulness"]
+    ]
+    total_weight = sum(weight for _, weight in scored)
+    if total_weight:
+        score = round(sum(int(f["score"]) * weight for f, weight in scored) / total_weight)
+    else:
+        score = 0
+    explanations = list(dict.fromkeys(f.get("explanation", "") for f, _ in scored if f.get("explanation")))
+
+    return {
+        "action_items": action_items,
+        "open_points": open_points,
+        "follow_up_assessment": {
+            "follow_up_needed": follow_up_needed,
+            "reason": reason,
+            "suggested_topics": suggested_topics,
+        },
+        "fruitfulness": {
+            "score": score,
+            "verdict": verdict_for_score(score),
+            "explanation": f"Combined from {len(parts)} transcript segments. " + " ".join(explanations),
+        },
+    }
@@ -0,0 +1,244 @@
+"""Transcript compaction pre-pass to cut prompt tokens.
+
+Scraped captions and pasted notes carry a lot of redundancy: the speaker name
+is repeated on every line, one speaker's turn is split over many lines, and
+there are fillers, timestamps and markdown bold markers. compact_transcript()
+removes that noise in a single linear pass over the lines, merges consecutive
+turns by the same speaker and replaces speaker names with short IDs plus a
+legend. The alias mapping is kept so names can be restored in the model output.
+"""
+
+import re
+from typing import Any, Iterable, Iterator, Optional
+
+from pydantic import BaseModel
+
+from meeting_analyzer.tokens import count_tokens
+
+# "**Speaker:** text", "Speaker: text" or "**Speaker**: text"; the name is checked by _speaker_name()
+_SPEAKER_LINE = re.compile(
+    r"^\s*(?:\*\*)?(?P<speaker>[^\W_][\w .'()\-]{0,48}?)(?:\*\*)?\s*:(?:\*\*)?\s+(?P<text>.*)$"
+)
+_NAME_WORDS = 4
+_NAME_PARTICLES = frozenset({"al", "bin", "da", "de", "del", "der", "di", "la", "le", "van", "von"})
+# Labels of pasted notes that look like a one-word speaker ("Note: ...", "Agenda: ...")
+_NOT_SPEAKERS = frozenset({
+    "action", "actions", "agenda", "answer", "attendees", "date", "decision", "decisions", "example",
+    "follow-up", "goal", "goals", "location", "next", "note", "notes", "question", "re", "subject",
+    "summary", "time", "todo", "topic", "update", "updates",
+})
+
+# Leading timestamps such as [00:12:34] or (12:34), a bare 12:34:56 only when a separator
+# follows ("12:34 - ", so "10:30 works for me" keeps its time), and ISO-8601 stamps
+_TIMESTAMP = re.compile(
+    r"^\s*(?:(?:[\[(]\d{1,2}:\d{2}(?::\d{2})?(?:\.\d+)?[\])]|\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2})?(?:\.\d+)?Z?)"
+    r"\s*(?:[-–—|]\s*)?"
+    r"|\d{1,2}:\d{2}(?::\d{2})?(?:\.\d+)?\s*[-–—|]\s*)"
+)
+
+_FILLERS = re.compile(r"\b(?:u+m+|u+h+m*|e+r+m+|h+m+|mm-hmm)\b[,.]?\s*|\byou know,\s*", re.IGNORECASE)
+# Stutters: any word said three or more times in a row, or a doubled word that is never
+# doubled on purpose ("the the", "I I"); "had had" and "that that" are left alone
+_REPEATED_WORD = re.compile(
+    r"\b(\w+)(?:\s+\1\b){2,}|\b(a|an|and|but|I|in|it|of|on|so|the|to|we)(?:\s+\2\b)+", re.IGNORECASE
+)
+_MARKDOWN = re.compile(r"\*\*|__")
+_SPACES = re.compile(r"\s+")
+
+# Alias prefixes, tried in order until one does not already occur in the transcript
+_ALIAS_PREFIXES = ("S", "P", "Q", "V")
+
+
+class CompactTranscript(BaseModel):
+    body: str
+    legend: str = ""
+    aliases: dict[str, str] = {}  # alias -> full speaker name
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def text(self) -> str:
+        """Legend followed by the compacted turns, ready to go into the prompt."""
+        return f"{self.legend}\n\n{self.body}" if self.legend else self.body
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_before - self.tokens_after)
+
+
+class CompactionStats:
+    """Running totals of the tokens removed by compaction, for the health endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def record(self, compacted: CompactTranscript) -> None:
+        self.requests += 1
+        self.tokens_before += compacted.tokens_before
+        self.tokens_after += compacted.tokens_after
+
+    def stats(self) -> dict:
+        saved = max(0, self.tokens_before - self.tokens_after)
+        return {
+            "requests": self.requests,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": saved,
+            "saved_ratio": round(saved / self.tokens_before, 4) if self.tokens_before else 0.0,
+        }
+
+
+def clean_text(text: str) -> str:
+    """Strip timestamps, fillers, stutters and markdown emphasis from one line."""
+    text = _TIMESTAMP.sub("", text)
+    text = _MARKDOWN.sub("", text)
+    text = _FILLERS.sub("", text)
+    text = _REPEATED_WORD.sub(r"\1\2", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def _speaker_name(name: str) -> Optional[str]:
+    """The speaker name, or None if the text before the colon is not name-like.
+
+    A name is up to _NAME_WORDS capitalised words ("Aditi", "Dr. Rao", "Speaker 2"),
+    optionally with particles ("van", "de") or a parenthesised role ("Aditi (Host)"),
+    so "The plan is:" and note labels such as "Note:" are not taken as speakers.
+    """
+    name = _SPACES.sub(" ", name).strip()
+    words = re.sub(r"\([^)]*\)", " ", name).split()
+    if not words or len(words) > _NAME_WORDS or words[0].lower() in _NOT_SPEAKERS:
+        return None
+    for index, word in enumerate(words):
+        if not (word[0].isupper() or word[0].isdigit() or (index and word in _NAME_PARTICLES)):
+            return None
+    return name
+
+
+def _match_speaker(line: str) -> Optional[tuple[str, str]]:
+    """(speaker, raw text) of a line with a speaker prefix (timestamps already removed)."""
+    match = _SPEAKER_LINE.match(line)
+    if match is None:
+        return None
+    name = _speaker_name(match.group("speaker"))
+    return (name, match.group("text")) if name else None
+
+
+def split_speaker(line: str) -> tuple[Optional[str], str]:
+    """(speaker, text) of one line, with the speaker None if the line has no speaker prefix.
+
+    Leading timestamps are removed; the text is not otherwise cleaned.
+    """
+    line = _TIMESTAMP.sub("", line)
+    match = _match_speaker(line)
+    if match is None:
+        return None, line.strip()
+    return match[0], match[1].strip()
+
+
+def iter_turns(lines: Iterable[str]) -> Iterator[tuple[Optional[str], str]]:
+    """Yield (speaker, text) turns, merging consecutive lines by the same speaker.
+
+    Lines without a speaker prefix continue the current turn.
+    """
+    speaker: Optional[str] = None
+    parts: list[str] = []
+    for line in lines:
+        line = _TIMESTAMP.sub("", line)
+        match = _match_speaker(line)
+        if match:
+            name = match[0]
+            text = clean_text(match[1])
+            if name != speaker and parts:
+                yield speaker, " ".join(parts)
+                parts = []
+            speaker = name
+        else:
+            text = clean_text(line)
+        if text:
+            parts.append(text)
+    if parts:
+        yield speaker, " ".join(parts)
+
+
+def _alias_prefix(transcript: str) -> Optional[str]:
+    for prefix in _ALIAS_PREFIXES:
+        if not re.search(rf"\b{prefix}\d+\b", transcript):
+            return prefix
+    return None
+
+
+def compact_transcript(transcript: str, model: Optional[str] = None) -> CompactTranscript:
+    """Compact a transcript for prompting and report the token savings.
+
+    Speakers are only replaced by IDs when that saves more tokens than the
+    legend costs.
+    """
+    turns = list(iter_turns(transcript.splitlines()))
+
+    names: dict[str, int] = {}
+    for speaker, _ in turns:
+        if speaker is not None:
+            names[speaker] = names.get(speaker, 0) + 1
+
+    aliases: dict[str, str] = {}
+    prefix = _alias_prefix(transcript)
+    if prefix and names:
+        candidate = {name: f"{prefix}{index}" for index, name in enumerate(names, start=1)}
+        legend = _legend(candidate)
+        saved = sum(
+            (count_tokens(name, model) - count_tokens(alias, model)) * names[name]
+            for name, alias in candidate.items()
+        )
+        if saved > count_tokens(legend, model):
+            aliases = {alias: name for name, alias in candidate.items()}
+
+    by_name = {name: alias for alias, name in aliases.items()}
+    lines = []
+    for speaker, text in turns:
+        if speaker is None:
+            lines.append(text)
+        else:
+            lines.append(f"{by_name.get(speaker, speaker)}: {text}")
+    body = "\n\n".join(lines)
+    legend = _legend(by_name) if aliases else ""
+
+    compacted = CompactTranscript(
+        body=body,
+        legend=legend,
+        aliases=aliases,
+        tokens_before=count_tokens(transcript, model),
+        tokens_after=0,
+    )
+    compacted.tokens_after = count_tokens(compacted.text, model)
+    return compacted
+
+
+def uncompacted_transcript(transcript: str, model: Optional[str] = None) -> CompactTranscript:
+    """Wrap a transcript unchanged, for when compaction is turned off."""
+    tokens = count_tokens(transcript, model)
+    return CompactTranscript(body=transcript, tokens_before=tokens, tokens_after=tokens)
+
+
+def _legend(aliases_by_name: dict[str, str]) -> str:
+    mapping = ", ".join(f"{alias}={name}" for name, alias in aliases_by_name.items())
+    return f"Speaker IDs (use the ID as owner): {mapping}"
+
+
+def expand_aliases(value: Any, aliases: dict[str, str]) -> Any:
+    """Replace speaker IDs with full names everywhere in parsed model output."""
+    if not aliases:
+        return value
+    pattern = re.compile(r"\b(" + "|".join(map(re.escape, aliases)) + r")\b")
+    return _expand(value, pattern, aliases)
+
+
+def _expand(value: Any, pattern: re.Pattern, aliases: dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return pattern.sub(lambda m: aliases[m.group(1)], value)
+    if isinstance(value, list):
+        return [_expand(item, pattern, aliases) for item in value]
+    if isinstance(value, dict):
+        return {key: _expand(item, pattern, aliases) for key, item in value.items()}
+    return value
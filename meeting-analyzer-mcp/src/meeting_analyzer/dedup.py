@@ -0,0 +1,221 @@
+"""Collapse the overlapping caption fragments of scraped Meet transcripts.
+
+Meet re-renders a live caption while the sentence is being spoken, revises
+its last words, and scrolls the caption box, so the extension captures one
+utterance as a series of overlapping fragments:
+
+    **Aditi:** Let's start with a
+    **Aditi:** Let's start with the agenda
+    **Aditi:** start with the agenda. First, the venue
+
+dedup_captions() makes a single pass over the lines and remembers, per
+speaker, where that speaker's last fragment ended up in the output. Each new
+fragment from the speaker:
+
+- repeats the last fragment (or part of it) while it is still open: dropped;
+- extends it, or revises only its last MAX_REVISED_WORDS words while it is
+  still open: replaces it;
+- starts with at least MIN_OVERLAP_WORDS words that end it (the box
+  scrolled): only the words after the overlap are added;
+- is new speech otherwise.
+
+A fragment is open until it ends a sentence or another speaker finishes a
+sentence after it: Meet only re-renders the caption that is being spoken,
+so a closed "Yes." followed by "Yes." is said twice, not captured twice.
+
+Words are compared ignoring case and punctuation. Overlaps and repeats are
+found with polynomial rolling hashes over per-word hashes, so a fragment
+costs time linear in its own length plus the previous fragment's, and a dump
+is processed in linear time overall instead of comparing every fragment with
+every earlier one.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from meeting_analyzer.compaction import split_speaker
+
+MIN_OVERLAP_WORDS = 3  # Shorter overlaps ("the", "so we") are taken as coincidence
+MAX_REVISED_WORDS = 2  # Trailing words of a caption that Meet may still rewrite
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+_NON_WORD = re.compile(r"[^\w']+")
+_SENTENCE_END = (".", "?", "!")
+
+
+@dataclass
+class DedupResult:
+    text: str
+    fragments: int = 0
+    repeated: int = 0  # Dropped: already contained in the speaker's open last fragment
+    replaced: int = 0  # Replaced the speaker's last fragment (it grew or its last words were revised)
+    overlapped: int = 0  # Continued the speaker's last fragment after a scroll overlap
+    words_before: int = 0
+    words_after: int = 0
+
+
+class DedupStats:
+    """Running totals of the caption words removed by de-duplication, for the health endpoint."""
+
+    def __init__(self):
+        self.transcripts = 0
+        self.fragments = 0
+        self.repeated = 0
+        self.replaced = 0
+        self.overlapped = 0
+        self.words_before = 0
+        self.words_after = 0
+
+    def record(self, result: DedupResult) -> None:
+        self.transcripts += 1
+        self.fragments += result.fragments
+        self.repeated += result.repeated
+        self.replaced += result.replaced
+        self.overlapped += result.overlapped
+        self.words_before += result.words_before
+        self.words_after += result.words_after
+
+    def stats(self) -> dict:
+        removed = self.words_before - self.words_after
+        return {
+            "transcripts": self.transcripts,
+            "fragments": self.fragments,
+            "repeated": self.repeated,
+            "replaced": self.replaced,
+            "overlapped": self.overlapped,
+            "words_removed": removed,
+            "removed_ratio": round(removed / self.words_before, 4) if self.words_before else 0.0,
+        }
+
+
+class _Turn:
+    __slots__ = ("speaker", "words", "keys")
+
+    def __init__(self, speaker: Optional[str]):
+        self.speaker = speaker
+        self.words: list[str] = []
+        self.keys: list[int] = []  # Hash of each word, ignoring case and punctuation
+
+
+def _key(word: str) -> int:
+    return hash(_NON_WORD.sub("", word.lower())) % _MOD
+
+
+def _common_prefix(keys: list[int], start: int, fragment: list[int]) -> int:
+    """Length of the common prefix of keys[start:] and fragment."""
+    length = 0
+    limit = min(len(keys) - start, len(fragment))
+    while length < limit and keys[start + length] == fragment[length]:
+        length += 1
+    return length
+
+
+def _contains(keys: list[int], start: int, fragment: list[int]) -> bool:
+    """Whether fragment occurs in keys[start:] (Rabin-Karp)."""
+    size = len(fragment)
+    if size == 0 or len(keys) - start < size:
+        return False
+    target = window = 0
+    for index in range(size):
+        target = (target * _BASE + fragment[index]) % _MOD
+        window = (window * _BASE + keys[start + index]) % _MOD
+    top = pow(_BASE, size - 1, _MOD)
+    for offset in range(start, len(keys) - size + 1):
+        if offset > start:
+            window = ((window - keys[offset - 1] * top) * _BASE + keys[offset + size - 1]) % _MOD
+        if window == target and keys[offset:offset + size] == fragment:
+            return True
+    return False
+
+
+def _overlap(keys: list[int], start: int, fragment: list[int]) -> int:
+    """Longest k < len(fragment) such that the last k words of keys[start:] begin fragment."""
+    suffix = prefix = 0
+    power = 1
+    matches = []
+    for k in range(1, min(len(keys) - start, len(fragment) - 1) + 1):
+        suffix = (suffix + keys[-k] * power) % _MOD
+        prefix = (prefix * _BASE + fragment[k - 1]) % _MOD
+        power = power * _BASE % _MOD
+        if suffix == prefix:
+            matches.append(k)
+    for k in reversed(matches):
+        if keys[-k:] == fragment[:k]:
+            return k
+    return 0
+
+
+def dedup_captions(transcript: str) -> DedupResult:
+    """Collapse overlapping caption fragments, speaker by speaker, in one pass.
+
+    Returns:
+        DedupResult with the transcript as `**Speaker:** text` turns (consecutive
+        fragments by the same speaker are joined) and what was collapsed
+    """
+    result = DedupResult(text="")
+    turns: list[_Turn] = []
+    # Speaker -> (turn, start of their last fragment in it, sentences finished when it was captured)
+    last: dict[Optional[str], tuple[_Turn, int, int]] = {}
+    finished = 0  # Fragments kept so far that end a sentence
+    speaker: Optional[str] = None
+
+    for line in transcript.splitlines():
+        name, text = split_speaker(line)
+        if name is not None:
+            speaker = name
+        words = text.split()
+        if not words:
+            continue
+        keys = [_key(word) for word in words]
+        result.fragments += 1
+        result.words_before += len(words)
+
+        previous = last.get(speaker)
+        if previous is not None:
+            turn, start, seen = previous
+            # Nobody else finished a sentence since (any sentence finished by then was this speaker's)
+            uninterrupted = seen == finished
+            open_ = uninterrupted and not turn.words[-1].endswith(_SENTENCE_END)
+            common = _common_prefix(turn.keys, start, keys)
+            own = len(turn.keys) - start
+            if open_ and (common == len(keys) or _contains(turn.keys, start, keys)):
+                result.repeated += 1
+                continue
+            extends = common == own < len(keys) and uninterrupted
+            revises = open_ and common >= MIN_OVERLAP_WORDS and own - common <= MAX_REVISED_WORDS
+            if extends or revises:
+                del turn.words[start:], turn.keys[start:]
+                turn.words.extend(words)
+                turn.keys.extend(keys)
+                finished += words[-1].endswith(_SENTENCE_END)
+                last[speaker] = (turn, start, finished)
+                result.replaced += 1
+                continue
+            overlap = _overlap(turn.keys, start, keys)
+            if overlap >= MIN_OVERLAP_WORDS:
+                turn.words[-overlap:] = words[:overlap]  # The later render has the final punctuation
+                turn.words.extend(words[overlap:])
+                turn.keys.extend(keys[overlap:])
+                finished += words[-1].endswith(_SENTENCE_END)
+                last[speaker] = (turn, len(turn.keys) - len(keys), finished)
+                result.overlapped += 1
+                continue
+
+        # New speech: continue the speaker's turn if nobody spoke in between
+        if not turns or turns[-1].speaker != speaker:
+            turns.append(_Turn(speaker))
+        turn = turns[-1]
+        start = len(turn.keys)
+        turn.words.extend(words)
+        turn.keys.extend(keys)
+        finished += words[-1].endswith(_SENTENCE_END)
+        last[speaker] = (turn, start, finished)
+
+    result.words_after = sum(len(turn.words) for turn in turns)
+    result.text = "\n\n".join(
+        f"**{turn.speaker}:** {' '.join(turn.words)}" if turn.speaker is not None else " ".join(turn.words)
+        for turn in turns
+    )
+    return result
@@ -0,0 +1,281 @@
+"""Rule-based meeting analysis without an LLM.
+
+A deterministic fast path over `**Speaker:** text` transcripts, used for
+`model: "local"` requests and as a fallback when the model providers are
+unavailable. It runs in milliseconds and finds:
+
+- commitments: "I'll share the deck by Friday" (owner: the speaker) and
+  requests such as "Rohit, can you get the headcount by Monday?" (owner: the
+  addressee, or whoever answers next). An addressee's reply that accepts a
+  request ("Will do, I'll send it today") completes the request instead of
+  becoming a second item;
+- deadlines: relative days, weekdays, "end of week/month" and dates;
+- open points: questions nobody answered and explicit "still open" cues.
+
+The output has the same shape as a parsed model reply, so it goes through
+the same response building as LLM analyses. It misses anything phrased
+less directly, so prefer an LLM where quality matters.
+"""
+
+import re
+from typing import Optional
+
+from meeting_analyzer.chunking import verdict_for_score
+from meeting_analyzer.compaction import iter_turns
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# "I'll ...", "I will ...", "I'm going to ...", "let me ..."
+_SELF_COMMITMENT = re.compile(
+    r"\b(?:I'll|I will|I'm going to|I am going to|I can take|let me)\s+(?P<task>[^.!?]+)",
+    re.IGNORECASE,
+)
+
+# "Rohit, can you ...?", "could you please ...", "Mehul, please ..."
+_REQUEST = re.compile(
+    r"^(?:(?P<name>[A-Z][\w'\-]*)\s*,\s*)?(?:(?:can|could|would|will) you|please)\s+(?:please\s+)?(?P<task>[^.!?]+)",
+    re.IGNORECASE,
+)
+
+# Replies that accept a request without restating it
+_ACCEPTANCE = re.compile(
+    r"^(?:sure|yes|yeah|yep|ok(?:ay)?|will do|on it|absolutely|of course|no problem|sounds good|got it)\b",
+    re.IGNORECASE,
+)
+
+# Verbs after "I'll" / "can you" that describe a state or an opinion rather than a task
+_NON_TASK_VERBS = {
+    "be", "have", "need", "think", "see", "try", "guess", "say", "probably", "keep",
+    "let", "wait", "bet", "admit", "leave", "agree", "like", "prefer", "mind", "hear",
+}
+
+_DAY = r"(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DEADLINE = re.compile(
+    r"\b(?:(?:by|before|until|on|due|no later than)\s+)?(?P<deadline>"
+    r"today|tonight|tomorrow|eod|eow|"
+    r"(?:the\s+)?end\s+of\s+(?:the\s+)?(?:day|week|month|quarter|sprint)|"
+    rf"(?:next|this)\s+(?:week|month|quarter|sprint|{_DAY})|{_DAY}|"
+    rf"{_MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH}|"
+    r"\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?"
+    r")\b",
+    re.IGNORECASE,
+)
+
+# Explicit signs that a topic was left open
+_OPEN_CUES = re.compile(
+    r"\b(?:tbd|to be decided|not (?:yet )?(?:sure|decided|resolved|finali[sz]ed|confirmed)|"
+    r"still (?:need to|have to|open|pending|unclear|undecided)|open question|"
+    r"(?:let's|we'll|we should) (?:revisit|park|come back to|take (?:this|it) offline)|"
+    r"haven't (?:decided|agreed|figured)|need to (?:figure out|decide|confirm)|pending)\b",
+    re.IGNORECASE,
+)
+_BLOCKING_CUES = re.compile(r"\b(?:block\w*|depends? on|waiting (?:on|for)|can't (?:proceed|move|start))\b", re.IGNORECASE)
+
+# Decisions and agreements, which make a meeting more fruitful
+_DECISION_CUES = re.compile(
+    r"\b(?:agreed|decided|let's go with|let's (?:tentatively )?lock|sounds good|approved|confirmed|"
+    r"we'll go with|final(?:i[sz]e)?d?|settled)\b",
+    re.IGNORECASE,
+)
+_FOLLOW_UP_CUES = re.compile(
+    r"\b(?:sync (?:again|up)|follow[- ]up|next meeting|reconvene|circle back|touch base|meet again|catch up)\b",
+    re.IGNORECASE,
+)
+
+_MAX_TOPIC_CHARS = 80
+
+
+def _sentences(text: str) -> list[str]:
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+
+_PROPER_NOUN = re.compile(rf"^(?:{_DAY}|{_MONTH})$", re.IGNORECASE)
+
+
+def _format_deadline(deadline: str) -> str:
+    """"next monday" -> "Next Monday", "end of the week" -> "End of the week"."""
+    words = re.sub(r"\s+", " ", deadline).strip().lower().split(" ")
+    if words[0] in ("eod", "eow"):
+        return words[0].upper()
+    words = [word.capitalize() if _PROPER_NOUN.match(word) else word for word in words]
+    return words[0][:1].upper() + " ".join(words)[1:]
+
+
+def _split_deadline(task: str) -> tuple[str, Optional[str]]:
+    """Cut a deadline phrase out of a task, returning (task, deadline or None)."""
+    match = _DEADLINE.search(task)
+    if match is None:
+        return task, None
+    task = (task[: match.start()] + task[match.end():]).strip()
+    return task, _format_deadline(match.group("deadline"))
+
+
+def _format_task(task: str) -> str:
+    task = re.sub(r"\s+", " ", task).strip(" ,;:-")
+    task = re.sub(r"^(?:also|then|just|quickly|go ahead and)\s+", "", task, flags=re.IGNORECASE)
+    task = re.sub(r"\s+(?:and|then|too|as well|for us|for me)$", "", task, flags=re.IGNORECASE)
+    return task[:1].upper() + task[1:]
+
+
+def _truncate(text: str) -> str:
+    text = text.strip()
+    if len(text) <= _MAX_TOPIC_CHARS:
+        return text
+    return text[: _MAX_TOPIC_CHARS - 3].rsplit(" ", 1)[0] + "..."
+
+
+def _resolve_speaker(name: str, speakers: list[str]) -> Optional[str]:
+    """Full speaker name for a first name or alias used to address someone."""
+    lowered = name.lower()
+    for speaker in speakers:
+        if speaker.lower() == lowered or speaker.split()[0].lower() == lowered:
+            return speaker
+    return None
+
+
+def _next_speaker(turns: list[tuple[Optional[str], str]], index: int) -> Optional[int]:
+    """Index of the next turn by a different known speaker."""
+    speaker = turns[index][0]
+    for later in range(index + 1, len(turns)):
+        if turns[later][0] is not None and turns[later][0] != speaker:
+            return later
+    return None
+
+
+def _task(text: str) -> Optional[tuple[str, Optional[str]]]:
+    """(task, deadline) from the words after a commitment or request, if they describe a task."""
+    words = text.split()
+    if not words or words[0].lower() in _NON_TASK_VERBS:
+        return None
+    task, deadline = _split_deadline(text)
+    task = _format_task(task)
+    if len(task.split()) < 2:
+        return None
+    return task, deadline
+
+
+def _commitment(sentence: str) -> Optional[tuple[str, Optional[str]]]:
+    """(task, deadline) for a first-person commitment, if the sentence is one."""
+    match = _SELF_COMMITMENT.search(sentence)
+    return _task(match.group("task")) if match else None
+
+
+def extract_action_items(turns: list[tuple[Optional[str], str]]) -> list[dict]:
+    """Commitments and requests, with their owners and deadlines."""
+    speakers = list(dict.fromkeys(speaker for speaker, _ in turns if speaker is not None))
+    items: list[dict] = []
+    # Turn index -> the request item an addressee's reply in that turn would complete
+    awaiting_reply: dict[int, dict] = {}
+    for index, (speaker, text) in enumerate(turns):
+        pending = awaiting_reply.pop(index, None)
+        for sentence in _sentences(text):
+            request = _REQUEST.match(sentence)
+            requested = _task(request.group("task")) if request else None
+            if requested:
+                task, deadline = requested
+                owner = _resolve_speaker(request.group("name"), speakers) if request.group("name") else None
+                reply_index = _next_speaker(turns, index)
+                if owner is None and reply_index is not None:
+                    owner = turns[reply_index][0]
+                item = {"task": task, "owner": owner or "Unassigned", "deadline": deadline or "Not specified"}
+                items.append(item)
+                if reply_index is not None and turns[reply_index][0] == item["owner"]:
+                    awaiting_reply[reply_index] = item
+                continue
+
+            commitment = _commitment(sentence)
+            if pending is not None and (commitment or _ACCEPTANCE.match(sentence)):
+                # The addressee accepting the request: keep one item, add a deadline if given
+                deadline = commitment[1] if commitment else _split_deadline(sentence)[1]
+                if deadline and pending["deadline"] == "Not specified":
+                    pending["deadline"] = deadline
+                if commitment:
+                    pending = None
+                continue
+            if commitment and speaker is not None:
+                task, deadline = commitment
+                items.append({"task": task, "owner": speaker, "deadline": deadline or "Not specified"})
+    return items
+
+
+def extract_open_points(turns: list[tuple[Optional[str], str]]) -> list[dict]:
+    """Questions left unanswered and topics explicitly flagged as open."""
+    points: list[dict] = []
+    seen: set[str] = set()
+
+    def add(topic: str, context: str, sentence: str) -> None:
+        key = topic.lower()
+        if key in seen:
+            return
+        seen.add(key)
+        points.append({"topic": topic, "context": context, "blocking": bool(_BLOCKING_CUES.search(sentence))})
+
+    for index, (speaker, text) in enumerate(turns):
+        who = speaker or "Someone"
+        for sentence in _sentences(text):
+            if _OPEN_CUES.search(sentence):
+                add(_truncate(sentence.rstrip(".!")), f"{who} flagged this as still open", sentence)
+            elif sentence.endswith("?") and not _REQUEST.match(sentence):
+                reply_index = _next_speaker(turns, index)
+                if reply_index is None:
+                    add(_truncate(sentence), f"Raised by {who} with no answer before the meeting ended", sentence)
+                elif turns[reply_index][1].rstrip().endswith("?"):
+                    add(_truncate(sentence), f"Raised by {who} and answered only with another question", sentence)
+    return points
+
+
+def assess_follow_up(transcript: str, open_points: list[dict], action_items: list[dict]) -> dict:
+    """Whether another meeting is needed, from open points and explicit follow-up mentions."""
+    mentioned = bool(_FOLLOW_UP_CUES.search(transcript))
+    if open_points:
+        reason = f"{len(open_points)} open point(s) remain unresolved"
+    elif mentioned:
+        reason = "The participants agreed to meet again"
+    else:
+        reason = "No unresolved points or planned follow-up were found"
+    if mentioned and open_points:
+        reason += " and the participants agreed to meet again"
+    topics = [point["topic"] for point in open_points[:5]]
+    if not topics and mentioned and action_items:
+        topics = ["Progress on action items"]
+    return {"follow_up_needed": bool(open_points) or mentioned, "reason": reason, "suggested_topics": topics}
+
+
+def score_fruitfulness(transcript: str, action_items: list[dict], open_points: list[dict]) -> dict:
+    """Fruitfulness from action items and decisions, less the open points."""
+    decisions = len(_DECISION_CUES.findall(transcript))
+    blocking = sum(1 for point in open_points if point["blocking"])
+    score = (
+        25
+        + min(40, 8 * len(action_items))
+        + min(18, 6 * decisions)
+        - 8 * blocking
+        - 4 * (len(open_points) - blocking)
+    )
+    score = max(0, min(100, score))
+    return {
+        "score": score,
+        "verdict": verdict_for_score(score),
+        "explanation": (
+            f"Rule-based estimate: {len(action_items)} action item(s), {decisions} decision cue(s) "
+            f"and {len(open_points)} open point(s) ({blocking} blocking)."
+        ),
+    }
+
+
+def extract_analysis(transcript: str) -> dict:
+    """Analyze a transcript with rules only.
+
+    Returns:
+        Analysis JSON in the same shape as a parsed model reply
+    """
+    turns = list(iter_turns(transcript.splitlines()))
+    action_items = extract_action_items(turns)
+    open_points = extract_open_points(turns)
+    return {
+        "action_items": action_items,
+        "open_points": open_points,
+        "follow_up_assessment": assess_follow_up(transcript, open_points, action_items),
+        "fruitfulness": score_fruitfulness(transcript, action_items, open_points),
+    }
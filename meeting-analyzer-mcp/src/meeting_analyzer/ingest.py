@@ -0,0 +1,203 @@
+"""Caption event framing, ordering and de-duplication for live-session WebSockets.
+
+Clients stream caption events numbered with a per-session sequence number
+starting at 1, as text (JSON) or binary frames:
+
+- JSON: `{"seq": 1, "speaker": "Aditi", "text": "..."}`, or several at once
+  as `{"events": [...]}`. Control messages have a "type", e.g.
+  `{"type": "finalize", "meeting_duration_minutes": 30}`.
+- Binary: one or more records of a big-endian header (uint32 seq,
+  uint16 speaker length, uint32 text length) followed by the UTF-8 speaker
+  and text.
+
+Events may arrive out of order or more than once (a client resends
+everything after its last ack when it reconnects). CaptionStream releases
+them in sequence order, drops repeats by sequence number, and holds at most
+max_pending out-of-order events, so a session's memory stays bounded whatever
+the client sends. When the server is short of memory the limit shrinks and
+held events past it are dropped; they were never acked, so the client sends
+them again. Events are not de-duplicated by content: two "Yes." captions
+with different sequence numbers were said twice (caption re-renders are
+collapsed later, by meeting_analyzer.dedup).
+"""
+
+import json
+import struct
+from dataclasses import dataclass
+from typing import Union
+
+_RECORD_HEADER = struct.Struct(">IHI")
+
+
+class FrameError(ValueError):
+    """A frame that cannot be decoded into caption events."""
+
+
+@dataclass
+class CaptionEvent:
+    seq: int
+    speaker: str
+    text: str
+
+
+def _event(data: dict) -> CaptionEvent:
+    try:
+        seq = int(data["seq"])
+        text = str(data["text"])
+    except (KeyError, TypeError, ValueError):
+        raise FrameError("Caption events need an integer 'seq' and a 'text'")
+    if seq < 1:
+        raise FrameError("Sequence numbers start at 1")
+    return CaptionEvent(seq=seq, speaker=str(data.get("speaker") or "Unknown"), text=text)
+
+
+def decode_frame(frame: Union[str, bytes]) -> tuple[list[CaptionEvent], dict]:
+    """Decode one WebSocket frame.
+
+    Returns:
+        Tuple of (caption events, control message or {})
+    """
+    if isinstance(frame, bytes):
+        return _decode_binary(frame), {}
+    try:
+        data = json.loads(frame)
+    except json.JSONDecodeError:
+        raise FrameError("Text frames must be JSON")
+    if not isinstance(data, dict):
+        raise FrameError("Frames must be JSON objects")
+    if "type" in data:
+        return [], data
+    if "events" in data:
+        if not isinstance(data["events"], list):
+            raise FrameError("'events' must be a list")
+        return [_event(item) for item in data["events"] if isinstance(item, dict)], {}
+    return [_event(data)], {}
+
+
+def _decode_binary(frame: bytes) -> list[CaptionEvent]:
+    events = []
+    offset = 0
+    while offset < len(frame):
+        if offset + _RECORD_HEADER.size > len(frame):
+            raise FrameError("Truncated caption record header")
+        seq, speaker_length, text_length = _RECORD_HEADER.unpack_from(frame, offset)
+        offset += _RECORD_HEADER.size
+        end = offset + speaker_length + text_length
+        if end > len(frame):
+            raise FrameError("Truncated caption record")
+        try:
+            speaker = frame[offset:offset + speaker_length].decode("utf-8")
+            text = frame[offset + speaker_length:end].decode("utf-8")
+        except UnicodeDecodeError:
+            raise FrameError("Caption records must be UTF-8")
+        if seq < 1:
+            raise FrameError("Sequence numbers start at 1")
+        events.append(CaptionEvent(seq=seq, speaker=speaker or "Unknown", text=text))
+        offset = end
+    return events
+
+
+def encode_events(events: list[CaptionEvent]) -> bytes:
+    """Binary frame for caption events (the inverse of decode_frame for bytes)."""
+    parts = []
+    for event in events:
+        speaker = event.speaker.encode("utf-8")
+        text = event.text.encode("utf-8")
+        parts.append(_RECORD_HEADER.pack(event.seq, len(speaker), len(text)) + speaker + text)
+    return b"".join(parts)
+
+
+class CaptionStream:
+    """Releases caption events in sequence order, without repeats.
+
+    Args:
+        max_pending: Out-of-order events held while waiting for a gap to fill.
+            When it is exceeded the gap is given up on and delivery resumes
+            at the oldest held event.
+    """
+
+    def __init__(self, max_pending: int = 256):
+        self.limit = max_pending  # max_pending while memory is not short
+        self.max_pending = max_pending
+        self.next_seq = 1
+        self.pending: dict[int, CaptionEvent] = {}
+        self.received = 0
+        self.delivered = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.skipped = 0  # Sequence numbers never received before their gap was given up on
+        self.shed = 0  # Held events dropped to free memory (unacked, so the client resends them)
+
+    @property
+    def acked(self) -> int:
+        """Highest sequence number up to which every event has been handled."""
+        return self.next_seq - 1
+
+    @property
+    def window(self) -> int:
+        """Out-of-order events the client may still send before gaps are given up on."""
+        return max(0, self.max_pending - len(self.pending))
+
+    @property
+    def pending_bytes(self) -> int:
+        """Approximate memory held by out-of-order events."""
+        return sum(len(event.speaker) + len(event.text) for event in self.pending.values())
+
+    def shrink(self, max_pending: int) -> int:
+        """Hold at most max_pending events, dropping those furthest past the ack.
+
+        Returns:
+            Approximate bytes freed
+        """
+        self.max_pending = min(self.max_pending, max_pending)
+        freed = 0
+        while len(self.pending) > self.max_pending:
+            event = self.pending.pop(max(self.pending))
+            freed += len(event.speaker) + len(event.text)
+            self.shed += 1
+        return freed
+
+    def restore(self) -> None:
+        """Go back to holding up to limit events once memory is available again."""
+        self.max_pending = self.limit
+
+    def push(self, events: list[CaptionEvent]) -> list[CaptionEvent]:
+        """Accept events and return those now deliverable, in order."""
+        ready = []
+        for event in events:
+            self.received += 1
+            if event.seq < self.next_seq or event.seq in self.pending:
+                self.duplicates += 1
+                continue
+            if event.seq > self.next_seq:
+                self.reordered += 1
+            self.pending[event.seq] = event
+            ready.extend(self._drain())
+            if len(self.pending) > self.max_pending:
+                # Give up on the gap: resume at the oldest held event
+                oldest = min(self.pending)
+                self.skipped += oldest - self.next_seq
+                self.next_seq = oldest
+                ready.extend(self._drain())
+        return ready
+
+    def _drain(self) -> list[CaptionEvent]:
+        ready = []
+        while self.next_seq in self.pending:
+            event = self.pending.pop(self.next_seq)
+            self.next_seq += 1
+            self.delivered += 1
+            ready.append(event)
+        return ready
+
+    def stats(self) -> dict:
+        return {
+            "acked": self.acked,
+            "pending": len(self.pending),
+            "received": self.received,
+            "delivered": self.delivered,
+            "duplicates": self.duplicates,
+            "reordered": self.reordered,
+            "skipped": self.skipped,
+            "shed": self.shed,
+        }
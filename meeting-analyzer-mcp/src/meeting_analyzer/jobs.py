@@ -0,0 +1,231 @@
+"""Durable SQLite-backed job queue for background analyses.
+
+Jobs are rows in a SQLite (WAL) database, so they survive restarts and can be
+claimed by workers in any number of processes that share the file. A worker
+claims a job by taking a lease on it inside an IMMEDIATE transaction; while
+the job runs the lease is renewed, and if the worker dies the lease expires
+and the job becomes visible to other workers again (visibility timeout).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    visible_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, visible_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires);
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def worker_id(index: int) -> str:
+    """Identify a worker uniquely across hosts and processes."""
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+class JobQueue:
+    """SQLite job queue with leases, visibility timeouts and retries.
+
+    All methods are blocking; call them via a thread from async code.
+
+    Args:
+        path: Database file location, shared by every process pulling jobs.
+        visibility_timeout: Seconds a claimed job stays invisible to other
+            workers unless its lease is renewed.
+        max_attempts: Attempts before a job is marked failed.
+        retry_delay: Base seconds before a failed attempt is retried
+            (doubled for each further attempt).
+        retention_days: Finished jobs older than this are purged (0 keeps everything).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        visibility_timeout: float = 300,
+        max_attempts: int = 3,
+        retry_delay: float = 5,
+        retention_days: float = 7,
+    ):
+        self.path = Path(path)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retention_days = retention_days
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly where needed
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self) -> None:
+        """Create the schema and purge expired finished jobs."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            if self.retention_days > 0:
+                cutoff = time.time() - self.retention_days * 86400
+                conn.execute(
+                    "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                    (SUCCEEDED, FAILED, cutoff),
+                )
+        finally:
+            conn.close()
+
+    def submit(self, payload: dict[str, Any]) -> str:
+        """Enqueue a job and return its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at, updated_at, visible_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(payload), now, now, now),
+            )
+        finally:
+            conn.close()
+        return job_id
+
+    def claim(self, owner: str) -> Optional[dict]:
+        """Lease the oldest visible job to owner, or return None if there is none.
+
+        Jobs whose lease has expired (their worker died or stalled) are
+        claimable again, unless they have used up their attempts: those are
+        marked failed instead, so a job that keeps killing its worker stops
+        being retried.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front, so two workers can never
+            # select the same row
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = 'Lease expired after ' || attempts || ' attempts', "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, RUNNING, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs "
+                "WHERE (status = ? AND visible_at <= ?) OR (status = ? AND lease_expires < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, now, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, owner, now + self.visibility_timeout, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return {"id": row["id"], "payload": json.loads(row["payload"]), "attempts": row["attempts"] + 1}
+
+    def _update_leased(self, job_id: str, owner: str, sql: str, params: tuple) -> bool:
+        """Run an UPDATE only if owner still holds the lease on the job."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"{sql} WHERE id = ? AND status = ? AND lease_owner = ?",
+                params + (job_id, RUNNING, owner),
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def renew(self, job_id: str, owner: str) -> bool:
+        """Extend the lease on a running job. Returns False if the lease was lost."""
+        now = time.time()
+        return self._update_leased(
+            job_id, owner,
+            "UPDATE jobs SET lease_expires = ?, updated_at = ?",
+            (now + self.visibility_timeout, now),
+        )
+
+    def complete(self, job_id: str, owner: str, result: Any) -> bool:
+        """Store a job's result and mark it succeeded."""
+        return self._update_leased(
+            job_id, owner,
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ?",
+            (SUCCEEDED, json.dumps(result), time.time()),
+        )
+
+    def fail(self, job_id: str, owner: str, error: str, attempts: int, retry: bool = True) -> bool:
+        """Record a failed attempt, requeueing with backoff while attempts remain."""
+        now = time.time()
+        if retry and attempts < self.max_attempts:
+            return self._update_leased(
+                job_id, owner,
+                "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "visible_at = ?, updated_at = ?",
+                (QUEUED, error, now + self.retry_delay * 2 ** (attempts - 1), now),
+            )
+        return self._update_leased(
+            job_id, owner,
+            "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ?",
+            (FAILED, error, now),
+        )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a job's status and result, or None if it does not exist."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, status, result, error, attempts, created_at, updated_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def stats(self) -> dict:
+        """Job counts by status for the health endpoint."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return {"path": str(self.path), **counts}
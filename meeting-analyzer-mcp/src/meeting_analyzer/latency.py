@@ -0,0 +1,52 @@
+"""Rolling latency statistics per model deployment.
+
+Keeps the most recent completion latencies for each model in a bounded
+window and answers percentile queries over them, e.g. to decide how long to
+wait before hedging a slow request.
+"""
+
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """Bounded window of recent latencies (in seconds) per key.
+
+    Args:
+        window: Number of most recent samples kept per key.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def count(self, key: str) -> int:
+        return len(self._samples.get(key, ()))
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """Return the q-th percentile (0-100) latency for key, or None without samples."""
+        samples = self._samples.get(key)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self) -> dict:
+        """Sample count and p50/p95/p99 per key, in milliseconds."""
+        return {
+            key: {
+                "samples": len(samples),
+                "p50_ms": round(self.percentile(key, 50) * 1000, 1),
+                "p95_ms": round(self.percentile(key, 95) * 1000, 1),
+                "p99_ms": round(self.percentile(key, 99) * 1000, 1),
+            }
+            for key, samples in self._samples.items()
+            if samples
+        }
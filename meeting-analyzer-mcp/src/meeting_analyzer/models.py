@@ -0,0 +1,46 @@
+"""Response models shared by the analysis APIs."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from meeting_analyzer.tokens import TokenEstimate
+
+
+class ActionItem(BaseModel):
+    task: str
+    owner: str
+    deadline: str
+
+
+class OpenPoint(BaseModel):
+    topic: str
+    context: str
+    blocking: bool
+
+
+class FollowUpAssessment(BaseModel):
+    follow_up_needed: bool
+    reason: str
+    suggested_topics: list[str]
+
+
+class MeetingFruitfulness(BaseModel):
+    score: int
+    verdict: str
+    explanation: str
+
+
+class AnalysisPrompt(BaseModel):
+    prompt: str
+    instructions: str
+    estimate: Optional[TokenEstimate] = None  # Only set for dry runs
+
+
+# Pydantic model used to validate each streamed section event
+STREAM_EVENT_MODELS = {
+    "action_item": ActionItem,
+    "open_point": OpenPoint,
+    "follow_up_assessment": FollowUpAssessment,
+    "fruitfulness": MeetingFruitfulness,
+}
@@ -0,0 +1,315 @@
+"""Analysis prompts, output schemas and parse-outcome tracking.
+
+Three output modes are supported:
+
+- "prompt": the JSON structure is described in prose inside the prompt and
+  the reply is parsed leniently (with a regex fallback for extra text).
+- "structured": the prompt carries only the guidelines, and the JSON schema
+  is sent as a provider-native constraint (Azure OpenAI `response_format`
+  json_schema, Gemini `response_json_schema`), so the reply is always valid
+  JSON in the expected shape.
+- "compact": the model answers in a terse positional encoding with one-letter
+  keys, which cuts output tokens (and so generation time); the server expands
+  it back into the regular analysis JSON with expand_compact_analysis.
+"""
+
+import json
+import re
+from typing import Any, Literal, Optional
+
+from meeting_analyzer.chunking import verdict_for_score
+from meeting_analyzer.streaming import IncrementalAnalysisParser
+
+OutputMode = Literal["prompt", "structured", "compact"]
+
+# Static instructions per output mode. They are sent first and never vary
+# between requests, so provider prompt caches can reuse them as a prefix.
+ANALYSIS_INSTRUCTIONS = {
+    "prompt": """Analyze this meeting transcript and extract the following information.
+
+IMPORTANT: You MUST respond with valid JSON only. No markdown, no code blocks, just pure JSON.
+
+The JSON structure must be:
+{
+  "action_items": [
+    {
+      "task": "What needs to be done",
+      "owner": "Who is responsible (use 'Unassigned' if not mentioned)",
+      "deadline": "When it's due (use 'Not specified' if not mentioned)"
+    }
+  ],
+  "open_points": [
+    {
+      "topic": "The unresolved issue or question",
+      "context": "Why it remains open",
+      "blocking": true or false
+    }
+  ],
+  "follow_up_assessment": {
+    "follow_up_needed": true or false,
+    "reason": "Why a follow-up is or isn't needed",
+    "suggested_topics": ["topic1", "topic2"]
+  },
+  "fruitfulness": {
+    "score": 0-100,
+    "verdict": "Fruitful" or "Partially Productive" or "Not Fruitful",
+    "explanation": "Brief summary of why this score was given"
+  }
+}
+
+Guidelines:
+- action_items: Extract all tasks with clear ownership. Use "Unassigned" if no owner is mentioned.
+- open_points: Topics discussed but NOT resolved. Set blocking=true if it blocks other work.
+- follow_up_assessment: Determine if another meeting is needed based on open points and pending decisions.
+- fruitfulness: Score based on decisions made, action items created, and issues resolved.
+  - 80-100: Fruitful (clear decisions, good progress)
+  - 50-79: Partially Productive (some progress, open items remain)
+  - 0-49: Not Fruitful (no clear outcomes, wasted time)""",
+    "structured": """Analyze this meeting transcript.
+
+Guidelines:
+- action_items: Extract all tasks with clear ownership. Use "Unassigned" if no owner is mentioned and "Not specified" if no deadline is mentioned.
+- open_points: Topics discussed but NOT resolved. Set blocking=true if it blocks other work.
+- follow_up_assessment: Determine if another meeting is needed based on open points and pending decisions.
+- fruitfulness: Score (0-100) based on decisions made, action items created, and issues resolved.
+  - 80-100: Fruitful (clear decisions, good progress)
+  - 50-79: Partially Productive (some progress, open items remain)
+  - 0-49: Not Fruitful (no clear outcomes, wasted time)""",
+    "compact": """Analyze this meeting transcript.
+
+Respond with one JSON object in this compact positional format (no other text):
+{"a":[[task,owner,deadline]],"o":[[topic,context,blocking]],"f":[follow_up_needed,reason,[suggested_topic]],"s":[score,explanation]}
+
+- a: action items. owner "" if not mentioned, deadline "" if not mentioned.
+- o: topics discussed but NOT resolved, with why they remain open; blocking is 1 if it blocks other work, else 0.
+- f: follow_up_needed is 1 if another meeting is needed based on open points and pending decisions, else 0.
+- s: score 0-100 based on decisions made, action items created, and issues resolved
+  (80-100 clear decisions and good progress, 50-79 some progress with open items, 0-49 no clear outcomes).
+- Keep every string short and factual.""",
+}
+
+# Closing instruction repeated after the transcript
+RESPONSE_REMINDERS = {
+    "prompt": "Respond with ONLY the JSON object, no other text.",
+}
+
+
+def request_prompt(mode: str, transcript: str, context_lines: list[str]) -> str:
+    """The per-request part of the prompt: meeting context and transcript."""
+    parts = []
+    if context_lines:
+        parts.append("Context:\n" + "\n".join(context_lines))
+    parts.append(f"TRANSCRIPT:\n---\n{transcript}\n---")
+    if mode in RESPONSE_REMINDERS:
+        parts.append(RESPONSE_REMINDERS[mode])
+    return "\n\n".join(parts)
+
+
+def build_analysis_prompt(mode: str, transcript: str, context_lines: list[str]) -> str:
+    """Full analysis prompt: the static instructions, then context and transcript."""
+    return f"{ANALYSIS_INSTRUCTIONS[mode]}\n\n{request_prompt(mode, transcript, context_lines)}"
+
+
+# Compact keys, streamed with the same event names as the full sections
+COMPACT_ARRAY_SECTIONS = {"a": "action_item", "o": "open_point"}
+COMPACT_OBJECT_SECTIONS = {"f": "follow_up_assessment", "s": "fruitfulness"}
+
+
+def _object(properties: dict) -> dict:
+    # Strict structured output requires every property and no extras
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+ANALYSIS_SCHEMA = _object({
+    "action_items": {
+        "type": "array",
+        "items": _object({
+            "task": {"type": "string"},
+            "owner": {"type": "string"},
+            "deadline": {"type": "string"},
+        }),
+    },
+    "open_points": {
+        "type": "array",
+        "items": _object({
+            "topic": {"type": "string"},
+            "context": {"type": "string"},
+            "blocking": {"type": "boolean"},
+        }),
+    },
+    "follow_up_assessment": _object({
+        "follow_up_needed": {"type": "boolean"},
+        "reason": {"type": "string"},
+        "suggested_topics": {"type": "array", "items": {"type": "string"}},
+    }),
+    "fruitfulness": _object({
+        "score": {"type": "integer"},
+        "verdict": {"type": "string", "enum": ["Fruitful", "Partially Productive", "Not Fruitful"]},
+        "explanation": {"type": "string"},
+    }),
+})
+
+
+def openai_response_format() -> dict:
+    """`response_format` for Azure OpenAI chat completions in structured mode."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "meeting_analysis", "strict": True, "schema": ANALYSIS_SCHEMA},
+    }
+
+
+class ParseStats:
+    """How often model replies parse cleanly, need the regex fallback, or fail, per output mode."""
+
+    OUTCOMES = ("parsed", "fallback", "failed")
+
+    def __init__(self):
+        self.counts: dict[str, dict[str, int]] = {}
+
+    def record(self, mode: str, outcome: str) -> None:
+        counts = self.counts.setdefault(mode, dict.fromkeys(self.OUTCOMES, 0))
+        counts[outcome] += 1
+
+    def stats(self) -> dict:
+        result = {}
+        for mode, counts in self.counts.items():
+            total = sum(counts.values())
+            result[mode] = {
+                **counts,
+                "total": total,
+                "failure_rate": round(counts["failed"] / total, 4) if total else 0.0,
+                "fallback_rate": round(counts["fallback"] / total, 4) if total else 0.0,
+            }
+        return result
+
+
+class PromptCacheStats:
+    """Prompt tokens served from the provider's prompt cache, as reported in usage metadata."""
+
+    def __init__(self):
+        self.requests = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, prompt_tokens: Optional[int], cached_tokens: Optional[int]) -> None:
+        self.requests += 1
+        self.prompt_tokens += prompt_tokens or 0
+        self.cached_tokens += cached_tokens or 0
+        if cached_tokens:
+            self.cache_hits += 1
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_ratio": round(self.cached_tokens / self.prompt_tokens, 4) if self.prompt_tokens else 0.0,
+        }
+
+
+def _row(value: Any, size: int) -> list:
+    """A positional row padded (or truncated) to size fields."""
+    row = list(value) if isinstance(value, (list, tuple)) else [value]
+    return (row + [None] * size)[:size]
+
+
+def expand_compact_section(event: str, value: Any) -> dict:
+    """Expand one compact section value into its full-key form."""
+    if event == "action_item":
+        task, owner, deadline = _row(value, 3)
+        return {
+            "task": task or "",
+            "owner": owner or "Unassigned",
+            "deadline": deadline or "Not specified",
+        }
+    if event == "open_point":
+        topic, context, blocking = _row(value, 3)
+        return {"topic": topic or "", "context": context or "", "blocking": bool(blocking)}
+    if event == "follow_up_assessment":
+        needed, reason, topics = _row(value, 3)
+        return {"follow_up_needed": bool(needed), "reason": reason or "", "suggested_topics": list(topics or [])}
+    if event == "fruitfulness":
+        score, explanation = _row(value, 2)
+        score = max(0, min(100, int(score or 0)))
+        return {"score": score, "verdict": verdict_for_score(score), "explanation": explanation or ""}
+    raise ValueError(f"Unknown analysis section: {event}")
+
+
+def expand_compact_analysis(data: dict) -> dict:
+    """Expand a compact model reply into the regular analysis JSON."""
+    return {
+        "action_items": [expand_compact_section("action_item", row) for row in data.get("a") or []],
+        "open_points": [expand_compact_section("open_point", row) for row in data.get("o") or []],
+        "follow_up_assessment": expand_compact_section("follow_up_assessment", data.get("f")),
+        "fruitfulness": expand_compact_section("fruitfulness", data.get("s")),
+    }
+
+
+def compact_analysis(analysis: dict) -> dict:
+    """Encode a regular analysis in the compact format (the inverse of expand_compact_analysis)."""
+    follow_up = analysis["follow_up_assessment"]
+    fruitfulness = analysis["fruitfulness"]
+    return {
+        "a": [
+            [
+                item["task"],
+                "" if item["owner"] == "Unassigned" else item["owner"],
+                "" if item["deadline"] == "Not specified" else item["deadline"],
+            ]
+            for item in analysis["action_items"]
+        ],
+        "o": [[point["topic"], point["context"], int(point["blocking"])] for point in analysis["open_points"]],
+        "f": [int(follow_up["follow_up_needed"]), follow_up["reason"], follow_up["suggested_topics"]],
+        "s": [fruitfulness["score"], fruitfulness["explanation"]],
+    }
+
+
+def analysis_parser(mode: str) -> IncrementalAnalysisParser:
+    """Incremental stream parser for the section keys of an output mode."""
+    if mode == "compact":
+        return IncrementalAnalysisParser(COMPACT_ARRAY_SECTIONS, COMPACT_OBJECT_SECTIONS)
+    return IncrementalAnalysisParser()
+
+
+def expand_section(mode: str, event: str, value: Any) -> Any:
+    """A streamed section value in full-key form, whatever the output mode."""
+    if mode == "compact":
+        return expand_compact_section(event, value)
+    return value
+
+
+def decode_analysis(response_text: str, mode: str) -> tuple[Optional[dict], str]:
+    """Decode a model reply into the regular analysis JSON.
+
+    Tolerates extra text around the JSON object and expands compact replies.
+
+    Returns:
+        Tuple of (analysis dict or None, outcome), where outcome is "parsed",
+        "fallback" (the object had to be cut out of surrounding text) or "failed".
+    """
+    outcome = "parsed"
+    try:
+        data = json.loads(response_text)
+    except json.JSONDecodeError:
+        # Try to extract JSON from response if it contains extra text
+        outcome = "fallback"
+        json_match = re.search(r'\{[\s\S]*\}', response_text)
+        try:
+            data = json.loads(json_match.group()) if json_match else None
+        except json.JSONDecodeError:
+            data = None
+    if isinstance(data, dict) and mode == "compact":
+        try:
+            data = expand_compact_analysis(data)
+        except (TypeError, ValueError):
+            data = None
+    if not isinstance(data, dict):
+        return None, "failed"
+    return data, outcome
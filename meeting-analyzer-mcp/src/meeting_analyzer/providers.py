@@ -0,0 +1,395 @@
+"""Model backends behind one provider interface.
+
+A Provider wraps one model endpoint (an Azure OpenAI deployment, Gemini on
+Vertex AI, ...) and its long-lived client. The analysis pipeline only hands
+it a provider-neutral AnalysisRequestPrompt and gets text and token usage
+back in a common shape, so caching, rate limiting, retries, hedging and
+metrics are shared by every backend. A new backend subclasses Provider and
+is added to the app's provider table.
+"""
+
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+import httpx
+from google import genai
+from google.genai import types
+from openai import APIConnectionError, AsyncAzureOpenAI, DefaultAsyncHttpxClient
+
+from meeting_analyzer.prompts import ANALYSIS_SCHEMA, openai_response_format
+
+# Sampling settings shared by all providers
+TEMPERATURE = 0.7
+TOP_P = 0.95
+
+
+@dataclass
+class AnalysisRequestPrompt:
+    """A prompt split into its static and per-request parts.
+
+    Attributes:
+        system: System instruction (empty for none).
+        instructions: Static instructions for the output mode, identical for every request.
+        body: Meeting context and transcript.
+        mode: Output mode ("prompt", "structured" or "compact").
+    """
+
+    system: str
+    instructions: str
+    body: str
+    mode: str
+
+    @property
+    def text(self) -> str:
+        """The user prompt: static instructions first, so providers can cache the prefix."""
+        return f"{self.instructions}\n\n{self.body}"
+
+
+@dataclass
+class Completion:
+    text: str
+    usage: dict = field(default_factory=dict)  # prompt_tokens, completion_tokens, cached_tokens
+
+
+class Provider(ABC):
+    """Base class for a model backend.
+
+    Args:
+        model: Model id clients select with the request's `model` field.
+        label: Human-readable model name.
+        max_concurrency: Completions allowed in flight at once.
+        rpm: Requests per minute enforced client-side (0 disables).
+        tpm: Tokens per minute enforced client-side (0 disables).
+    """
+
+    kind = "provider"
+    # SDK exception types that are transient beyond the generic timeout/5xx/429 checks
+    retryable_types: tuple[type, ...] = ()
+
+    def __init__(self, model: str, label: str, max_concurrency: int, rpm: int = 0, tpm: int = 0):
+        self.model = model
+        self.label = label
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm
+        self.tpm = tpm
+
+    @property
+    @abstractmethod
+    def ready(self) -> bool:
+        """Whether the client is configured and started."""
+
+    def missing_config(self) -> str:
+        """Why the provider is not ready, for the error returned to clients."""
+        return f"{self.label} is not configured"
+
+    async def start(self) -> None:
+        """Create the long-lived client (a no-op when credentials are missing)."""
+
+    async def close(self) -> None:
+        """Close the client and release any provider-side resources."""
+
+    @abstractmethod
+    async def complete(self, prompt: AnalysisRequestPrompt, max_tokens: int) -> Completion:
+        """Run one completion and return its full text and usage."""
+
+    @abstractmethod
+    async def open_stream(
+        self, prompt: AnalysisRequestPrompt, max_tokens: int
+    ) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        """Start a streamed completion.
+
+        Awaiting this opens the stream (so it can be retried); iterating the
+        result yields (text delta, usage) pairs, with usage set on the chunk
+        that reports it.
+        """
+
+    def info(self) -> dict:
+        """Description for the /models endpoint."""
+        return {"id": self.model, "name": self.label, "provider": self.kind, "ready": self.ready}
+
+    def stats(self) -> dict:
+        """Provider-specific metrics (empty by default)."""
+        return {}
+
+
+class AzureOpenAIProvider(Provider):
+    """One Azure OpenAI chat deployment, with a pooled HTTP client.
+
+    Args:
+        endpoint: Azure OpenAI resource endpoint.
+        deployment: Deployment name.
+        api_version: Azure OpenAI API version.
+        api_key_env: Environment variable holding the API key.
+        http_limits: Connection pool limits for the shared HTTP client.
+        http_timeout: Request timeout for the shared HTTP client.
+    """
+
+    kind = "azure_openai"
+    retryable_types = (APIConnectionError,)
+
+    def __init__(
+        self,
+        model: str,
+        label: str,
+        endpoint: str,
+        deployment: str,
+        api_version: str,
+        api_key_env: str,
+        max_concurrency: int,
+        rpm: int = 0,
+        tpm: int = 0,
+        http_limits: Optional[httpx.Limits] = None,
+        http_timeout: Optional[httpx.Timeout] = None,
+    ):
+        super().__init__(model, label, max_concurrency, rpm, tpm)
+        self.endpoint = endpoint
+        self.deployment = deployment
+        self.api_version = api_version
+        self.api_key_env = api_key_env
+        self.http_limits = http_limits or httpx.Limits()
+        self.http_timeout = http_timeout or httpx.Timeout(300, connect=10.0)
+        self.client = None
+
+    @property
+    def ready(self) -> bool:
+        return self.client is not None
+
+    def missing_config(self) -> str:
+        return f"{self.api_key_env} environment variable not set for model {self.model}"
+
+    async def start(self) -> None:
+        api_key = os.environ.get(self.api_key_env)
+        if not api_key:
+            return
+        self.client = AsyncAzureOpenAI(
+            api_key=api_key,
+            api_version=self.api_version,
+            azure_endpoint=self.endpoint,
+            http_client=DefaultAsyncHttpxClient(limits=self.http_limits, timeout=self.http_timeout),
+            max_retries=0,  # Retries are handled by the app's retry policy
+        )
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    def _request(self, prompt: AnalysisRequestPrompt, max_tokens: int) -> dict:
+        options = {}
+        if prompt.mode == "structured":
+            options["response_format"] = openai_response_format()
+        elif prompt.mode == "compact":
+            # The positional rows cannot be expressed as a strict schema; JSON mode still rules out prose
+            options["response_format"] = {"type": "json_object"}
+        messages = [{"role": "user", "content": prompt.text}]
+        if prompt.system:
+            messages.insert(0, {"role": "system", "content": prompt.system})
+        return dict(
+            model=self.deployment,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=TEMPERATURE,
+            top_p=TOP_P,
+            **options,
+        )
+
+    @staticmethod
+    def usage_tokens(usage) -> dict:
+        """Extract prompt/completion/cached token counts from an OpenAI usage object."""
+        if usage is None:
+            return {}
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+        }
+
+    async def complete(self, prompt: AnalysisRequestPrompt, max_tokens: int) -> Completion:
+        completion = await self.client.chat.completions.create(**self._request(prompt, max_tokens))
+        return Completion(completion.choices[0].message.content or "", self.usage_tokens(completion.usage))
+
+    async def open_stream(
+        self, prompt: AnalysisRequestPrompt, max_tokens: int
+    ) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        stream = await self.client.chat.completions.create(
+            **self._request(prompt, max_tokens),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        async def chunks():
+            async for chunk in stream:
+                usage = self.usage_tokens(chunk.usage) if chunk.usage else None
+                # Azure sends content-filter chunks with no choices
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                yield text or "", usage
+
+        return chunks()
+
+    def info(self) -> dict:
+        return {**super().info(), "deployment": self.deployment, "endpoint": self.endpoint}
+
+
+class GeminiProvider(Provider):
+    """Gemini on Vertex AI.
+
+    Args:
+        api_key_env: Environment variable holding the Google Cloud API key.
+        cache_instructions: Keep each output mode's static instructions in a
+            Gemini cached-content handle, so requests only send the context
+            and transcript.
+        cache_ttl_seconds: Lifetime of a cached-content handle; it is
+            recreated shortly before it expires.
+    """
+
+    kind = "gemini"
+
+    def __init__(
+        self,
+        model: str,
+        label: str,
+        max_concurrency: int,
+        rpm: int = 0,
+        tpm: int = 0,
+        api_key_env: str = "GOOGLE_CLOUD_API_KEY",
+        cache_instructions: bool = False,
+        cache_ttl_seconds: int = 3600,
+    ):
+        super().__init__(model, label, max_concurrency, rpm, tpm)
+        self.api_key_env = api_key_env
+        self.cache_instructions = cache_instructions
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.client = None
+        # (system, output mode) -> (cached content name, or None if creation failed; time to refresh it)
+        self._caches: dict[tuple[str, str], tuple[Optional[str], float]] = {}
+        self._cache_errors: dict[str, str] = {}
+        self._cache_lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.client is not None
+
+    def missing_config(self) -> str:
+        return f"{self.api_key_env} environment variable not set"
+
+    async def start(self) -> None:
+        api_key = os.environ.get(self.api_key_env)
+        if api_key:
+            self.client = genai.Client(vertexai=True, api_key=api_key)
+
+    async def close(self) -> None:
+        if self.client is None:
+            return
+        for name, _ in self._caches.values():
+            if name is not None:
+                try:
+                    await self.client.aio.caches.delete(name=name)
+                except Exception:
+                    pass  # Expires on its own after the TTL
+        self._caches.clear()
+        await self.client.aio.aclose()
+        self.client.close()
+        self.client = None
+
+    async def cached_instructions(self, prompt: AnalysisRequestPrompt) -> Optional[str]:
+        """Name of the cached content holding the prompt's static part, if enabled.
+
+        Created on first use and recreated shortly before its TTL runs out. A
+        failed creation (e.g. instructions below the model's minimum cacheable
+        size) is remembered until the next refresh; requests then send the
+        full prompt.
+        """
+        if not self.cache_instructions or self.client is None:
+            return None
+        key = (prompt.system, prompt.mode)
+        entry = self._caches.get(key)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        async with self._cache_lock:
+            entry = self._caches.get(key)
+            if entry is not None and entry[1] > time.time():
+                return entry[0]
+            try:
+                cache = await self.client.aio.caches.create(
+                    model=self.model,
+                    config=types.CreateCachedContentConfig(
+                        contents=[types.Content(role="user", parts=[types.Part(text=prompt.instructions)])],
+                        system_instruction=prompt.system or None,
+                        ttl=f"{self.cache_ttl_seconds}s",
+                        display_name=f"meeting-analysis-{prompt.mode}",
+                    ),
+                )
+                name = cache.name
+                self._cache_errors.pop(prompt.mode, None)
+            except Exception as e:
+                name = None
+                self._cache_errors[prompt.mode] = str(e)
+            # Refresh a minute before the handle expires
+            self._caches[key] = (name, time.time() + max(self.cache_ttl_seconds - 60, 60))
+            return name
+
+    def _request(self, prompt: AnalysisRequestPrompt, max_tokens: int, cached_content: Optional[str]) -> dict:
+        structured = {}
+        if prompt.mode == "structured":
+            structured = {"response_mime_type": "application/json", "response_json_schema": ANALYSIS_SCHEMA}
+        elif prompt.mode == "compact":
+            structured = {"response_mime_type": "application/json"}
+        if not cached_content and prompt.system:
+            # A cached-content handle already carries the system instruction
+            structured["system_instruction"] = prompt.system
+        # With a cached-content handle only the context and transcript are sent
+        text = prompt.body if cached_content else prompt.text
+        return dict(
+            model=self.model,
+            contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+            config=types.GenerateContentConfig(
+                temperature=TEMPERATURE,
+                top_p=TOP_P,
+                max_output_tokens=max_tokens,
+                cached_content=cached_content,
+                **structured,
+            ),
+        )
+
+    @staticmethod
+    def usage_tokens(usage_metadata) -> dict:
+        """Extract prompt/completion/cached token counts from Gemini usage metadata."""
+        if usage_metadata is None:
+            return {}
+        return {
+            "prompt_tokens": usage_metadata.prompt_token_count,
+            "completion_tokens": usage_metadata.candidates_token_count,
+            "cached_tokens": usage_metadata.cached_content_token_count or 0,
+        }
+
+    async def complete(self, prompt: AnalysisRequestPrompt, max_tokens: int) -> Completion:
+        cached_content = await self.cached_instructions(prompt)
+        response = await self.client.aio.models.generate_content(**self._request(prompt, max_tokens, cached_content))
+        return Completion(response.text or "", self.usage_tokens(response.usage_metadata))
+
+    async def open_stream(
+        self, prompt: AnalysisRequestPrompt, max_tokens: int
+    ) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        cached_content = await self.cached_instructions(prompt)
+        stream = await self.client.aio.models.generate_content_stream(
+            **self._request(prompt, max_tokens, cached_content)
+        )
+
+        async def chunks():
+            async for chunk in stream:
+                usage = self.usage_tokens(chunk.usage_metadata) if chunk.usage_metadata else None
+                yield chunk.text or "", usage
+
+        return chunks()
+
+    def stats(self) -> dict:
+        return {
+            "explicit_prompt_cache": self.cache_instructions,
+            "prompt_cache_handles": {mode: name for (_, mode), (name, _) in self._caches.items()},
+            "prompt_cache_errors": dict(self._cache_errors),
+        }
@@ -0,0 +1,129 @@
+"""Client-side request and token rate limiting per model deployment.
+
+Each deployment gets two token buckets, one for requests per minute and one
+for tokens per minute, sized to its Azure quota. Callers are admitted in FIFO
+order once both buckets have capacity; up to max_queue callers wait, and
+beyond that new callers are rejected immediately with an estimate of when to
+retry, instead of being sent on to collect a 429 from the provider.
+"""
+
+import asyncio
+import time
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the admission queue is full."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit queue is full; retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Bucket holding up to per_minute units, refilled continuously."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self._updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount units are available (0 if they are now)."""
+        self.refill()
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter with a bounded FIFO queue.
+
+    Args:
+        rpm: Requests per minute (0 disables the request limit).
+        tpm: Tokens per minute (0 disables the token limit).
+        max_queue: Callers allowed to wait for capacity at once.
+    """
+
+    def __init__(self, rpm: float, tpm: float, max_queue: int = 100):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_queue = max_queue
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        self._waiting_tokens = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _wait_time(self, tokens: int) -> float:
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens is not None:
+            waits.append(self.tokens.wait_time(tokens))
+        return max(waits)
+
+    def _retry_after(self, tokens: int) -> float:
+        """Rough time until a new caller would be admitted, given everyone already queued."""
+        waits = [1.0]
+        if self.requests is not None:
+            waits.append((self._waiting + 1) / self.requests.rate)
+        if self.tokens is not None:
+            waits.append((self._waiting_tokens + tokens) / self.tokens.rate)
+        return max(waits)
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until one request of `tokens` tokens may be sent; return the seconds waited.
+
+        Raises:
+            RateLimitExceeded: If the caller would have to queue and the queue is full.
+        """
+        if self.tokens is not None:
+            # A request larger than the whole bucket would never be admitted
+            tokens = min(tokens, int(self.tokens.capacity))
+        if self._waiting >= self.max_queue and (self._lock.locked() or self._wait_time(tokens) > 0):
+            self.rejected += 1
+            raise RateLimitExceeded(self._retry_after(tokens))
+
+        started = time.monotonic()
+        self._waiting += 1
+        self._waiting_tokens += tokens
+        try:
+            # The lock admits waiters in arrival order
+            async with self._lock:
+                while (wait := self._wait_time(tokens)) > 0:
+                    await asyncio.sleep(wait)
+                if self.requests is not None:
+                    self.requests.level -= 1
+                if self.tokens is not None:
+                    self.tokens.level -= tokens
+        finally:
+            self._waiting -= 1
+            self._waiting_tokens -= tokens
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def stats(self) -> dict:
+        """Queue depth, admission counters and wait times for the health endpoint."""
+        return {
+            "rpm": self.requests.capacity if self.requests else None,
+            "tpm": self.tokens.capacity if self.tokens else None,
+            "queued": self._waiting,
+            "queued_tokens": self._waiting_tokens,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
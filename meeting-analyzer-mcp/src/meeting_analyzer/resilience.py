@@ -0,0 +1,218 @@
+"""Retries and circuit breaking around provider calls.
+
+RetryPolicy retries transient failures (timeouts, connection errors, 408/409/429
+and 5xx responses) with exponential backoff and full jitter, waits at least as
+long as a Retry-After header asks, and never sleeps past the call's deadline.
+CircuitBreaker tracks consecutive failures per endpoint and fails fast while
+an endpoint is unhealthy, letting a single probe through after a cool-down.
+"""
+
+import asyncio
+import email.utils
+import random
+import time
+from datetime import timezone
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# 409 is a conflict on the provider's side (e.g. a lock timeout), not in the request
+RETRYABLE_STATUS = {408, 409, 429}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is temporarily unavailable (circuit open)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by a provider SDK exception, if any."""
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(exc: BaseException, retryable_types: tuple[type, ...] = ()) -> bool:
+    """Whether a failure is transient and worth retrying."""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError, ConnectionError) + retryable_types):
+        return True
+    status = status_code(exc)
+    return status is not None and (status in RETRYABLE_STATUS or status >= 500)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header on the exception's response."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (ValueError, TypeError):
+        return None  # Neither seconds nor an HTTP date
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)  # "-0000" dates are UTC
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one endpoint.
+
+    Args:
+        name: Endpoint name used in errors and stats.
+        failure_threshold: Consecutive failures that open the circuit.
+        recovery_timeout: Seconds the circuit stays open before a probe is allowed.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> None:
+        """Let a call through, or raise CircuitOpenError while the endpoint is unhealthy."""
+        if self.state == CLOSED:
+            return
+        remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+        if self.state == OPEN and remaining <= 0:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        raise CircuitOpenError(self.name, max(remaining, 1.0))
+
+    def release(self) -> None:
+        """Give up a half-open probe slot without a verdict (e.g. the call was cancelled)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.opened += 1
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "times_opened": self.opened}
+
+
+class RetryPolicy:
+    """Retry transient failures with jittered exponential backoff within a deadline.
+
+    Args:
+        max_attempts: Total attempts per call, including the first.
+        base_delay: Backoff before the first retry, doubled for each further retry.
+        max_delay: Upper bound on a single backoff.
+        deadline: Seconds from the first attempt after which no retry is started.
+        retryable_types: Extra exception types to treat as transient.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20,
+        deadline: float = 120,
+        retryable_types: tuple[type, ...] = (),
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retryable_types = retryable_types
+        self.retries = 0
+        self.exhausted = 0
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        return is_retryable(exc, self.retryable_types)
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        breaker: Optional[CircuitBreaker] = None,
+        before_retry: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> T:
+        """Run fn, retrying transient failures; non-retryable errors propagate at once.
+
+        Args:
+            before_retry: Awaited after the backoff, before each retry (e.g. to
+                charge the retry to a rate limiter); its errors propagate as is
+        """
+        give_up_at = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.allow()
+            attempt += 1
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                # A cancelled call says nothing about the endpoint's health
+                if breaker is not None:
+                    breaker.release()
+                raise
+            except Exception as exc:
+                if not self.is_retryable(exc):
+                    # The endpoint answered; the request itself was bad
+                    if breaker is not None:
+                        breaker.record_success()
+                    raise
+                if breaker is not None:
+                    breaker.record_failure()
+                backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+                delay = max(backoff, retry_after(exc) or 0.0)
+                if attempt >= self.max_attempts or time.monotonic() + delay >= give_up_at:
+                    self.exhausted += 1
+                    raise
+                self.retries += 1
+                await asyncio.sleep(delay)
+                if before_retry is not None:
+                    await before_retry()
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    def stats(self) -> dict:
+        return {
+            "max_attempts": self.max_attempts,
+            "deadline_s": self.deadline,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
@@ -0,0 +1,228 @@
+"""Automatic model selection for `model: "auto"` requests.
+
+A transcript is routed on three cheap local features: its estimated token
+count, the number of distinct speakers and a complexity score built from
+decision, dependency and question cues. Short or simple meetings go to the
+fast model; long, many-party or decision-heavy meetings go to the stronger
+(slower) model, as long as its latency predicted from recorded completions
+stays within budget. When neither is ready, any other ready model is used.
+Optionally, very short transcripts (and every transcript while no model
+provider is ready) go to a local rule-based extractor.
+"""
+
+import re
+from collections import deque
+from typing import Optional
+
+from pydantic import BaseModel
+
+from meeting_analyzer.compaction import iter_turns
+from meeting_analyzer.tokens import count_tokens, model_spec
+
+# Words that signal decisions, trade-offs, dependencies or commitments
+_COMPLEXITY_CUES = re.compile(
+    r"\b(?:decid\w*|decision|agree\w*|trade-?offs?|architecture|design|risk\w*|blocker|blocked|"
+    r"depend\w*|migrat\w*|budget|deadline|escalat\w*|requirement\w*|option\w*|alternative\w*|"
+    r"concern\w*|approv\w*|priorit\w*|roadmap|integrat\w*|compliance|security)\b",
+    re.IGNORECASE,
+)
+
+
+class RoutingDecision(BaseModel):
+    model: str
+    reason: str
+    transcript_tokens: int
+    speakers: int
+    complexity: int  # 0-100
+
+
+def complexity_score(transcript: str, turns: int) -> int:
+    """Score how much reasoning a transcript likely needs, from 0 to 100.
+
+    Combines the density of decision/dependency cues and of questions per
+    turn; both saturate so very long transcripts do not score high on
+    length alone.
+    """
+    if turns == 0:
+        return 0
+    cues = len(_COMPLEXITY_CUES.findall(transcript))
+    questions = transcript.count("?")
+    cue_score = min(1.0, cues / turns / 0.5)
+    question_score = min(1.0, questions / turns / 0.3)
+    return round(100 * (0.7 * cue_score + 0.3 * question_score))
+
+
+class LatencyModel:
+    """Least-squares fit of latency = intercept + slope * prompt_tokens over recent samples."""
+
+    def __init__(self, window: int = 500):
+        self._samples: deque[tuple[int, float]] = deque(maxlen=window)
+
+    def observe(self, prompt_tokens: int, latency_s: float) -> None:
+        self._samples.append((prompt_tokens, latency_s))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def fit(self) -> Optional[tuple[float, float]]:
+        """Return (intercept, slope), or None without enough spread in the samples."""
+        n = len(self._samples)
+        if n < 2:
+            return None
+        mean_x = sum(x for x, _ in self._samples) / n
+        mean_y = sum(y for _, y in self._samples) / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in self._samples)
+        if var_x == 0:
+            return None
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in self._samples) / var_x
+        slope = max(slope, 0.0)
+        return mean_y - slope * mean_x, slope
+
+    def max_tokens_within(self, budget_s: float) -> Optional[int]:
+        """Largest prompt size whose predicted latency stays within budget_s."""
+        fitted = self.fit()
+        if fitted is None:
+            return None
+        intercept, slope = fitted
+        if slope == 0:
+            return None if intercept <= budget_s else 0
+        return max(0, int((budget_s - intercept) / slope))
+
+
+class ModelRouter:
+    """Route transcripts between a fast and a strong model.
+
+    Args:
+        fast_model: Model used for short or simple transcripts.
+        strong_model: Model used for long, many-party or decision-heavy transcripts.
+        small_tokens: Transcripts up to this size always go to the fast model.
+        complexity_threshold: Complexity score at which the strong model is preferred.
+        speaker_threshold: Speaker count at which the strong model is preferred.
+        latency_budget_s: Maximum predicted strong-model latency; larger
+            transcripts fall back to the fast model.
+        min_samples: Recorded completions needed before the learned latency
+            model is trusted.
+        local_model: Model id of the local extractor, if routing to it is allowed.
+        local_tokens: Transcripts up to this size go to the local model (0 = never).
+    """
+
+    def __init__(
+        self,
+        fast_model: str,
+        strong_model: str,
+        small_tokens: int = 2000,
+        complexity_threshold: int = 50,
+        speaker_threshold: int = 6,
+        latency_budget_s: float = 90,
+        min_samples: int = 20,
+        local_model: Optional[str] = None,
+        local_tokens: int = 0,
+    ):
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.small_tokens = small_tokens
+        self.complexity_threshold = complexity_threshold
+        self.speaker_threshold = speaker_threshold
+        self.latency_budget_s = latency_budget_s
+        self.min_samples = min_samples
+        self.local_model = local_model
+        self.local_tokens = local_tokens
+        self._latency = {fast_model: LatencyModel(), strong_model: LatencyModel()}
+        self._completion_tokens = {fast_model: deque(maxlen=500), strong_model: deque(maxlen=500)}
+        self.decisions: dict[str, int] = {fast_model: 0, strong_model: 0}
+        self.reasons: dict[str, int] = {}
+
+    def observe(
+        self,
+        model: str,
+        prompt_tokens: Optional[int],
+        latency_s: Optional[float],
+        completion_tokens: Optional[int] = None,
+    ) -> None:
+        """Learn from one finished completion."""
+        if model not in self._latency:
+            return
+        if prompt_tokens and latency_s is not None:
+            self._latency[model].observe(prompt_tokens, latency_s)
+        if completion_tokens:
+            self._completion_tokens[model].append(completion_tokens)
+
+    def strong_max_tokens(self) -> Optional[int]:
+        """Largest transcript the strong model is expected to finish within budget."""
+        latency = self._latency[self.strong_model]
+        if len(latency) < self.min_samples:
+            return None
+        return latency.max_tokens_within(self.latency_budget_s)
+
+    def route(self, transcript: str, ready_models: list[str], record: bool = True) -> RoutingDecision:
+        """Pick a model for a transcript among the models that are ready.
+
+        Args:
+            record: Count the decision in the routing stats (False for estimates)
+        """
+        turns = list(iter_turns(transcript.splitlines()))
+        speakers = len({speaker for speaker, _ in turns if speaker is not None})
+        complexity = complexity_score(transcript, len(turns))
+        tokens = count_tokens(transcript, self.strong_model)
+
+        def decide(model: str, reason: str) -> RoutingDecision:
+            if record:
+                self.decisions[model] = self.decisions.get(model, 0) + 1
+                self.reasons[reason] = self.reasons.get(reason, 0) + 1
+            return RoutingDecision(
+                model=model,
+                reason=reason,
+                transcript_tokens=tokens,
+                speakers=speakers,
+                complexity=complexity,
+            )
+
+        if self.local_model is not None and self.local_tokens and tokens <= self.local_tokens:
+            return decide(self.local_model, "very short transcript")
+        if self.fast_model not in ready_models and self.strong_model not in ready_models:
+            others = [model for model in ready_models if model != self.local_model]
+            if others:
+                return decide(others[0], "fast and strong models unavailable, using another ready model")
+            if self.local_model is not None:
+                return decide(self.local_model, "no model provider is ready")
+            return decide(self.fast_model, "no model provider is ready")
+        if self.strong_model not in ready_models:
+            return decide(self.fast_model, "only the fast model is available")
+        if self.fast_model not in ready_models:
+            return decide(self.strong_model, "only the strong model is available")
+        if tokens <= self.small_tokens:
+            return decide(self.fast_model, "short transcript")
+        if complexity < self.complexity_threshold and speakers < self.speaker_threshold:
+            return decide(self.fast_model, "low complexity")
+        if tokens > model_spec(self.strong_model)["context_window"] // 2:
+            return decide(self.fast_model, "too long for the strong model's context window")
+        max_tokens = self.strong_max_tokens()
+        if max_tokens is not None and tokens > max_tokens:
+            return decide(self.fast_model, "strong model predicted to exceed the latency budget")
+        return decide(self.strong_model, "complex or many-party meeting")
+
+    def stats(self) -> dict:
+        """Routing counters and the learned thresholds, for the metrics endpoint."""
+        learned = {}
+        for model, latency in self._latency.items():
+            fitted = latency.fit() if len(latency) >= self.min_samples else None
+            completions = self._completion_tokens[model]
+            learned[model] = {
+                "samples": len(latency),
+                "latency_intercept_s": round(fitted[0], 3) if fitted else None,
+                "latency_per_1k_tokens_s": round(fitted[1] * 1000, 3) if fitted else None,
+                "avg_completion_tokens": round(sum(completions) / len(completions)) if completions else None,
+            }
+        return {
+            "decisions": dict(self.decisions),
+            "reasons": dict(self.reasons),
+            "thresholds": {
+                "local_tokens": self.local_tokens,
+                "small_tokens": self.small_tokens,
+                "complexity": self.complexity_threshold,
+                "speakers": self.speaker_threshold,
+                "latency_budget_s": self.latency_budget_s,
+                "strong_max_tokens": self.strong_max_tokens(),
+            },
+            "learned": learned,
+        }
@@ -0,0 +1,1846 @@
+"""REST API for Meeting Transcript Analyzer across model providers.
+
+One process serves every configured backend (the Azure OpenAI GPT
+deployments and Gemini) through a single pipeline: requests pick a model
+per call, and caching, rate limiting, retries, hedging and metrics are
+shared.
+
+Run with: uvicorn meeting_analyzer.service:app --reload --port 8001
+
+Requires the API key of at least one provider (AZURE_OPENAI_API_KEY_GPT41,
+AZURE_OPENAI_API_KEY_GPT5 or GOOGLE_CLOUD_API_KEY) in the environment or .env file.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import uuid
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from email.utils import formatdate
+from pathlib import Path
+import httpx
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, Literal, get_args
+from dotenv import load_dotenv
+
+from meeting_analyzer.cache import (
+    AnalysisCache,
+    entity_tag,
+    etag_matches,
+    make_cache_key,
+    transcript_hash,
+    wants_no_cache,
+)
+from meeting_analyzer.chunking import make_windows, merge_analyses, segment_transcript, window_transcript
+from meeting_analyzer.compaction import (
+    CompactionStats,
+    CompactTranscript,
+    compact_transcript,
+    expand_aliases,
+    uncompacted_transcript,
+)
+from meeting_analyzer.dedup import DedupStats, dedup_captions
+from meeting_analyzer.extractor import extract_analysis
+from meeting_analyzer.ingest import CaptionStream, FrameError, decode_frame
+from meeting_analyzer.jobs import JobQueue, worker_id
+from meeting_analyzer.latency import LatencyTracker
+from meeting_analyzer.models import (
+    STREAM_EVENT_MODELS,
+    ActionItem,
+    AnalysisPrompt,
+    FollowUpAssessment,
+    MeetingFruitfulness,
+    OpenPoint,
+)
+from meeting_analyzer.prompts import (
+    ANALYSIS_INSTRUCTIONS,
+    OutputMode,
+    ParseStats,
+    PromptCacheStats,
+    analysis_parser,
+    decode_analysis,
+    expand_section,
+    request_prompt,
+)
+from meeting_analyzer.providers import AnalysisRequestPrompt, AzureOpenAIProvider, GeminiProvider, Provider
+from meeting_analyzer.ratelimit import RateLimiter, RateLimitExceeded
+from meeting_analyzer.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, retry_after, status_code
+from meeting_analyzer.routing import ModelRouter, RoutingDecision
+from meeting_analyzer.sessions import LiveSession, Segment, SessionStore
+from meeting_analyzer.singleflight import SingleFlight
+from meeting_analyzer.store import ResultStore
+from meeting_analyzer.streaming import analysis_events, format_sse
+from meeting_analyzer.tokens import TokenEstimate, count_tokens, expected_output_tokens, model_spec, plan_request
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+logger = logging.getLogger(__name__)
+
+# Analysis result cache (bump PROMPT_VERSION whenever the analysis prompts change)
+PROMPT_VERSION = "2"
+analysis_cache = AnalysisCache(
+    max_entries=int(os.environ.get("ANALYSIS_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.environ.get("ANALYSIS_CACHE_TTL_SECONDS", "3600")),
+)
+
+# Transcripts above the threshold are analyzed in overlapping windows and merged
+CHUNKING_THRESHOLD_TOKENS = int(os.environ.get("CHUNKING_THRESHOLD_TOKENS", "24000"))
+CHUNK_WINDOW_TOKENS = int(os.environ.get("CHUNK_WINDOW_TOKENS", "12000"))
+CHUNK_OVERLAP_TOKENS = int(os.environ.get("CHUNK_OVERLAP_TOKENS", "500"))
+
+# Transcripts above this size are rejected with 413 before any provider call
+MAX_TRANSCRIPT_TOKENS = int(os.environ.get("MAX_TRANSCRIPT_TOKENS", "1000000"))
+
+# Strip transcript noise and alias speaker names before building the prompt
+TRANSCRIPT_COMPACTION = os.environ.get("TRANSCRIPT_COMPACTION", "true").lower() == "true"
+compaction_stats = CompactionStats()
+
+# Collapse overlapping caption fragments (Meet re-renders and scrolls) before
+# compaction. Only applies to caption input: requests with source="captions"
+# and live sessions; other transcripts are analyzed as sent
+CAPTION_DEDUP = os.environ.get("CAPTION_DEDUP", "true").lower() == "true"
+dedup_stats = DedupStats()
+
+# "structured" sends the analysis JSON schema as response_format; "prompt" describes it in the prompt
+OUTPUT_MODE = os.environ.get("OUTPUT_MODE", "structured")
+parse_stats = ParseStats()
+
+# Prompt tokens providers served from their prompt caches
+prompt_cache_stats = PromptCacheStats()
+
+# Identical analyses running concurrently share one upstream call
+inflight = SingleFlight()
+
+# Persistent result store (SQLite, written by a background thread)
+result_store = ResultStore(
+    path=Path(os.environ.get("ANALYSIS_STORE_PATH", Path(__file__).parent.parent.parent / "analyses.db")),
+    retention_days=float(os.environ.get("ANALYSIS_STORE_RETENTION_DAYS", "30")),
+    max_rows=int(os.environ.get("ANALYSIS_STORE_MAX_ROWS", "100000")),
+    compaction_interval=float(os.environ.get("ANALYSIS_STORE_COMPACTION_INTERVAL_SECONDS", "3600")),
+)
+
+# Durable background job queue (SQLite, shared by every process using the same path)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL_SECONDS", "1"))
+job_queue = JobQueue(
+    path=Path(os.environ.get("JOB_QUEUE_PATH", Path(__file__).parent.parent.parent / "jobs.db")),
+    visibility_timeout=float(os.environ.get("JOB_VISIBILITY_TIMEOUT_SECONDS", "300")),
+    max_attempts=int(os.environ.get("JOB_MAX_ATTEMPTS", "3")),
+    retention_days=float(os.environ.get("JOB_RETENTION_DAYS", "7")),
+)
+
+
+# Azure OpenAI Configuration
+AZURE_CONFIGS = {
+    "gpt-4.1": {
+        "label": "GPT-4.1",
+        "endpoint": "https://fy26-hackon-q3.openai.azure.com/",
+        "deployment": "fy26-hackon-q3-gpt-4.1",
+        "api_version": "2025-01-01-preview",
+        "api_key_env": "AZURE_OPENAI_API_KEY_GPT41",
+        # Maximum completions in flight against this deployment
+        "max_concurrency": int(os.environ.get("AZURE_OPENAI_MAX_CONCURRENCY_GPT41", "32")),
+        # Deployment quota, enforced client-side (0 disables)
+        "rpm": int(os.environ.get("AZURE_OPENAI_RPM_GPT41", "250")),
+        "tpm": int(os.environ.get("AZURE_OPENAI_TPM_GPT41", "250000")),
+    },
+    "gpt-5": {
+        "label": "GPT-5",
+        "endpoint": "https://siddh-m9gwv1hd-eastus2.cognitiveservices.azure.com/",
+        "deployment": "hackon-fy26q3-gpt5",
+        "api_version": "2025-01-01-preview",
+        "api_key_env": "AZURE_OPENAI_API_KEY_GPT5",
+        "max_concurrency": int(os.environ.get("AZURE_OPENAI_MAX_CONCURRENCY_GPT5", "16")),
+        "rpm": int(os.environ.get("AZURE_OPENAI_RPM_GPT5", "100")),
+        "tpm": int(os.environ.get("AZURE_OPENAI_TPM_GPT5", "100000")),
+    },
+}
+
+# Model used when a request doesn't name one ("auto" routes every such request)
+ModelName = Literal["gpt-4.1", "gpt-5", "gemini-2.5-pro", "local", "auto"]
+DEFAULT_MODEL = os.environ.get("DEFAULT_MODEL", "gpt-4.1")
+if DEFAULT_MODEL not in get_args(ModelName):
+    raise ValueError(f"DEFAULT_MODEL must be one of {', '.join(get_args(ModelName))}")
+# Default model of the app serving the current request (see create_app)
+app_default_model: ContextVar[str] = ContextVar("app_default_model", default=DEFAULT_MODEL)
+
+# HTTP connection pool settings shared by every Azure OpenAI client
+AZURE_HTTP_MAX_CONNECTIONS = int(os.environ.get("AZURE_HTTP_MAX_CONNECTIONS", "500"))
+AZURE_HTTP_MAX_KEEPALIVE = int(os.environ.get("AZURE_HTTP_MAX_KEEPALIVE", "100"))
+AZURE_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("AZURE_HTTP_KEEPALIVE_EXPIRY", "60"))
+AZURE_HTTP_TIMEOUT = float(os.environ.get("AZURE_HTTP_TIMEOUT", "300"))
+
+# Gemini on Vertex AI, served alongside the Azure deployments
+GEMINI_MODEL = "gemini-2.5-pro"
+GEMINI_CONFIG = {
+    "label": "Gemini 2.5 Pro",
+    "api_key_env": "GOOGLE_CLOUD_API_KEY",
+    "max_concurrency": int(os.environ.get("GEMINI_MAX_CONCURRENCY", "64")),
+    "rpm": int(os.environ.get("GEMINI_RPM", "0")),
+    "tpm": int(os.environ.get("GEMINI_TPM", "0")),
+    # Keep the static instructions in a Gemini cached-content handle
+    "cache_instructions": os.environ.get("GEMINI_PROMPT_CACHE", "false").lower() == "true",
+    "cache_ttl_seconds": int(os.environ.get("GEMINI_PROMPT_CACHE_TTL_SECONDS", "3600")),
+}
+
+# Every backend this service can analyze with, keyed by the model id requests select
+providers: dict[str, Provider] = {
+    **{
+        model: AzureOpenAIProvider(
+            model,
+            http_limits=httpx.Limits(
+                max_connections=AZURE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=AZURE_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=AZURE_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http_timeout=httpx.Timeout(AZURE_HTTP_TIMEOUT, connect=10.0),
+            **config,
+        )
+        for model, config in AZURE_CONFIGS.items()
+    },
+    GEMINI_MODEL: GeminiProvider(GEMINI_MODEL, **GEMINI_CONFIG),
+}
+
+# Requests allowed to wait for rate-limit capacity per model before 503s
+AZURE_RATE_LIMIT_MAX_QUEUE = int(os.environ.get("AZURE_RATE_LIMIT_MAX_QUEUE", "200"))
+
+# Transient provider failures are retried with jittered backoff within the deadline;
+# a model that keeps failing is skipped until its circuit breaker recovers
+retry_policy = RetryPolicy(
+    max_attempts=int(os.environ.get("PROVIDER_MAX_ATTEMPTS", "3")),
+    base_delay=float(os.environ.get("PROVIDER_RETRY_BASE_DELAY_SECONDS", "0.5")),
+    max_delay=float(os.environ.get("PROVIDER_RETRY_MAX_DELAY_SECONDS", "20")),
+    deadline=float(os.environ.get("PROVIDER_DEADLINE_SECONDS", "120")),
+    retryable_types=tuple({t for provider in providers.values() for t in provider.retryable_types}),
+)
+circuit_breakers = {
+    model: CircuitBreaker(
+        model,
+        failure_threshold=int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5")),
+        recovery_timeout=float(os.environ.get("CIRCUIT_RECOVERY_SECONDS", "30")),
+    )
+    for model in providers
+}
+
+# Concurrency and rate limits, one per provider (populated at startup)
+semaphores: dict[str, asyncio.Semaphore] = {}
+rate_limiters: dict[str, RateLimiter] = {}
+
+# Hedging: if the primary model has not answered within the HEDGE_PERCENTILE
+# latency seen for it, the same request is also sent to another ready model
+HEDGE_REQUESTS = os.environ.get("HEDGE_REQUESTS", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_DEFAULT_DELAY_SECONDS = float(os.environ.get("HEDGE_DEFAULT_DELAY_SECONDS", "20"))
+HEDGE_MIN_DELAY_SECONDS = float(os.environ.get("HEDGE_MIN_DELAY_SECONDS", "1"))
+
+# Recent completion latencies per model, and hedging counters
+latency_tracker = LatencyTracker()
+hedge_stats = {"hedged": 0, "primary_won": 0, "secondary_won": 0}
+
+# Rule-based extractor, selected with model="local" and used instead of a
+# provider that is unavailable (circuit open, rate limited or failing)
+LOCAL_MODEL = "local"
+LOCAL_FALLBACK = os.environ.get("LOCAL_FALLBACK", "true").lower() == "true"
+local_stats = {"analyses": 0, "fallbacks": 0}
+
+# Routing for model="auto": short/simple transcripts go to gpt-4.1, complex ones
+# to gpt-5 while its latency (learned from recorded completions) stays in budget.
+# Transcripts up to AUTO_ROUTE_LOCAL_TOKENS (0 = never) go to the local extractor
+router = ModelRouter(
+    fast_model="gpt-4.1",
+    strong_model="gpt-5",
+    local_model=LOCAL_MODEL,
+    local_tokens=int(os.environ.get("AUTO_ROUTE_LOCAL_TOKENS", "0")),
+    small_tokens=int(os.environ.get("AUTO_ROUTE_SMALL_TOKENS", "2000")),
+    complexity_threshold=int(os.environ.get("AUTO_ROUTE_COMPLEXITY_THRESHOLD", "50")),
+    speaker_threshold=int(os.environ.get("AUTO_ROUTE_SPEAKER_THRESHOLD", "6")),
+    latency_budget_s=float(os.environ.get("AUTO_ROUTE_LATENCY_BUDGET_SECONDS", "90")),
+)
+
+# Maximum number of transcripts accepted by one POST /analyze/batch, and batch
+# entries (across all batches) analyzed at once. The rest wait their turn, so
+# batches never fill the rate limiters' queues that interactive requests use
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "500"))
+BATCH_MAX_IN_FLIGHT = int(os.environ.get("BATCH_MAX_IN_FLIGHT", str(max(1, AZURE_RATE_LIMIT_MAX_QUEUE // 2))))
+batch_slots: Optional[asyncio.Semaphore] = None  # Created on startup
+
+# Live sessions: segments of SESSION_SEGMENT_TOKENS are analyzed while the meeting
+# runs, so finalizing only analyzes the tail. Turns older than the last closed
+# segment are archived under SESSION_SPILL_DIR; all sessions together hold at
+# most SESSION_MEMORY_BUDGET_BYTES, beyond which (and after
+# SESSION_IDLE_TIMEOUT_SECONDS without activity) the least recently used ones
+# are spilled to disk, to be deleted after SESSION_SPILL_RETENTION_SECONDS
+SESSION_SEGMENT_TOKENS = int(os.environ.get("SESSION_SEGMENT_TOKENS", "2000"))
+SESSION_IDLE_TIMEOUT_SECONDS = float(os.environ.get("SESSION_IDLE_TIMEOUT_SECONDS", "3600"))
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.environ.get("SESSION_SWEEP_INTERVAL_SECONDS", "60"))
+session_store = SessionStore(
+    spill_dir=Path(os.environ.get("SESSION_SPILL_DIR", Path(__file__).parent.parent.parent / "sessions")),
+    memory_budget_bytes=int(os.environ.get("SESSION_MEMORY_BUDGET_BYTES", str(256 * 1024 * 1024))),
+    session_max_bytes=int(os.environ.get("SESSION_MAX_BYTES", str(1024 * 1024))),
+    idle_timeout_seconds=SESSION_IDLE_TIMEOUT_SECONDS,
+    spill_retention_seconds=float(os.environ.get("SESSION_SPILL_RETENTION_SECONDS", "86400")),
+    load_request=lambda data: TranscriptRequest(**data),
+)
+session_stats = {"opened": 0, "finalized": 0, "segments_analyzed": 0, "segment_failures": 0}
+
+# Caption WebSockets: out-of-order events held per session and the largest
+# frame accepted (in bytes, for text frames too)
+CAPTION_MAX_PENDING = int(os.environ.get("CAPTION_MAX_PENDING", "256"))
+CAPTION_MAX_FRAME_BYTES = int(os.environ.get("CAPTION_MAX_FRAME_BYTES", "65536"))
+caption_sockets: dict[str, WebSocket] = {}  # Session id -> its connected caption stream
+caption_stats = {"connections": 0, "replaced": 0, "frames": 0, "bad_frames": 0}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the provider clients, result store and job workers on startup, stop them on shutdown."""
+    for model, provider in providers.items():
+        await provider.start()
+        semaphores[model] = asyncio.Semaphore(provider.max_concurrency)
+        rate_limiters[model] = RateLimiter(provider.rpm, provider.tpm, AZURE_RATE_LIMIT_MAX_QUEUE)
+    global batch_slots
+    batch_slots = asyncio.Semaphore(BATCH_MAX_IN_FLIGHT)
+    result_store.start()
+    # Seed the router's latency models from previously stored analyses
+    for row in reversed(await asyncio.to_thread(result_store.query, limit=500)):
+        if row["latency_ms"] is not None:
+            router.observe(row["model"], row["prompt_tokens"], row["latency_ms"] / 1000, row["completion_tokens"])
+    job_queue.start()
+    workers = [asyncio.create_task(job_worker(index)) for index in range(JOB_WORKERS)]
+    await asyncio.to_thread(session_store.start)
+    workers.append(asyncio.create_task(sweep_sessions()))
+    try:
+        yield
+    finally:
+        # Jobs interrupted here are picked up again once their lease expires
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        # Unfinalized sessions are spilled so they survive a restart
+        for session in session_store.values():
+            close_caption_socket(session, "Server shutting down")
+        session_store.spill_all()
+        await asyncio.to_thread(session_store.close)
+        for provider in providers.values():
+            await provider.close()
+        semaphores.clear()
+        rate_limiters.clear()
+        await asyncio.to_thread(result_store.close)
+
+
+api_router = APIRouter()  # Endpoints; create_app() mounts them on an app
+
+
+# Request/Response models
+class TranscriptRequest(BaseModel):
+    transcript: str
+    meeting_duration_minutes: Optional[int] = None
+    meeting_booked_duration: Optional[int] = None
+    expected_attendees: Optional[int] = None
+    model: ModelName = Field(default_factory=app_default_model.get)  # "auto" picks a model from the transcript
+    hedge: Optional[bool] = None  # Back up slow calls with another model (default: HEDGE_REQUESTS)
+    output_mode: Optional[OutputMode] = None  # How the JSON shape is enforced (default: OUTPUT_MODE)
+    source: Literal["text", "captions"] = "text"  # "captions": scraped captions, de-duplicated first
+
+
+class MeetingAnalysis(BaseModel):
+    action_items: list[ActionItem]
+    open_points: list[OpenPoint]
+    follow_up_assessment: FollowUpAssessment
+    fruitfulness: MeetingFruitfulness
+    model_used: str
+    timeDifference: Optional[int] = None  # Difference between booked and actual duration (in minutes)
+    hedged: bool = False  # A backup request was sent to another model; model_used is the winner
+    fallback: bool = False  # The provider was unavailable; this is the local extractor's analysis
+    routing: Optional[RoutingDecision] = None  # Set when the request used model="auto"
+
+
+class SessionRequest(BaseModel):
+    meeting_booked_duration: Optional[int] = None
+    expected_attendees: Optional[int] = None
+    model: ModelName = Field(default_factory=app_default_model.get)
+    output_mode: Optional[OutputMode] = None
+
+
+class CaptionEntry(BaseModel):
+    speaker: str
+    text: str
+    timestamp: Optional[str] = None  # As sent by the extension; not used for analysis
+
+
+class SessionTurns(BaseModel):
+    entries: list[CaptionEntry]
+
+
+class SessionFinalize(BaseModel):
+    meeting_duration_minutes: Optional[int] = None
+
+
+class SessionStatus(BaseModel):
+    session_id: str
+    status: Literal["live", "finalizing", "finalized"]
+    model: str
+    turns: int
+    archived_turns: int  # Older turns moved from memory to disk
+    transcript_tokens: int
+    segments_closed: int
+    segments_analyzed: int
+    open_segment_tokens: int
+    bytes_held: int
+    created_at: float
+    updated_at: float
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    attempts: int = 0
+    created_at: float
+    updated_at: float
+    result: Optional[MeetingAnalysis] = None
+    error: Optional[str] = None  # Last failure, kept while a retry is pending
+
+
+def get_provider(model: str = DEFAULT_MODEL) -> Provider:
+    """Get the provider serving a model.
+    
+    Args:
+        model: Model id, e.g. "gpt-4.1", "gpt-5" or "gemini-2.5-pro"
+    """
+    if model not in providers:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid model. Choose from: {list(providers.keys())}"
+        )
+    
+    provider = providers[model]
+    if not provider.ready:
+        raise HTTPException(status_code=500, detail=provider.missing_config())
+    
+    return provider
+
+
+def ready_models() -> list[str]:
+    """Models whose provider is configured and started."""
+    return [model for model, provider in providers.items() if provider.ready]
+
+
+SYSTEM_PROMPT = "You are an expert meeting analyst. Analyze meeting transcripts and extract actionable insights in JSON format."
+
+
+def output_mode(request: TranscriptRequest) -> str:
+    return request.output_mode or OUTPUT_MODE
+
+
+def analysis_prompt(request: TranscriptRequest) -> AnalysisRequestPrompt:
+    """Build the analysis prompt for a transcript.
+    
+    The static instructions come first so every request shares a byte-identical
+    prefix (after SYSTEM_PROMPT) that provider prompt caches can reuse; the
+    meeting context and transcript follow.
+    """
+    # Add context if provided
+    context_parts = []
+    if request.meeting_booked_duration:
+        context_parts.append(f"Meeting booked duration: {request.meeting_booked_duration} minutes")
+    if request.meeting_duration_minutes:
+        context_parts.append(f"Actual meeting duration: {request.meeting_duration_minutes} minutes")
+    if request.expected_attendees:
+        context_parts.append(f"Expected attendees: {request.expected_attendees}")
+    
+    mode = output_mode(request)
+    return AnalysisRequestPrompt(
+        system=SYSTEM_PROMPT,
+        instructions=ANALYSIS_INSTRUCTIONS[mode],
+        body=request_prompt(mode, request.transcript, context_parts),
+        mode=mode,
+    )
+
+
+def build_prompt(request: TranscriptRequest) -> str:
+    """The user prompt text for a transcript."""
+    return analysis_prompt(request).text
+
+
+def parse_analysis_json(response_text: str, mode: str) -> dict:
+    """Parse the model's JSON reply, tolerating extra text around the object.
+    
+    Compact replies are expanded to the regular analysis JSON. Outcomes are
+    counted per output mode in parse_stats.
+    """
+    data, outcome = decode_analysis(response_text, mode)
+    parse_stats.record(mode, outcome)
+    if data is None:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to parse LLM response as JSON. Response: {response_text[:500]}"
+        )
+    return data
+
+
+def build_analysis(request: TranscriptRequest, analysis_data: dict) -> MeetingAnalysis:
+    """Convert parsed model output into the MeetingAnalysis response model."""
+    # Calculate time difference if both booked and actual duration are provided
+    time_difference = None
+    if request.meeting_booked_duration is not None and request.meeting_duration_minutes is not None:
+        time_difference = request.meeting_booked_duration - request.meeting_duration_minutes
+    
+    return MeetingAnalysis(
+        action_items=[
+            ActionItem(**item) for item in analysis_data.get("action_items", [])
+        ],
+        open_points=[
+            OpenPoint(**point) for point in analysis_data.get("open_points", [])
+        ],
+        follow_up_assessment=FollowUpAssessment(
+            **analysis_data.get("follow_up_assessment", {
+                "follow_up_needed": False,
+                "reason": "Unable to determine",
+                "suggested_topics": []
+            })
+        ),
+        fruitfulness=MeetingFruitfulness(
+            **analysis_data.get("fruitfulness", {
+                "score": 0,
+                "verdict": "Unable to analyze",
+                "explanation": "Analysis failed"
+            })
+        ),
+        model_used=request.model,
+        timeDifference=time_difference
+    )
+
+
+def analysis_cache_key(request: TranscriptRequest, digest: Optional[str] = None) -> str:
+    """Content-addressed cache key for a request (digest: its transcript_hash, if only that is known)."""
+    return make_cache_key(
+        request.transcript,
+        model=request.model,
+        prompt_version=f"{PROMPT_VERSION}+{output_mode(request)}"
+        + ("+compact" if TRANSCRIPT_COMPACTION else "")
+        + ("+dedup" if dedups(request) else ""),
+        meeting_duration_minutes=request.meeting_duration_minutes,
+        meeting_booked_duration=request.meeting_booked_duration,
+        expected_attendees=request.expected_attendees,
+        digest=digest,
+    )
+
+
+def dedups(request: TranscriptRequest) -> bool:
+    """Whether a request's transcript goes through caption de-duplication."""
+    return CAPTION_DEDUP and request.source == "captions"
+
+
+def dedup_transcript(request: TranscriptRequest, transcript: Optional[str] = None, record: bool = True) -> str:
+    """Run the caption de-duplication pre-pass on a request's transcript (if it applies).
+    
+    Args:
+        transcript: Text to de-duplicate instead of request.transcript, e.g. a segment
+        record: Count the words removed in the dedup stats (False for estimates)
+    """
+    transcript = request.transcript if transcript is None else transcript
+    if not dedups(request):
+        return transcript
+    deduped = dedup_captions(transcript)
+    if record:
+        dedup_stats.record(deduped)
+    return deduped.text
+
+
+def prepare_transcript(request: TranscriptRequest, record: bool = True) -> CompactTranscript:
+    """Run the de-duplication and compaction pre-passes on a request's transcript (if enabled)."""
+    transcript = dedup_transcript(request, record=record)
+    if TRANSCRIPT_COMPACTION:
+        return compact_transcript(transcript, request.model)
+    return uncompacted_transcript(transcript, request.model)
+
+
+def plan_analysis(request: TranscriptRequest, compacted: CompactTranscript) -> TokenEstimate:
+    """Estimate tokens locally and decide whether to send, chunk or reject the request."""
+    if request.model == LOCAL_MODEL:
+        # The extractor runs in-process on the uncompacted transcript, at any size
+        return TokenEstimate(
+            model=LOCAL_MODEL,
+            prompt_tokens=0,
+            transcript_tokens=compacted.tokens_before,
+            max_output_tokens=None,
+            context_window=None,
+            action="send",
+            reason="Analyzed by the local extractor: no prompt is sent and no token budget applies",
+        )
+    prompt_request = request.model_copy(update={"transcript": compacted.text})
+    prompt_tokens = count_tokens(SYSTEM_PROMPT + build_prompt(prompt_request), request.model)
+    plan = plan_request(
+        request.model,
+        prompt_tokens=prompt_tokens,
+        transcript_tokens=compacted.tokens_after,
+        chunk_threshold_tokens=CHUNKING_THRESHOLD_TOKENS,
+        window_tokens=CHUNK_WINDOW_TOKENS,
+        max_transcript_tokens=MAX_TRANSCRIPT_TOKENS,
+        overlap_tokens=CHUNK_OVERLAP_TOKENS,
+    )
+    plan.tokens_saved = compacted.tokens_saved
+    return plan
+
+
+def record_result(
+    request: TranscriptRequest,
+    cache_key: str,
+    analysis_result: MeetingAnalysis,
+    latency_ms: float,
+    usage: Optional[dict] = None,
+) -> None:
+    """Cache a finished analysis and queue it for the persistent store.
+    
+    Args:
+        usage: Token usage as {"prompt_tokens", "completion_tokens", "cached_tokens"}, if known
+    """
+    usage = usage or {}
+    analysis_cache.set(cache_key, analysis_result)
+    result_store.save({
+        "request_id": uuid.uuid4().hex,
+        "transcript_hash": transcript_hash(request.transcript),
+        "cache_key": cache_key,
+        "model": request.model,
+        "verdict": analysis_result.fruitfulness.verdict,
+        "score": analysis_result.fruitfulness.score,
+        "latency_ms": latency_ms,
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "result": analysis_result.model_dump(),
+    })
+
+
+def run_local_analysis(request: TranscriptRequest, cache_key: Optional[str] = None) -> MeetingAnalysis:
+    """Analyze a transcript with the rule-based extractor.
+    
+    Args:
+        cache_key: Key to cache and store the result under; fallback results
+            pass None so they never stand in for the requested model's analysis
+    """
+    started = time.perf_counter()
+    request = request.model_copy(update={"model": LOCAL_MODEL})
+    analysis_result = build_analysis(request, extract_analysis(dedup_transcript(request)))
+    latency_ms = (time.perf_counter() - started) * 1000
+    local_stats["analyses"] += 1
+    if cache_key is not None:
+        record_result(request, cache_key, analysis_result, latency_ms)
+    return analysis_result
+
+
+def falls_back(e: Exception, error: HTTPException) -> bool:
+    """Whether a failed provider call should be answered by the local extractor."""
+    # HTTPExceptions are our own (bad request, parse failure, full admission queue)
+    return LOCAL_FALLBACK and not isinstance(e, HTTPException) and error.status_code == 503
+
+
+def local_fallback(request: TranscriptRequest) -> MeetingAnalysis:
+    local_stats["fallbacks"] += 1
+    return run_local_analysis(request).model_copy(update={"fallback": True})
+
+
+@api_router.get("/")
+async def root():
+    """Health check endpoint."""
+    return {
+        "service": "Meeting Analyzer API",
+        "status": "running",
+        "available_models": [*providers, LOCAL_MODEL],
+        "endpoints": {
+            "POST /analyze": "Analyze a transcript and get structured JSON response",
+            "POST /analyze/stream": "Analyze a transcript and stream sections as Server-Sent Events",
+            "POST /analyze/batch": "Analyze many transcripts and stream results as NDJSON",
+            "POST /analyze/prompt": "Get the analysis prompt for a transcript (legacy)",
+            "POST /jobs": "Queue a transcript for background analysis",
+            "GET /jobs/{job_id}": "Get the status and result of a background job",
+            "POST /sessions": "Open a live meeting session",
+            "POST /sessions/{session_id}/turns": "Append caption turns to a live session",
+            "WS /sessions/{session_id}/captions": "Stream caption events into a live session",
+            "POST /sessions/{session_id}/finalize": "End a live session and get its analysis",
+            "GET /sessions/{session_id}": "Get the status of a live session",
+            "GET /analyses": "Query stored analysis results",
+            "GET /analyses/{transcript_hash}": "Get the stored analysis of a transcript by hash (ETag / If-None-Match)",
+            "GET /health": "Health check",
+            "GET /metrics": "Cache, latency, hedging and routing metrics",
+            "GET /models": "List available models"
+        }
+    }
+
+
+@api_router.get("/health")
+async def health():
+    """Health check."""
+    degraded = any(breaker.state != "closed" for breaker in circuit_breakers.values())
+    return {
+        "status": "degraded" if degraded else "healthy",
+        "available_models": [*providers, LOCAL_MODEL],
+        "ready_models": ready_models(),
+        "providers": {model: {**provider.info(), **provider.stats()} for model, provider in providers.items()},
+        "max_concurrency": {model: provider.max_concurrency for model, provider in providers.items()},
+        "rate_limits": {model: limiter.stats() for model, limiter in rate_limiters.items()},
+        "retries": retry_policy.stats(),
+        "circuit_breakers": {model: breaker.stats() for model, breaker in circuit_breakers.items()},
+        "cache": analysis_cache.stats(),
+        "inflight": inflight.stats(),
+        "store": result_store.stats(),
+        "latency": latency_tracker.stats(),
+        "hedging": {"enabled_by_default": HEDGE_REQUESTS, **hedge_stats},
+        "jobs": {"workers": JOB_WORKERS, **(await asyncio.to_thread(job_queue.stats))},
+        "compaction": compaction_stats.stats(),
+        "caption_dedup": {"enabled": CAPTION_DEDUP, **dedup_stats.stats()},
+        "parsing": parse_stats.stats(),
+        "prompt_cache": prompt_cache_stats.stats(),
+        "local": {"fallback_enabled": LOCAL_FALLBACK, **local_stats},
+        "sessions": {**session_store.stats(), "caption_sockets": len(caption_sockets), **session_stats},
+        "captions": caption_totals(),
+    }
+
+
+@api_router.get("/metrics")
+async def metrics():
+    """Cache, latency, hedging and routing metrics."""
+    return {
+        "cache": analysis_cache.stats(),
+        "inflight": inflight.stats(),
+        "compaction": compaction_stats.stats(),
+        "caption_dedup": {"enabled": CAPTION_DEDUP, **dedup_stats.stats()},
+        "parsing": parse_stats.stats(),
+        "prompt_cache": prompt_cache_stats.stats(),
+        "latency": latency_tracker.stats(),
+        "hedging": hedge_stats,
+        "rate_limits": {model: limiter.stats() for model, limiter in rate_limiters.items()},
+        "routing": router.stats(),
+        "local": local_stats,
+        "sessions": {**session_store.stats(), "caption_sockets": len(caption_sockets), **session_stats},
+        "captions": caption_totals(),
+    }
+
+
+@api_router.get("/models")
+async def list_models():
+    """List available models and their providers."""
+    local = {"id": LOCAL_MODEL, "name": "Rule-based extractor", "provider": "local", "ready": True}
+    return {"models": [*(provider.info() for provider in providers.values()), local]}
+
+
+async def admit(request: TranscriptRequest, max_tokens: int) -> None:
+    """Wait for rate-limit capacity for one completion, or fail fast with 503.
+    
+    The request is charged its estimated prompt tokens plus max_tokens, which
+    is what providers count against a tokens-per-minute quota.
+    """
+    tokens = count_tokens(SYSTEM_PROMPT + build_prompt(request), request.model) + max_tokens
+    try:
+        await rate_limiters[request.model].acquire(tokens)
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Too many queued requests for {request.model}; retry later",
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+
+
+async def generate_analysis(request: TranscriptRequest) -> tuple[dict, dict]:
+    """Run one completion for a transcript on the request's model.
+    
+    The output budget (max_tokens) is derived from the transcript size.
+    
+    Returns:
+        Tuple of (parsed analysis JSON, token usage)
+    """
+    provider = get_provider(request.model)
+    max_tokens = expected_output_tokens(request.model, count_tokens(request.transcript, request.model))
+    prompt = analysis_prompt(request)
+    
+    async def charge():
+        # Every attempt, retries included, counts against the RPM/TPM quotas
+        await admit(request, max_tokens)
+    
+    await charge()
+    
+    async def attempt():
+        # Bounded by the model's max_concurrency (not held during retry backoff)
+        async with semaphores[request.model]:
+            started = time.perf_counter()
+            completion = await provider.complete(prompt, max_tokens)
+            return completion, time.perf_counter() - started
+    
+    completion, latency = await retry_policy.call(attempt, circuit_breakers[request.model], before_retry=charge)
+    latency_tracker.record(request.model, latency)
+    usage = completion.usage
+    prompt_cache_stats.record(usage.get("prompt_tokens"), usage.get("cached_tokens"))
+    router.observe(request.model, usage.get("prompt_tokens"), latency, usage.get("completion_tokens"))
+    return parse_analysis_json(completion.text, output_mode(request)), usage
+
+
+async def generate_chunked_analysis(
+    request: TranscriptRequest, compacted: CompactTranscript
+) -> tuple[dict, dict]:
+    """Analyze a long transcript window by window and merge the results.
+    
+    Every window repeats the speaker legend so aliases stay resolvable.
+    
+    Returns:
+        Tuple of (merged analysis JSON, token usage summed over all windows)
+    """
+    windows = make_windows(compacted.body, CHUNK_WINDOW_TOKENS, CHUNK_OVERLAP_TOKENS)
+    tasks = []
+    for index, window in enumerate(windows):
+        text = window_transcript(window, index, len(windows))
+        if compacted.legend:
+            text = f"{compacted.legend}\n\n{text}"
+        tasks.append(asyncio.ensure_future(
+            generate_analysis(request.model_copy(update={"transcript": text}))
+        ))
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    
+    analysis_data = merge_analyses(
+        [data for data, _ in results],
+        weights=[count_tokens(window, request.model) for window in windows],
+    )
+    usage = {
+        "prompt_tokens": sum(u.get("prompt_tokens") or 0 for _, u in results),
+        "completion_tokens": sum(u.get("completion_tokens") or 0 for _, u in results),
+        "cached_tokens": sum(u.get("cached_tokens") or 0 for _, u in results),
+    }
+    return analysis_data, usage
+
+
+def hedge_delay(model: str) -> float:
+    """Seconds to wait for a model before hedging, from its recent latency percentile."""
+    if latency_tracker.count(model) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY_SECONDS
+    return max(HEDGE_MIN_DELAY_SECONDS, latency_tracker.percentile(model, HEDGE_PERCENTILE))
+
+
+def hedge_model(request: TranscriptRequest) -> Optional[str]:
+    """Pick the model to hedge a request against, if one is ready and fits the prompt."""
+    for model in ready_models():
+        if model == request.model:
+            continue
+        prompt_tokens = count_tokens(SYSTEM_PROMPT + build_prompt(request), model)
+        output_tokens = expected_output_tokens(model, count_tokens(request.transcript, model))
+        if prompt_tokens + output_tokens <= model_spec(model)["context_window"]:
+            return model
+    return None
+
+
+async def generate_hedged_analysis(request: TranscriptRequest) -> tuple[dict, dict, str, bool]:
+    """Run a completion, backing it up with another model if it is slow.
+    
+    The request goes to request.model first. If no answer arrives within
+    hedge_delay(), or the primary fails, the same prompt is sent to the
+    model picked by hedge_model(). The first valid (parseable) result wins and the other call
+    is cancelled.
+    
+    Returns:
+        Tuple of (parsed analysis JSON, token usage, winning model, whether a hedge was fired)
+    """
+    secondary = hedge_model(request)
+    if secondary is None:
+        analysis_data, usage = await generate_analysis(request)
+        return analysis_data, usage, request.model, False
+    
+    primary_task = asyncio.ensure_future(generate_analysis(request))
+    tasks = {primary_task: request.model}
+    try:
+        await asyncio.wait({primary_task}, timeout=hedge_delay(request.model))
+        if primary_task.done() and primary_task.exception() is None:
+            analysis_data, usage = primary_task.result()
+            return analysis_data, usage, request.model, False
+        
+        hedge_stats["hedged"] += 1
+        secondary_task = asyncio.ensure_future(
+            generate_analysis(request.model_copy(update={"model": secondary}))
+        )
+        tasks[secondary_task] = secondary
+        pending = {task for task in tasks if not task.done()}
+        while True:
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    winner = tasks[task]
+                    hedge_stats["primary_won" if winner == request.model else "secondary_won"] += 1
+                    analysis_data, usage = task.result()
+                    return analysis_data, usage, winner, True
+            if not pending:
+                # Both models failed; report the primary's error
+                raise primary_task.exception()
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def provider_error(e: Exception, model: str) -> HTTPException:
+    """Map a failed provider call to the HTTP error returned to the client."""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, CircuitOpenError):
+        return HTTPException(
+            status_code=503,
+            detail=f"The provider for {model} is unhealthy; retry later",
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    if status_code(e) == 429:
+        # Quota exhausted despite the client-side limiter (e.g. shared with other clients)
+        return HTTPException(
+            status_code=503,
+            detail=f"Provider rate limit reached for {model}",
+            headers={"Retry-After": str(math.ceil(retry_after(e) or 1))},
+        )
+    if retry_policy.is_retryable(e):
+        return HTTPException(
+            status_code=503,
+            detail=f"The provider for {model} is temporarily unavailable: {str(e)}",
+            headers={"Retry-After": "5"},
+        )
+    return HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+async def run_analysis(
+    request: TranscriptRequest,
+    cache_key: str,
+    plan: TokenEstimate,
+    compacted: CompactTranscript,
+) -> MeetingAnalysis:
+    """Call the request's provider for a transcript, parse the result and record it.
+    
+    The model sees the compacted transcript; speaker aliases in its output are
+    expanded back to full names. Transcripts the planner marks for chunking
+    are analyzed in overlapping windows and merged.
+    
+    Args:
+        request: Validated TranscriptRequest
+        cache_key: Content-addressed key the result is cached under
+        plan: Pre-flight token plan from plan_analysis()
+        compacted: Output of the compaction pre-pass for the request
+    """
+    try:
+        compaction_stats.record(compacted)
+        started = time.perf_counter()
+        hedged = False
+        if plan.action == "chunk":
+            analysis_data, usage = await generate_chunked_analysis(request, compacted)
+        else:
+            prompt_request = request.model_copy(update={"transcript": compacted.text})
+            hedge = HEDGE_REQUESTS if request.hedge is None else request.hedge
+            if hedge:
+                analysis_data, usage, winner, hedged = await generate_hedged_analysis(prompt_request)
+                # Record the result against the model that actually produced it
+                request = request.model_copy(update={"model": winner})
+            else:
+                analysis_data, usage = await generate_analysis(prompt_request)
+        latency_ms = (time.perf_counter() - started) * 1000
+        
+        analysis_data = expand_aliases(analysis_data, compacted.aliases)
+        analysis_result = build_analysis(request, analysis_data)
+        analysis_result.hedged = hedged
+        record_result(request, cache_key, analysis_result, latency_ms, usage)
+        return analysis_result
+        
+    except Exception as e:
+        error = provider_error(e, request.model)
+        if falls_back(e, error):
+            return local_fallback(request)
+        raise error
+
+
+def resolve_model(
+    request: TranscriptRequest, record: bool = True
+) -> tuple[TranscriptRequest, Optional[RoutingDecision]]:
+    """Replace model="auto" with the routed model; other requests pass through unchanged.
+    
+    Args:
+        record: Count the decision in the routing stats (False for estimates)
+    """
+    if request.model != "auto":
+        return request, None
+    decision = router.route(request.transcript, ready_models(), record=record)
+    return request.model_copy(update={"model": decision.model}), decision
+
+
+def routing_headers(decision: Optional[RoutingDecision]) -> dict[str, str]:
+    if decision is None:
+        return {}
+    return {"X-Routed-Model": decision.model, "X-Routing-Reason": decision.reason}
+
+
+async def analyze_request(
+    request: TranscriptRequest, use_cache: bool = True
+) -> tuple[MeetingAnalysis, dict[str, str]]:
+    """Analyze one transcript through the router, cache, planner and single-flight.
+    
+    Shared by /analyze, /analyze/batch and the job workers.
+    
+    Returns:
+        Tuple of (analysis, response headers describing how it was served)
+    """
+    if not request.transcript.strip():
+        raise HTTPException(status_code=400, detail="Transcript cannot be empty")
+    
+    request, decision = resolve_model(request)
+    analysis_result, headers = await analyze_routed_request(request, use_cache)
+    if decision is not None:
+        analysis_result = analysis_result.model_copy(update={"routing": decision})
+    headers.update(routing_headers(decision))
+    return analysis_result, headers
+
+
+async def analyze_routed_request(
+    request: TranscriptRequest, use_cache: bool
+) -> tuple[MeetingAnalysis, dict[str, str]]:
+    """Cache lookup, planning and single-flight for a request with a concrete model."""
+    cache_key = analysis_cache_key(request)
+    if use_cache:
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached, {"X-Cache": "HIT"}
+    if request.model == LOCAL_MODEL:
+        return run_local_analysis(request, cache_key), {"X-Cache": "MISS"}
+    
+    # Reject oversized transcripts before spending a round trip on them
+    compacted = prepare_transcript(request)
+    plan = plan_analysis(request, compacted)
+    if plan.action == "reject":
+        raise HTTPException(status_code=413, detail=plan.reason)
+    
+    # Coalesce with an identical in-flight analysis if there is one
+    headers = {
+        "X-Cache": "COALESCED" if inflight.in_flight(cache_key) else "MISS",
+        "X-Transcript-Tokens-Saved": str(compacted.tokens_saved),
+    }
+    analysis_result = await inflight.do(cache_key, lambda: run_analysis(request, cache_key, plan, compacted))
+    return analysis_result, headers
+
+
+@api_router.post("/analyze", response_model=MeetingAnalysis)
+async def analyze_transcript(
+    request: TranscriptRequest,
+    response: Response,
+    cache_control: Optional[str] = Header(None),
+):
+    """
+    Analyze a meeting transcript and return structured insights.
+    
+    This endpoint analyzes the transcript with the selected model and returns:
+    - Action items with owners and deadlines
+    - Open/unresolved points
+    - Follow-up assessment
+    - Fruitfulness score and verdict
+    
+    Identical requests are served from the analysis cache; send
+    `Cache-Control: no-cache` to force a fresh analysis. Identical requests
+    that arrive while an analysis is already running share its result.
+    
+    Args:
+        request: TranscriptRequest with transcript and optional model selection
+        cache_control: Optional Cache-Control request header
+    """
+    analysis_result, headers = await analyze_request(request, use_cache=not wants_no_cache(cache_control))
+    response.headers.update(headers)
+    return analysis_result
+
+
+async def stream_analysis(
+    request: TranscriptRequest,
+    cache_key: str,
+    plan: TokenEstimate,
+    compacted: CompactTranscript,
+    provider: Provider,
+):
+    """Stream an analysis from the request's provider as Server-Sent Events."""
+    parser = analysis_parser(output_mode(request))
+    prompt_request = request.model_copy(update={"transcript": compacted.text})
+    sent_sections = False
+    try:
+        compaction_stats.record(compacted)
+        started = time.perf_counter()
+        semaphore = semaphores[request.model]
+        
+        async def open_stream():
+            # Bounded by the model's max_concurrency (not held during retry backoff);
+            # the slot taken by the attempt that opens the stream is kept while it is read
+            await semaphore.acquire()
+            try:
+                return await provider.open_stream(analysis_prompt(prompt_request), plan.max_output_tokens)
+            except BaseException:
+                semaphore.release()
+                raise
+        
+        async def charge():
+            # The first attempt was admitted before the stream started; retries are charged here
+            await admit(prompt_request, plan.max_output_tokens)
+        
+        # Only opening the stream is retried; nothing has been sent to the client yet
+        stream = await retry_policy.call(open_stream, circuit_breakers[request.model], before_retry=charge)
+        try:
+            usage = {}
+            async for text, chunk_usage in stream:
+                if chunk_usage:
+                    usage = chunk_usage
+                if not text:
+                    continue
+                for event, data in parser.feed(text):
+                    try:
+                        data = expand_section(output_mode(request), event, data)
+                        section = STREAM_EVENT_MODELS[event](**expand_aliases(data, compacted.aliases))
+                    except (TypeError, ValueError):
+                        continue
+                    sent_sections = True
+                    yield format_sse(event, section.model_dump())
+        finally:
+            semaphore.release()
+        latency_ms = (time.perf_counter() - started) * 1000
+        prompt_cache_stats.record(usage.get("prompt_tokens"), usage.get("cached_tokens"))
+        latency_tracker.record(request.model, latency_ms / 1000)
+        router.observe(request.model, usage.get("prompt_tokens"), latency_ms / 1000, usage.get("completion_tokens"))
+        
+        analysis_data = expand_aliases(parse_analysis_json(parser.text, output_mode(request)), compacted.aliases)
+        analysis_result = build_analysis(request, analysis_data)
+        record_result(request, cache_key, analysis_result, latency_ms, usage)
+        yield format_sse("analysis", analysis_result.model_dump())
+        
+    except Exception as e:
+        error = provider_error(e, request.model)
+        if not sent_sections and falls_back(e, error):
+            async for event in replay_analysis(local_fallback(request)):
+                yield event
+            return
+        yield format_sse("error", {"status_code": error.status_code, "detail": error.detail})
+
+
+async def replay_analysis(analysis_result: MeetingAnalysis):
+    """Emit a cached analysis with the same event sequence as a live stream."""
+    data = analysis_result.model_dump()
+    for event, section in analysis_events(data):
+        yield format_sse(event, section)
+    yield format_sse("analysis", data)
+
+
+async def stream_chunked_analysis(
+    request: TranscriptRequest,
+    cache_key: str,
+    plan: TokenEstimate,
+    compacted: CompactTranscript,
+):
+    """Run a chunked analysis and emit its sections once the windows are merged."""
+    try:
+        analysis_result = await inflight.do(
+            cache_key, lambda: run_analysis(request, cache_key, plan, compacted)
+        )
+    except HTTPException as e:
+        yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+        return
+    async for event in replay_analysis(analysis_result):
+        yield event
+
+
+@api_router.post("/analyze/stream")
+async def analyze_transcript_stream(
+    request: TranscriptRequest,
+    cache_control: Optional[str] = Header(None),
+):
+    """
+    Analyze a meeting transcript and stream the result as Server-Sent Events.
+    
+    Sections are sent as soon as the model has finished generating them:
+    - `action_item` / `open_point`: one event per item
+    - `follow_up_assessment` / `fruitfulness`: one event each
+    - `analysis`: the complete MeetingAnalysis, sent last
+    - `error`: `{"status_code", "detail"}` if the analysis fails mid-stream
+    
+    Args:
+        request: TranscriptRequest with transcript and optional model selection
+        cache_control: Optional Cache-Control request header
+    """
+    if not request.transcript.strip():
+        raise HTTPException(status_code=400, detail="Transcript cannot be empty")
+    
+    request, decision = resolve_model(request)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **routing_headers(decision)}
+    cache_key = analysis_cache_key(request)
+    if not wants_no_cache(cache_control):
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            headers["X-Cache"] = "HIT"
+            return StreamingResponse(replay_analysis(cached), media_type="text/event-stream", headers=headers)
+    if request.model == LOCAL_MODEL:
+        headers["X-Cache"] = "MISS"
+        analysis_result = run_local_analysis(request, cache_key)
+        return StreamingResponse(replay_analysis(analysis_result), media_type="text/event-stream", headers=headers)
+    
+    compacted = prepare_transcript(request)
+    plan = plan_analysis(request, compacted)
+    if plan.action == "reject":
+        raise HTTPException(status_code=413, detail=plan.reason)
+    
+    headers["X-Cache"] = "MISS"
+    headers["X-Transcript-Tokens-Saved"] = str(compacted.tokens_saved)
+    if plan.action == "chunk":
+        # Windows are analyzed in parallel, so sections arrive together after the merge
+        events = stream_chunked_analysis(request, cache_key, plan, compacted)
+    else:
+        provider = get_provider(request.model)
+        # Queue for rate-limit capacity before the stream starts so a full queue is a real 503
+        await admit(request.model_copy(update={"transcript": compacted.text}), plan.max_output_tokens)
+        events = stream_analysis(request, cache_key, plan, compacted, provider)
+    return StreamingResponse(events, media_type="text/event-stream", headers=headers)
+
+
+async def analyze_batch_item(index: int, request: TranscriptRequest, use_cache: bool) -> dict:
+    """Analyze one batch entry, turning failures into a per-item error record."""
+    try:
+        async with batch_slots:
+            analysis_result, headers = await analyze_request(request, use_cache=use_cache)
+    except Exception as e:
+        error = provider_error(e, request.model)
+        return {"index": index, "status_code": error.status_code, "error": error.detail}
+    return {
+        "index": index,
+        "status_code": 200,
+        "cache": headers["X-Cache"],
+        "analysis": analysis_result.model_dump(),
+    }
+
+
+async def stream_batch(requests: list[TranscriptRequest], use_cache: bool):
+    """Yield one NDJSON line per batch entry, in completion order."""
+    tasks = [
+        asyncio.ensure_future(analyze_batch_item(index, request, use_cache))
+        for index, request in enumerate(requests)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield json.dumps(await next_done) + "\n"
+    finally:
+        # Client went away: stop the entries that have not finished
+        for task in tasks:
+            task.cancel()
+
+
+@api_router.post("/analyze/batch")
+async def analyze_batch(
+    requests: list[TranscriptRequest],
+    cache_control: Optional[str] = Header(None),
+):
+    """
+    Analyze many transcripts in one call and stream results as NDJSON.
+    
+    Entries run concurrently, bounded per model by the provider's
+    `max_concurrency`; at most BATCH_MAX_IN_FLIGHT entries of all batches
+    wait for rate-limit capacity at once, so a batch is paced by the quota
+    instead of being rejected with 503. One JSON line is written per entry as soon as it
+    finishes, so lines arrive out of order; `index` is the entry's position
+    in the request body. A failed entry produces
+    `{"index", "status_code", "error"}` without affecting the others;
+    successful entries carry `{"index", "status_code", "cache", "analysis"}`.
+    
+    Args:
+        requests: List of TranscriptRequest objects
+        cache_control: Optional Cache-Control request header, applied to every entry
+    """
+    if not requests:
+        raise HTTPException(status_code=400, detail="Batch cannot be empty")
+    if len(requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch has {len(requests)} transcripts; the limit is {BATCH_MAX_ITEMS}",
+        )
+    
+    events = stream_batch(requests, use_cache=not wants_no_cache(cache_control))
+    return StreamingResponse(events, media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+
+async def renew_job_lease(job_id: str, owner: str) -> None:
+    """Keep renewing a running job's lease until cancelled or the lease is lost."""
+    while True:
+        await asyncio.sleep(job_queue.visibility_timeout / 3)
+        if not await asyncio.to_thread(job_queue.renew, job_id, owner):
+            return
+
+
+async def process_job(job: dict, owner: str) -> None:
+    """Run one claimed job and record its outcome in the queue."""
+    heartbeat = asyncio.create_task(renew_job_lease(job["id"], owner))
+    try:
+        analysis_result, _ = await analyze_request(TranscriptRequest(**job["payload"]))
+    except HTTPException as e:
+        # Client errors (bad input, oversized transcript) will not succeed on retry
+        retry = e.status_code >= 500 or e.status_code == 429
+        await asyncio.to_thread(job_queue.fail, job["id"], owner, str(e.detail), job["attempts"], retry)
+    except Exception as e:
+        await asyncio.to_thread(job_queue.fail, job["id"], owner, f"Analysis failed: {str(e)}", job["attempts"])
+    else:
+        await asyncio.to_thread(job_queue.complete, job["id"], owner, analysis_result.model_dump())
+    finally:
+        heartbeat.cancel()
+
+
+async def job_worker(index: int) -> None:
+    """Claim and run queued jobs until cancelled."""
+    owner = worker_id(index)
+    while True:
+        try:
+            job = await asyncio.to_thread(job_queue.claim, owner)
+        except Exception:
+            job = None  # Database busy or unavailable; try again after the poll interval
+        if job is None:
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            continue
+        await process_job(job, owner)
+
+
+@api_router.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(request: TranscriptRequest):
+    """
+    Queue a transcript for background analysis and return immediately.
+    
+    Poll `GET /jobs/{job_id}` for the result. Jobs are stored in SQLite, so
+    they survive restarts and are shared by every server process pointing at
+    the same JOB_QUEUE_PATH. Failed attempts are retried with backoff.
+    
+    Args:
+        request: TranscriptRequest with transcript and optional model selection
+    """
+    if not request.transcript.strip():
+        raise HTTPException(status_code=400, detail="Transcript cannot be empty")
+    
+    job_id = await asyncio.to_thread(job_queue.submit, request.model_dump())
+    return await get_job(job_id)
+
+
+@api_router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Get the status of a background job, and its analysis once it has succeeded."""
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return JobStatus(
+        job_id=job["id"],
+        status=job["status"],
+        attempts=job["attempts"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        result=job["result"],
+        error=job["error"],
+    )
+
+
+def session_status(session: LiveSession) -> SessionStatus:
+    return SessionStatus(
+        session_id=session.id,
+        status=session.status,
+        model=session.request.model,
+        created_at=session.created_at,
+        updated_at=session.updated_at,
+        **session.stats(),
+    )
+
+
+async def get_session(session_id: str) -> LiveSession:
+    session = await session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    if session.status == "live":
+        # Analyses of a spilled session were stopped; pick them up again
+        for segment in session.segments:
+            if segment.result is None and segment.task is None and segment.text:
+                start_segment(session, segment)
+    return session
+
+
+def add_caption_counters(totals: dict, captions: CaptionStream) -> None:
+    for key, value in captions.stats().items():
+        if key not in ("acked", "pending"):
+            totals[key] = totals.get(key, 0) + value
+
+
+def caption_totals() -> dict:
+    """Caption WebSocket counters, including the ordering/dedup counters of every session."""
+    totals = dict(caption_stats)
+    for session in session_store.values():
+        if session.captions is not None:
+            add_caption_counters(totals, session.captions)
+    return totals
+
+
+def close_caption_socket(session: LiveSession, reason: str) -> None:
+    websocket = caption_sockets.pop(session.id, None)
+    if websocket is not None:
+        asyncio.ensure_future(websocket.close(code=1000, reason=reason))
+
+
+def close_session(session: LiveSession) -> None:
+    """Forget a session, stop its pending segment analyses and close its caption stream."""
+    session_store.remove(session.id)
+    if session.captions is not None:
+        add_caption_counters(caption_stats, session.captions)
+    close_caption_socket(session, "Session closed")
+
+
+async def sweep_sessions() -> None:
+    """Periodically spill idle sessions and delete expired spilled ones."""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL_SECONDS)
+        try:
+            session_store.sweep()
+        except Exception:
+            logger.exception("Session sweep failed")
+
+
+async def analyze_segment(session: LiveSession, segment: Segment) -> tuple[dict, dict]:
+    """Analyze one segment of a live session.
+    
+    Returns:
+        Tuple of (analysis JSON with speaker names restored, token usage)
+    """
+    if session.request.model == LOCAL_MODEL:
+        return extract_analysis(dedup_transcript(session.request, segment.text)), {}
+    compacted = prepare_transcript(session.request.model_copy(update={"transcript": segment.text}))
+    request = session.request.model_copy(
+        update={"transcript": segment_transcript(compacted.text, segment.index)}
+    )
+    analysis_data, usage = await generate_analysis(request)
+    return expand_aliases(analysis_data, compacted.aliases), usage
+
+
+def route_session(session: LiveSession, transcript: str) -> Optional[RoutingDecision]:
+    """Pick the model of a model="auto" session from its first content (other sessions are unchanged)."""
+    request, decision = resolve_model(session.request.model_copy(update={"transcript": transcript}))
+    session.request = session.request.model_copy(update={"model": request.model})
+    return decision
+
+
+def start_segment(session: LiveSession, segment: Segment) -> None:
+    """Analyze a closed segment in the background."""
+    # Auto sessions are routed when their first segment closes, on that segment's text
+    route_session(session, segment.text)
+    def done(task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            # Failed segments are analyzed again when the session is finalized
+            session_stats["segment_failures"] += 1
+            return
+        session_stats["segments_analyzed"] += 1
+        segment.set_result(task.result())
+        session_store.measure(session)
+    
+    segment.task = asyncio.ensure_future(analyze_segment(session, segment))
+    segment.task.add_done_callback(done)
+
+
+async def segment_result(session: LiveSession, segment: Segment) -> tuple[dict, dict]:
+    """A segment's analysis: the background (or local, for capped sessions) result if there is one, else a fresh one."""
+    if segment.result is None and segment.task is not None:
+        # Doesn't raise if the task fails or is cancelled by the session's byte cap
+        await asyncio.wait([segment.task])
+    if segment.result is not None:
+        return segment.result
+    return await analyze_segment(session, segment)
+
+
+async def finalize_session(session: LiveSession, meeting_duration_minutes: Optional[int]) -> MeetingAnalysis:
+    """Analyze the rest of a session's transcript and merge it with the segment analyses.
+    
+    Sessions that never closed a segment are analyzed like a regular /analyze
+    request (through the cache and single-flight).
+    """
+    transcript = await session_store.read_transcript(session)
+    # Auto sessions that never closed a segment are routed on the whole transcript
+    decision = route_session(session, transcript)
+    request = session.request.model_copy(
+        update={"transcript": transcript, "meeting_duration_minutes": meeting_duration_minutes}
+    )
+    if not session.segments:
+        analysis_result, _ = await analyze_routed_request(request, use_cache=True)
+        if decision is not None:
+            analysis_result = analysis_result.model_copy(update={"routing": decision})
+        return analysis_result
+    
+    segments = list(session.segments)
+    last = session.open_segment()
+    if last is not None:
+        segments.append(last)
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(segment_result(session, segment) for segment in segments))
+        latency_ms = (time.perf_counter() - started) * 1000
+        analysis_data = merge_analyses(
+            [data for data, _ in results],
+            weights=[segment.tokens for segment in segments],
+        )
+        usage = {
+            "prompt_tokens": sum(u.get("prompt_tokens") or 0 for _, u in results),
+            "completion_tokens": sum(u.get("completion_tokens") or 0 for _, u in results),
+        }
+        analysis_result = build_analysis(request, analysis_data)
+        record_result(request, analysis_cache_key(request), analysis_result, latency_ms, usage)
+        return analysis_result
+    except Exception as e:
+        error = provider_error(e, request.model)
+        if falls_back(e, error):
+            return local_fallback(request)
+        raise error
+
+
+def count_finalized(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is None:
+        session_stats["finalized"] += 1
+
+
+@api_router.post("/sessions", response_model=SessionStatus, status_code=201)
+async def open_session(request: SessionRequest):
+    """
+    Open a live analysis session for a meeting that is starting.
+    
+    Append caption turns with `POST /sessions/{session_id}/turns` while the
+    meeting runs; the transcript is analyzed segment by segment in the
+    background. `POST /sessions/{session_id}/finalize` then only has to
+    analyze the last segment before returning the merged analysis.
+    """
+    # model="auto" is resolved once there is content to route on (see route_session)
+    analysis_request = TranscriptRequest(transcript="", source="captions", **request.model_dump())
+    session = LiveSession(analysis_request, SESSION_SEGMENT_TOKENS, CHUNK_OVERLAP_TOKENS)
+    session_store.add(session)
+    session_stats["opened"] += 1
+    return session_status(session)
+
+
+def append_turns(session: LiveSession, entries: list[tuple[str, str]]) -> None:
+    """Add (speaker, text) turns to a live session and start analyzing the segments they close."""
+    if session.status != "live":
+        raise HTTPException(status_code=409, detail=f"Session {session.id} is already {session.status}")
+    entries = [(speaker.strip() or "Unknown", text.strip()) for speaker, text in entries if text.strip()]
+    for segment in session.append(entries):
+        start_segment(session, segment)
+    session_store.measure(session)
+
+
+async def finalize(session: LiveSession, meeting_duration_minutes: Optional[int]) -> MeetingAnalysis:
+    """Start (or join) a session's finalization and wait for the merged analysis."""
+    if not session.turn_count:
+        raise HTTPException(status_code=400, detail="Transcript cannot be empty")
+    if session.final_task is None:
+        session.final_task = asyncio.ensure_future(finalize_session(session, meeting_duration_minutes))
+        session.final_task.add_done_callback(count_finalized)
+    session.updated_at = time.time()
+    try:
+        return await asyncio.shield(session.final_task)
+    except HTTPException:
+        # Let the client retry the finalization
+        session.final_task = None
+        raise
+
+
+@api_router.post("/sessions/{session_id}/turns", response_model=SessionStatus)
+async def append_session_turns(session_id: str, turns: SessionTurns):
+    """
+    Append caption turns (in meeting order) to a live session.
+    
+    Entries use the extension's caption format: `{"speaker", "text", "timestamp"}`.
+    """
+    session = await get_session(session_id)
+    append_turns(session, [(entry.speaker, entry.text) for entry in turns.entries])
+    return session_status(session)
+
+
+@api_router.get("/sessions/{session_id}", response_model=SessionStatus)
+async def get_session_status(session_id: str):
+    """Get the status of a live session."""
+    return session_status(await get_session(session_id))
+
+
+@api_router.post("/sessions/{session_id}/finalize", response_model=MeetingAnalysis)
+async def finalize_session_endpoint(session_id: str, body: Optional[SessionFinalize] = None):
+    """
+    End a live session and return the analysis of the whole meeting.
+    
+    Finalizing again returns the same analysis until the session expires.
+    """
+    session = await get_session(session_id)
+    return await finalize(session, body.meeting_duration_minutes if body else None)
+
+
+@api_router.websocket("/sessions/{session_id}/captions")
+async def stream_session_captions(websocket: WebSocket, session_id: str):
+    """
+    Stream caption events into a live session over a WebSocket.
+    
+    Frames carry caption events with per-session sequence numbers, as JSON
+    (`{"seq", "speaker", "text"}` or `{"events": [...]}`) or binary records
+    (see meeting_analyzer.ingest). Events are applied in sequence order and
+    re-sent events are dropped, so after reconnecting a client can resend
+    everything after the last acknowledged sequence number.
+    
+    Server messages:
+    - `ready` / `ack`: `{"seq": last event handled, "window": out-of-order
+      events the server will still hold}`. One ack follows every frame;
+      clients should not send more than `window` events past the ack. The
+      window shrinks when the server is short of memory, and held events
+      it no longer covers are dropped: resend events past the ack that
+      are not covered by the window.
+    - `analysis`: the finalized MeetingAnalysis, in reply to
+      `{"type": "finalize", "meeting_duration_minutes": ...}`
+    - `error`: `{"status_code", "detail"}` for frames that cannot be applied
+    
+    A newer connection for the same session replaces the older one.
+    """
+    try:
+        session = await get_session(session_id)
+    except HTTPException:
+        await websocket.close(code=1008, reason="Session not found")
+        return
+    await websocket.accept()
+    previous = caption_sockets.get(session_id)
+    caption_sockets[session_id] = websocket
+    session.connected = True
+    if previous is not None:
+        caption_stats["replaced"] += 1
+        try:
+            await previous.close(code=1008, reason="Replaced by a newer connection")
+        except Exception:
+            pass  # Already gone
+    caption_stats["connections"] += 1
+    if session.captions is None:
+        session.captions = CaptionStream(CAPTION_MAX_PENDING)
+        session.captions.next_seq = session.caption_seq
+    captions = session.captions
+    
+    try:
+        await websocket.send_json({"type": "ready", "seq": captions.acked, "window": captions.window})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            frame = message.get("bytes") if message.get("bytes") is not None else message.get("text")
+            if frame is None:
+                continue
+            size = len(frame) if isinstance(frame, bytes) else len(frame.encode("utf-8"))
+            if size > CAPTION_MAX_FRAME_BYTES:
+                await websocket.close(code=1009, reason=f"Frames are limited to {CAPTION_MAX_FRAME_BYTES} bytes")
+                break
+            caption_stats["frames"] += 1
+            try:
+                events, control = decode_frame(frame)
+                if control.get("type") == "finalize":
+                    analysis_result = await finalize(session, control.get("meeting_duration_minutes"))
+                    await websocket.send_json({"type": "analysis", "analysis": analysis_result.model_dump()})
+                    continue
+                if control:
+                    raise FrameError(f"Unknown message type: {control.get('type')}")
+                if session.status != "live":
+                    raise HTTPException(status_code=409, detail=f"Session {session_id} is already {session.status}")
+                append_turns(session, [(event.speaker, event.text) for event in captions.push(events)])
+            except FrameError as e:
+                caption_stats["bad_frames"] += 1
+                await websocket.send_json({"type": "error", "status_code": 400, "detail": str(e)})
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "status_code": e.status_code, "detail": e.detail})
+            await websocket.send_json({"type": "ack", "seq": captions.acked, "window": captions.window})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if caption_sockets.get(session_id) is websocket:
+            del caption_sockets[session_id]
+            session.connected = False
+
+
+@api_router.delete("/sessions/{session_id}", status_code=204)
+async def delete_session(session_id: str):
+    """Discard a live session without analyzing it."""
+    close_session(await get_session(session_id))
+    return Response(status_code=204)
+
+
+@api_router.get("/analyses")
+async def list_analyses(
+    model: Optional[str] = None,
+    verdict: Optional[str] = None,
+    transcript_hash: Optional[str] = None,
+    since: Optional[float] = None,
+    limit: int = 50,
+):
+    """
+    Query stored analysis results, newest first.
+    
+    Args:
+        model: Only return results from this model
+        verdict: Only return results with this fruitfulness verdict
+        transcript_hash: Only return results for this transcript hash
+        since: Only return results created at or after this Unix timestamp
+        limit: Maximum number of results (1-500)
+    """
+    limit = max(1, min(limit, 500))
+    records = await asyncio.to_thread(
+        result_store.query,
+        model=model,
+        verdict=verdict,
+        transcript_hash=transcript_hash,
+        since=since,
+        limit=limit,
+    )
+    return {"analyses": records}
+
+
+@api_router.get("/analyses/{transcript_hash}", response_model=MeetingAnalysis)
+async def get_analysis_by_hash(
+    transcript_hash: str,
+    model: Optional[str] = None,
+    meeting_duration_minutes: Optional[int] = None,
+    meeting_booked_duration: Optional[int] = None,
+    expected_attendees: Optional[int] = None,
+    output_mode: Optional[OutputMode] = None,
+    source: Literal["text", "captions"] = "text",
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get the newest analysis of a transcript by its hash.
+    
+    The hash is the SHA-256 hex digest of the transcript with every run of
+    whitespace collapsed to a single space (the `transcript_hash` of stored
+    analyses), so clients can check for an existing analysis before uploading
+    the transcript to /analyze. Responses carry a strong ETag; a request
+    whose `If-None-Match` matches it gets 304 Not Modified without a body.
+    
+    Only an analysis /analyze would return from its cache for the same
+    request is returned: pass the same durations, attendees, output mode and
+    source as query parameters (omitted ones match requests that omitted them).
+    Recent analyses are answered from the in-memory cache, so they are found
+    before the result store has written them; Last-Modified and
+    X-Analysis-ID are only set once they are stored.
+    
+    Args:
+        transcript_hash: SHA-256 hex digest of the normalized transcript
+        model: Only return an analysis by this model (default: any model)
+        meeting_duration_minutes: Actual duration the analysis was requested with
+        meeting_booked_duration: Booked duration the analysis was requested with
+        expected_attendees: Expected attendees the analysis was requested with
+        output_mode: Output mode the analysis was requested with
+        source: Source the analysis was requested with ("text" or "captions")
+    """
+    transcript_hash = transcript_hash.lower()
+    if not re.fullmatch(r"[0-9a-f]{64}", transcript_hash):
+        raise HTTPException(status_code=400, detail="Transcript hash must be a SHA-256 hex digest")
+    models = [model] if model and model != "auto" else [*providers, LOCAL_MODEL]
+    context = TranscriptRequest(
+        transcript="",
+        meeting_duration_minutes=meeting_duration_minutes,
+        meeting_booked_duration=meeting_booked_duration,
+        expected_attendees=expected_attendees,
+        output_mode=output_mode,
+        source=source,
+    )
+    cache_keys = [
+        analysis_cache_key(context.model_copy(update={"model": name}), digest=transcript_hash) for name in models
+    ]
+    
+    headers = {"Cache-Control": "no-cache"}  # Clients may keep it, but revalidate: a newer analysis may be stored
+    cached = analysis_cache.newest(cache_keys)
+    if cached is not None:
+        result = cached.model_dump()
+    else:
+        records = await asyncio.to_thread(
+            result_store.query, transcript_hash=transcript_hash, cache_keys=cache_keys, limit=1
+        )
+        if not records:
+            raise HTTPException(status_code=404, detail=f"No analysis stored for transcript {transcript_hash}")
+        record = records[0]
+        result = record["result"]
+        headers["Last-Modified"] = formatdate(record["created_at"], usegmt=True)
+        headers["X-Analysis-ID"] = record["request_id"]
+    body = json.dumps(result, separators=(",", ":")).encode("utf-8")
+    headers["ETag"] = entity_tag(body)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@api_router.post("/analyze/prompt", response_model=AnalysisPrompt)
+async def get_analysis_prompt(
+    request: TranscriptRequest,
+    dry_run: bool = Query(False, description="Include the local token estimate and send/chunk/reject plan"),
+):
+    """
+    Generate an analysis prompt for a meeting transcript (legacy endpoint).
+    
+    Returns a prompt that can be sent to an LLM to analyze the meeting.
+    With `?dry_run=true` the response also includes the offline token
+    estimate and what /analyze would do with the request, without calling
+    the model.
+    """
+    if not request.transcript.strip():
+        raise HTTPException(status_code=400, detail="Transcript cannot be empty")
+    
+    # Estimating is not analyzing: routing and dedup stats are left alone
+    request, _ = resolve_model(request, record=False)
+    # A prompt sent by hand has no response_format, so it describes the JSON shape itself
+    prompt = build_prompt(request.model_copy(update={"output_mode": request.output_mode or "prompt"}))
+    
+    return AnalysisPrompt(
+        prompt=prompt,
+        instructions=f"Send this prompt to {providers[request.model].label if request.model in providers else 'an LLM'} to get the analysis",
+        estimate=plan_analysis(request, prepare_transcript(request, record=False)) if dry_run else None,
+    )
+
+
+class DefaultModelMiddleware:
+    """ASGI middleware that makes requests naming no model use the app's default."""
+
+    def __init__(self, app, default_model: str):
+        self.app = app
+        self.default_model = default_model
+
+    async def __call__(self, scope, receive, send):
+        token = app_default_model.set(self.default_model)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            app_default_model.reset(token)
+
+
+def create_app(default_model: str = DEFAULT_MODEL) -> FastAPI:
+    """Create an app serving the API.
+    
+    Apps share the providers, caches, limits and stores of this module; only
+    the model used when a request doesn't name one differs.
+    
+    Args:
+        default_model: Model for requests without one, e.g. "gpt-4.1" or "auto"
+    """
+    if default_model not in get_args(ModelName):
+        raise ValueError(f"default_model must be one of {', '.join(get_args(ModelName))}")
+    app = FastAPI(
+        title="Meeting Analyzer API",
+        description="Analyze meeting transcripts using Azure OpenAI GPT models or Gemini",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+    app.include_router(api_router)
+    app.add_middleware(DefaultModelMiddleware, default_model=default_model)
+    return app
+
+
+app = create_app()
+
+
+# Entry point for running directly
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8001)
+
@@ -0,0 +1,515 @@
+"""Live meeting sessions: incremental analysis while the meeting is running.
+
+A client opens a session when the meeting starts and appends caption turns
+as they arrive. The turns are grouped into segments on turn boundaries; once
+the open segment reaches the segment size it is closed and can be analyzed
+in the background while the meeting goes on. When the meeting ends only the
+last (open) segment is left to analyze, and the per-segment analyses are
+merged the same way chunked analysis merges windows.
+
+Like chunk windows, each segment after the first starts with the trailing
+turns of the previous one, so commitments made across a boundary are seen
+whole by at least one segment.
+
+Memory stays bounded for long meetings and many concurrent sessions:
+
+- Only the last closed segment and the open one are kept verbatim. Older
+  turns are appended to the session's archive file on disk. There is no
+  separate rolling summary: what stays in memory for archived turns is the
+  analyses of the segments they were in, which finalization merges anyway.
+  The full transcript is read back from the archive once, when the session
+  is finalized.
+- A session over its byte cap has its oldest segments still waiting for an
+  LLM analysis summarized by the local extractor, which frees their text.
+- SessionStore keeps the sessions of all meetings within a byte budget:
+  beyond it, and after the idle timeout, the least recently used sessions
+  are spilled to disk and restored when they are next used. Sessions with a
+  caption WebSocket attached stay in memory; when they alone exceed the
+  budget, their held out-of-order captions are dropped and their credit
+  window shrinks until memory is available again.
+
+Archive appends, spills, restores and deletions run in order on one I/O
+thread, so the event loop never waits on disk and a restore or transcript
+read always sees the writes queued before it.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from meeting_analyzer.extractor import extract_analysis
+from meeting_analyzer.ingest import CaptionStream
+from meeting_analyzer.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_SESSION_ID = re.compile(r"[0-9a-f]{32}")
+
+
+@dataclass
+class Segment:
+    index: int
+    text: str  # Released once the segment is analyzed
+    tokens: int  # Tokens of the segment's own turns (without the overlap), used as merge weight
+    task: Optional[asyncio.Task] = None  # Background analysis, returns (analysis JSON, usage)
+    result: Optional[tuple[dict, dict]] = None  # (analysis JSON, usage) once analyzed
+    local: bool = False  # Analyzed by the local extractor because the session hit its byte cap
+    result_bytes: int = 0
+
+    @property
+    def analyzed(self) -> bool:
+        return self.result is not None
+
+    @property
+    def size(self) -> int:
+        """Approximate bytes held by the segment's text and analysis."""
+        return len(self.text) + self.result_bytes
+
+    def set_result(self, result: tuple[dict, dict], local: bool = False) -> None:
+        self.result = result
+        self.local = local
+        self.text = ""
+        self.result_bytes = len(json.dumps(result[0]))
+
+
+class LiveSession:
+    """Turns received so far for one live meeting, cut into analyzable segments.
+
+    Args:
+        request: Analysis options (model, durations, output mode) for the meeting,
+            as a request without a transcript.
+        segment_tokens: Size at which the open segment is closed.
+        overlap_tokens: Trailing turns of the previous segment repeated at the
+            start of the next one (capped at half a segment).
+    """
+
+    def __init__(self, request, segment_tokens: int, overlap_tokens: int):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.segment_tokens = segment_tokens
+        self.overlap_tokens = min(overlap_tokens, segment_tokens // 2)
+        self.turns: list[str] = []
+        self.turn_tokens: list[int] = []
+        self.segments: list[Segment] = []
+        self.open_start = 0  # First turn of the open segment
+        self.previous_start = 0  # First own turn of the last closed segment
+        self.open_tokens = 0
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.final_task: Optional[asyncio.Task] = None  # Set once finalization starts
+        self.captions: Optional[CaptionStream] = None  # WebSocket ingestion state, kept across reconnects
+        self.caption_seq = 1  # Next caption sequence number, for a session restored from disk
+        self.connected = False  # A caption WebSocket is attached; the session is not spilled
+        self.archive_path: Optional[Path] = None  # Turns moved out of memory (set by SessionStore)
+        self.archived_turns = 0
+        self.archived_tokens = 0
+
+    @property
+    def turn_count(self) -> int:
+        return self.archived_turns + len(self.turns)
+
+    @property
+    def transcript_tokens(self) -> int:
+        return self.archived_tokens + sum(self.turn_tokens)
+
+    @property
+    def bytes_held(self) -> int:
+        """Approximate memory held: verbatim turns, segment texts and analyses, and held captions."""
+        held = sum(len(turn) for turn in self.turns) + sum(segment.size for segment in self.segments)
+        if self.captions is not None:
+            held += self.captions.pending_bytes
+        return held
+
+    @property
+    def pinned(self) -> bool:
+        """Whether the session is in use and must stay in memory."""
+        return self.connected or self.status == "finalizing"
+
+    @property
+    def status(self) -> str:
+        if self.final_task is None:
+            return "live"
+        return "finalized" if self.final_task.done() else "finalizing"
+
+    def append(self, entries: list[tuple[str, str]]) -> list[Segment]:
+        """Add (speaker, text) turns and return the segments they closed."""
+        closed = []
+        for speaker, text in entries:
+            turn = f"**{speaker}:** {text}"
+            tokens = count_tokens(turn)
+            self.turns.append(turn)
+            self.turn_tokens.append(tokens)
+            self.open_tokens += tokens
+            if self.open_tokens >= self.segment_tokens:
+                closed.append(self._close_segment())
+        self.updated_at = time.time()
+        return closed
+
+    def open_segment(self) -> Optional[Segment]:
+        """The turns not yet in a closed segment, as the final segment (None if there are none)."""
+        if self.open_start >= len(self.turns):
+            return None
+        return self._segment(len(self.turns))
+
+    def _close_segment(self) -> Segment:
+        segment = self._segment(len(self.turns))
+        self.segments.append(segment)
+        self.previous_start = self.open_start
+        self.open_start = len(self.turns)
+        self.open_tokens = 0
+        return segment
+
+    def _segment(self, end: int) -> Segment:
+        # Step back over trailing turns of the previous segment that fit in the overlap budget
+        start = self.open_start
+        overlap = 0
+        while start - 1 > self.previous_start and overlap + self.turn_tokens[start - 1] <= self.overlap_tokens:
+            start -= 1
+            overlap += self.turn_tokens[start]
+        return Segment(
+            index=len(self.segments),
+            text="\n\n".join(self.turns[start:end]),
+            tokens=sum(self.turn_tokens[self.open_start:end]),
+        )
+
+    def compact(self) -> list[str]:
+        """Release the turns that no segment still needs verbatim.
+
+        The open segment's overlap reaches back no further than the start of
+        the last closed segment, so everything before it can go.
+
+        Returns:
+            The released turns, for the caller to append to the archive file
+        """
+        count = self.previous_start
+        if count <= 0 or self.archive_path is None:
+            return []
+        archived = self.turns[:count]
+        self.archived_turns += count
+        self.archived_tokens += sum(self.turn_tokens[:count])
+        del self.turns[:count]
+        del self.turn_tokens[:count]
+        self.open_start -= count
+        self.previous_start = 0
+        return archived
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.turn_count,
+            "archived_turns": self.archived_turns,
+            "transcript_tokens": self.transcript_tokens,
+            "segments_closed": len(self.segments),
+            "segments_analyzed": sum(segment.analyzed for segment in self.segments),
+            "open_segment_tokens": self.open_tokens,
+            "bytes_held": self.bytes_held,
+        }
+
+    def to_state(self) -> dict:
+        """JSON-serializable state for spilling the session to disk."""
+        return {
+            "id": self.id,
+            "request": self.request.model_dump(),
+            "segment_tokens": self.segment_tokens,
+            "overlap_tokens": self.overlap_tokens,
+            "turns": self.turns,
+            "turn_tokens": self.turn_tokens,
+            "segments": [
+                {
+                    "index": segment.index,
+                    "text": segment.text,
+                    "tokens": segment.tokens,
+                    "result": segment.result,
+                    "local": segment.local,
+                }
+                for segment in self.segments
+            ],
+            "open_start": self.open_start,
+            "previous_start": self.previous_start,
+            "open_tokens": self.open_tokens,
+            "archived_turns": self.archived_turns,
+            "archived_tokens": self.archived_tokens,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "caption_seq": self.captions.next_seq if self.captions is not None else self.caption_seq,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, load_request: Callable[[dict], Any]) -> "LiveSession":
+        """Rebuild a spilled session; segments without a result have to be analyzed again."""
+        session = cls(load_request(state["request"]), state["segment_tokens"], state["overlap_tokens"])
+        session.id = state["id"]
+        session.turns = state["turns"]
+        session.turn_tokens = state["turn_tokens"]
+        for data in state["segments"]:
+            segment = Segment(index=data["index"], text=data["text"], tokens=data["tokens"])
+            if data["result"] is not None:
+                segment.set_result(tuple(data["result"]), local=data["local"])
+            session.segments.append(segment)
+        for key in ("open_start", "previous_start", "open_tokens", "archived_turns", "archived_tokens",
+                    "created_at", "updated_at", "caption_seq"):
+            setattr(session, key, state[key])
+        return session
+
+
+def _append_turns(path: Path, turns: list[str]) -> None:
+    with open(path, "a", encoding="utf-8") as archive:
+        archive.writelines(json.dumps(turn) + "\n" for turn in turns)
+
+
+def _read_turns(path: Path, count: int) -> list[str]:
+    with open(path, encoding="utf-8") as archive:
+        return [json.loads(line) for line, _ in zip(archive, range(count))]
+
+
+def _take_state(path: Path) -> Optional[dict]:
+    """Read a spilled session's state and delete the file (None if there is none)."""
+    try:
+        state = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    path.unlink(missing_ok=True)
+    return state
+
+
+def _delete_files(*paths: Path) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _log_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logger.error("Session file operation failed", exc_info=future.exception())
+
+
+class SessionStore:
+    """Live sessions kept in memory within a byte budget, with idle ones spilled to disk.
+
+    Args:
+        spill_dir: Directory for archived turns and spilled sessions.
+        memory_budget_bytes: Bytes held by all in-memory sessions together.
+            Beyond it the least recently used sessions are spilled (finalized
+            ones are dropped; their analysis is in the cache and result store).
+        session_max_bytes: Bytes one session may hold before its unanalyzed
+            segments are summarized by the local extractor.
+        idle_timeout_seconds: Sessions idle this long are spilled (or dropped, if finalized).
+        spill_retention_seconds: Spilled sessions not used for this long are deleted.
+        load_request: Builds a session's analysis request from its spilled JSON.
+    """
+
+    def __init__(
+        self,
+        spill_dir: Union[str, Path],
+        memory_budget_bytes: int,
+        session_max_bytes: int,
+        idle_timeout_seconds: float,
+        spill_retention_seconds: float,
+        load_request: Callable[[dict], Any],
+    ):
+        self.spill_dir = Path(spill_dir)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.session_max_bytes = session_max_bytes
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.spill_retention_seconds = spill_retention_seconds
+        self.load_request = load_request
+        self._sessions: OrderedDict[str, LiveSession] = OrderedDict()  # Least recently used first
+        self._bytes: dict[str, int] = {}  # Session id -> bytes_held when last measured
+        self._spilled: dict[str, float] = {}  # Session id -> when it was spilled to disk
+        self._io: Optional[ThreadPoolExecutor] = None  # One thread, so file operations run in order
+        self.bytes_held = 0
+        self.counters = {
+            "spills": 0,
+            "restores": 0,
+            "evictions": 0,  # Spills or drops to stay within the memory budget
+            "expired": 0,  # Finalized sessions dropped and spilled sessions deleted
+            "archived_turns": 0,
+            "capped_segments": 0,
+            "shed_captions": 0,  # Held captions of pinned sessions dropped to stay within the budget
+        }
+
+    def start(self) -> None:
+        """Find the sessions spilled by a previous run and start the I/O thread. Blocking; call via a thread."""
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        for path in self.spill_dir.glob("*.json"):
+            if _SESSION_ID.fullmatch(path.stem):
+                self._spilled[path.stem] = path.stat().st_mtime
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-io")
+
+    def close(self) -> None:
+        """Wait for the queued file operations (call after spill_all). Blocking; call via a thread."""
+        if self._io is not None:
+            self._io.shutdown(wait=True)
+            self._io = None
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Queue a file operation on the I/O thread, after the ones already queued."""
+        future = self._io.submit(fn, *args)
+        future.add_done_callback(_log_failure)
+        return future
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def spilled(self) -> int:
+        """Sessions currently on disk."""
+        return len(self._spilled)
+
+    def values(self) -> list[LiveSession]:
+        return list(self._sessions.values())
+
+    def _state_path(self, session_id: str) -> Path:
+        return self.spill_dir / f"{session_id}.json"
+
+    def _archive_path(self, session_id: str) -> Path:
+        return self.spill_dir / f"{session_id}.log"
+
+    def add(self, session: LiveSession) -> None:
+        session.archive_path = self._archive_path(session.id)
+        self._sessions[session.id] = session
+        self.measure(session)
+
+    async def get(self, session_id: str) -> Optional[LiveSession]:
+        """A session by id, restoring it from disk if it was spilled."""
+        session = self._sessions.get(session_id)
+        if session is None and session_id in self._spilled:
+            state = await asyncio.wrap_future(self._io.submit(_take_state, self._state_path(session_id)))
+            # A concurrent get() may have restored it while this one waited
+            session = self._sessions.get(session_id)
+            if session is None and state is not None:
+                session = LiveSession.from_state(state, self.load_request)
+                self.counters["restores"] += 1
+                self.add(session)
+            self._spilled.pop(session_id, None)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    async def read_transcript(self, session: LiveSession) -> str:
+        """A session's whole transcript, with its archived turns read back on the I/O thread."""
+        turns = list(session.turns)
+        archived = []
+        if session.archived_turns:
+            archived = await asyncio.wrap_future(
+                self._io.submit(_read_turns, session.archive_path, session.archived_turns)
+            )
+        return "\n\n".join(archived + turns)
+
+    def measure(self, session: LiveSession) -> None:
+        """Archive a session's old turns, enforce its byte cap and re-count it against the budget."""
+        if self._sessions.get(session.id) is not session:
+            return  # Spilled or removed meanwhile
+        archived = session.compact()
+        if archived:
+            self._submit(_append_turns, session.archive_path, archived)
+            self.counters["archived_turns"] += len(archived)
+        if session.bytes_held > self.session_max_bytes:
+            self._cap(session)
+        self._recount(session)
+        for other in self.values():  # Least recently used first
+            if self.bytes_held <= self.memory_budget_bytes:
+                break
+            if other is not session and not other.pinned:
+                self._evict(other)
+                self.counters["evictions"] += 1
+        if self.bytes_held > self.memory_budget_bytes:
+            self._shed()
+        elif session.captions is not None:
+            session.captions.restore()
+
+    def _recount(self, session: LiveSession) -> None:
+        size = session.bytes_held
+        self.bytes_held += size - self._bytes.get(session.id, 0)
+        self._bytes[session.id] = size
+
+    def _shed(self) -> None:
+        """Halve the held captions (and caption windows) of sessions, least recently used first, until within the budget."""
+        for other in self.values():
+            captions = other.captions
+            while self.bytes_held > self.memory_budget_bytes and captions is not None and captions.pending:
+                shed = captions.shed
+                captions.shrink(len(captions.pending) // 2)
+                self.counters["shed_captions"] += captions.shed - shed
+                self._recount(other)
+
+    def _cap(self, session: LiveSession) -> None:
+        """Summarize unanalyzed segments locally, oldest first, until the session fits its cap."""
+        for segment in session.segments:
+            if session.bytes_held <= self.session_max_bytes:
+                break
+            if segment.result is None and segment.text:
+                if segment.task is not None:
+                    segment.task.cancel()
+                segment.set_result((extract_analysis(segment.text), {}), local=True)
+                self.counters["capped_segments"] += 1
+
+    def _forget(self, session: LiveSession) -> None:
+        self._sessions.pop(session.id, None)
+        self.bytes_held -= self._bytes.pop(session.id, 0)
+        for segment in session.segments:
+            if segment.task is not None and not segment.task.done():
+                segment.task.cancel()
+
+    def _evict(self, session: LiveSession) -> None:
+        if session.status == "finalized":
+            self.remove(session.id)
+        else:
+            self.spill(session)
+
+    def spill(self, session: LiveSession) -> None:
+        """Write a session to disk and release its memory; get() restores it."""
+        self._forget(session)
+        self._submit(self._state_path(session.id).write_text, json.dumps(session.to_state()))
+        self._spilled[session.id] = time.time()
+        self.counters["spills"] += 1
+
+    def remove(self, session_id: str) -> Optional[LiveSession]:
+        """Forget a session and delete its files."""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._forget(session)
+        self._spilled.pop(session_id, None)
+        self._submit(_delete_files, self._archive_path(session_id), self._state_path(session_id))
+        return session
+
+    def sweep(self) -> None:
+        """Evict sessions idle past the timeout and delete spilled sessions past retention."""
+        cutoff = time.time() - self.idle_timeout_seconds
+        for session in self.values():
+            if session.updated_at < cutoff and not session.pinned:
+                if session.status == "finalized":
+                    self.counters["expired"] += 1
+                self._evict(session)
+        cutoff = time.time() - self.spill_retention_seconds
+        for session_id, spilled_at in list(self._spilled.items()):
+            if spilled_at < cutoff:
+                self.remove(session_id)
+                self.counters["expired"] += 1
+        self._submit(self._delete_lost_archives, set(self._sessions) | set(self._spilled), cutoff)
+
+    def _delete_lost_archives(self, known: set[str], cutoff: float) -> None:
+        """Delete old archives of sessions that were lost (e.g. the process was killed)."""
+        for path in self.spill_dir.glob("*.log"):
+            if path.stem not in known and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+
+    def spill_all(self) -> None:
+        """Spill every unfinalized session (on shutdown) and drop the finalized ones."""
+        for session in self.values():
+            self._evict(session)
+
+    def stats(self) -> dict:
+        return {
+            "live": len(self._sessions),
+            "spilled": self.spilled,
+            "bytes_held": self.bytes_held,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            **self.counters,
+        }
@@ -0,0 +1,56 @@
+"""Single-flight coalescing of identical in-flight analyses.
+
+Concurrent callers that ask for the same key share one upstream call instead of
+each firing their own LLM request.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicate concurrent async calls by key.
+
+    The first caller for a key starts the work as a standalone task; later
+    callers await the same task. Every caller awaits through asyncio.shield, so
+    a caller that is cancelled (e.g. its client disconnected) stops waiting
+    without cancelling the shared call for the others.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        """Return True if a call for key is currently running."""
+        return key in self._tasks
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() once per key among concurrent callers and return its result."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Counters for the health endpoint."""
+        return {
+            "in_flight": len(self._tasks),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,270 @@
+"""Persistent SQLite store for analysis results.
+
+Results are queued by the request handlers and written by a background thread
+in batches, so the event loop never waits on disk I/O. The database runs in WAL
+mode so reads can proceed while the writer is committing, and a retention
+policy periodically trims old rows and reclaims space.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    request_id TEXT PRIMARY KEY,
+    transcript_hash TEXT NOT NULL,
+    cache_key TEXT,
+    created_at REAL NOT NULL,
+    model TEXT NOT NULL,
+    verdict TEXT,
+    score INTEGER,
+    latency_ms REAL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_transcript_hash ON analyses (transcript_hash);
+CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_model ON analyses (model, created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_verdict ON analyses (verdict, created_at);
+"""
+
+COLUMNS = (
+    "request_id",
+    "transcript_hash",
+    "cache_key",
+    "created_at",
+    "model",
+    "verdict",
+    "score",
+    "latency_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "result",
+)
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore:
+    """SQLite (WAL) result store with a batched background writer.
+
+    Args:
+        path: Database file location.
+        batch_size: Maximum rows committed per transaction.
+        flush_interval: Seconds the writer waits for more rows before committing.
+        retention_days: Rows older than this are deleted (0 keeps everything).
+        max_rows: Only the newest max_rows rows are kept (0 means unbounded).
+        compaction_interval: Seconds between retention/compaction passes.
+        max_queue: Rows buffered in memory before new rows are dropped.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        retention_days: float = 30,
+        max_rows: int = 100_000,
+        compaction_interval: float = 3600,
+        max_queue: int = 10_000,
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.compaction_interval = compaction_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0  # Rows lost because their batch could not be written
+        self.deleted = 0
+        self.last_compaction: Optional[float] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self) -> None:
+        """Create the schema and start the background writer thread."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            # Must be set before the journal mode and first table to take effect
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._thread = threading.Thread(
+            target=self._run, name="analysis-store-writer", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Flush pending rows and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def save(self, record: dict[str, Any]) -> None:
+        """Queue a row for writing without blocking the caller.
+
+        If the writer has fallen too far behind the row is dropped and counted.
+        """
+        row = dict(record)
+        if not isinstance(row.get("result"), str):
+            row["result"] = json.dumps(row["result"])
+        row.setdefault("created_at", time.time())
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        conn = self._connect()
+        next_compaction = time.monotonic() + self.compaction_interval
+        stopping = False
+        try:
+            while not stopping:
+                batch = []
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                    if item is _STOP:
+                        stopping = True
+                    else:
+                        batch.append(item)
+                except queue.Empty:
+                    pass
+
+                while not stopping and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                    else:
+                        batch.append(item)
+
+                # A failed batch or compaction is logged; the writer keeps going with the next one
+                if batch:
+                    try:
+                        self._write_batch(conn, batch)
+                    except Exception:
+                        self.failed += len(batch)
+                        logger.exception("Failed to write %d analyses to %s", len(batch), self.path)
+
+                if time.monotonic() >= next_compaction:
+                    try:
+                        self._compact(conn)
+                    except Exception:
+                        logger.exception("Compaction of %s failed", self.path)
+                    next_compaction = time.monotonic() + self.compaction_interval
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list[dict]) -> None:
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        rows = [tuple(row.get(column) for column in COLUMNS) for row in batch]
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO analyses ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                rows,
+            )
+        self.written += len(rows)
+
+    def _compact(self, conn: sqlite3.Connection) -> None:
+        """Apply the retention policy and give freed pages back to the OS."""
+        deleted = 0
+        with conn:
+            if self.retention_days > 0:
+                cutoff = time.time() - self.retention_days * 86400
+                deleted += conn.execute(
+                    "DELETE FROM analyses WHERE created_at < ?", (cutoff,)
+                ).rowcount
+            if self.max_rows > 0:
+                deleted += conn.execute(
+                    "DELETE FROM analyses WHERE rowid IN ("
+                    "SELECT rowid FROM analyses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                ).rowcount
+        if deleted:
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.deleted += deleted
+        self.last_compaction = time.time()
+
+    def query(
+        self,
+        model: Optional[str] = None,
+        verdict: Optional[str] = None,
+        transcript_hash: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: int = 100,
+        cache_keys: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """Return stored analyses, newest first. Blocking; call via a thread."""
+        clauses, params = [], []
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+        if verdict is not None:
+            clauses.append("verdict = ?")
+            params.append(verdict)
+        if transcript_hash is not None:
+            clauses.append("transcript_hash = ?")
+            params.append(transcript_hash)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if cache_keys is not None:
+            clauses.append(f"cache_key IN ({', '.join('?' for _ in cache_keys)})")
+            params.extend(cache_keys)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM analyses {where} ORDER BY created_at DESC LIMIT ?",
+                params,
+            ).fetchall()
+        finally:
+            conn.close()
+
+        records = []
+        for row in rows:
+            record = dict(row)
+            record["result"] = json.loads(record["result"])
+            records.append(record)
+        return records
+
+    def stats(self) -> dict:
+        """Counters for the health endpoint."""
+        return {
+            "path": str(self.path),
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "deleted_by_retention": self.deleted,
+            "last_compaction": self.last_compaction,
+        }
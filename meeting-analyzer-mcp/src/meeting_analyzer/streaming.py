@@ -0,0 +1,155 @@
+"""Incremental parsing of streamed analysis JSON into Server-Sent Events.
+
+The model streams the analysis JSON token by token. IncrementalAnalysisParser
+scans the text as it arrives and yields each section value as soon as it is
+syntactically complete, so the client can render the first action item long
+before the whole response has been generated.
+"""
+
+import json
+from typing import Any, Iterator, Optional
+
+# Top-level arrays whose elements are emitted one by one, with their event name
+ARRAY_SECTIONS = {
+    "action_items": "action_item",
+    "open_points": "open_point",
+}
+
+# Top-level objects emitted whole once closed
+OBJECT_SECTIONS = {
+    "follow_up_assessment": "follow_up_assessment",
+    "fruitfulness": "fruitfulness",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def analysis_events(analysis: dict) -> Iterator[tuple[str, Any]]:
+    """Yield the section events for an already complete analysis (e.g. a cache hit)."""
+    for key, event in ARRAY_SECTIONS.items():
+        for item in analysis.get(key, []):
+            yield event, item
+    for key, event in OBJECT_SECTIONS.items():
+        if key in analysis:
+            yield event, analysis[key]
+
+
+class IncrementalAnalysisParser:
+    """Emit completed analysis sections from a stream of JSON text chunks.
+
+    Tracks string/escape state and container nesting character by character,
+    resuming where the previous chunk stopped. Chunks are kept in a list and
+    only the value being collected stays in the scan buffer, so each chunk
+    costs time linear in its length (plus that value's), not in the whole
+    response so far. Text before the first '{' (such as a markdown code fence)
+    is ignored.
+
+    Args:
+        array_sections: Top-level keys whose array elements are emitted one by
+            one, mapped to their event name.
+        object_sections: Top-level keys whose value is emitted whole, mapped
+            to their event name.
+    """
+
+    def __init__(
+        self,
+        array_sections: dict[str, str] = ARRAY_SECTIONS,
+        object_sections: dict[str, str] = OBJECT_SECTIONS,
+    ):
+        self.array_sections = array_sections
+        self.object_sections = object_sections
+        self._chunks: list[str] = []
+        self._buffer = ""  # Text from the start of the value or key being scanned
+        self._base = 0  # Position of self._buffer[0] in the stream
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._top_key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._value_event: Optional[str] = None
+        self._value_depth = 0
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        """All the text fed so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Consume a chunk of model output and return newly completed sections."""
+        self._chunks.append(chunk)
+        events: list[tuple[str, Any]] = []
+        # Drop scanned text that no pending value or key still needs
+        keep = self._pos
+        if self._value_start is not None:
+            keep = min(keep, self._value_start)
+        if self._in_string:
+            keep = min(keep, self._string_start)
+        self._buffer = self._buffer[keep - self._base:] + chunk
+        self._base = keep
+        text, base = self._buffer, self._base
+
+        while self._pos < base + len(text) and not self._done:
+            i = self._pos
+            ch = text[i - base]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1 and self._expect_key:
+                        self._top_key = text[self._string_start + 1 - base:i - base]
+                continue
+
+            if not self._stack:
+                if ch == "{":
+                    self._stack.append("{")
+                    self._expect_key = True
+                continue
+
+            depth = len(self._stack)
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if self._value_start is None:
+                    if depth == 1 and self._top_key in self.object_sections:
+                        self._value_event = self.object_sections[self._top_key]
+                    elif depth == 2 and self._stack[-1] == "[" and self._top_key in self.array_sections:
+                        self._value_event = self.array_sections[self._top_key]
+                    if self._value_event is not None:
+                        self._value_start = i
+                        self._value_depth = depth
+                self._stack.append(ch)
+            elif ch in "}]":
+                self._stack.pop()
+                depth = len(self._stack)
+                if self._value_start is not None and depth == self._value_depth:
+                    try:
+                        events.append((self._value_event, json.loads(text[self._value_start - base:i + 1 - base])))
+                    except json.JSONDecodeError:
+                        pass
+                    self._value_start = None
+                    self._value_event = None
+                if depth == 0:
+                    self._done = True
+            elif depth == 1:
+                if ch == ",":
+                    self._expect_key = True
+                    self._top_key = None
+                elif ch == ":":
+                    self._expect_key = False
+
+        return events
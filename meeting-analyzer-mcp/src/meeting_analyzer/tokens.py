@@ -0,0 +1,131 @@
+"""Offline token estimation and pre-flight request budgeting.
+
+Estimates how many tokens a prompt will cost for a target model without any
+network call or tokenizer download, and decides before calling the provider
+whether a transcript should be sent as-is, chunked, or rejected.
+"""
+
+import re
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+# Pieces a BPE tokenizer usually keeps apart: words, short digit groups,
+# single punctuation/symbol characters, and line breaks.
+_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]|\n+")
+
+# Per-model limits and a calibration factor relative to the o200k-style estimate
+MODEL_SPECS = {
+    "gpt-4.1": {"context_window": 1_047_576, "max_output_tokens": 32_768, "ratio": 1.0, "reasoning_tokens": 0},
+    "gpt-5": {"context_window": 272_000, "max_output_tokens": 128_000, "ratio": 1.0, "reasoning_tokens": 2_048},
+    "gemini-2.5-pro": {"context_window": 1_048_576, "max_output_tokens": 65_536, "ratio": 1.1, "reasoning_tokens": 2_048},
+}
+DEFAULT_SPEC = {"context_window": 128_000, "max_output_tokens": 16_384, "ratio": 1.1, "reasoning_tokens": 0}
+
+# Output sizing: fixed JSON overhead plus a share of the transcript length
+BASE_OUTPUT_TOKENS = 768
+OUTPUT_TOKENS_PER_INPUT_TOKEN = 0.08
+MIN_OUTPUT_TOKENS = 2048
+MAX_OUTPUT_TOKENS = 8192
+
+
+def _word_tokens(length: int) -> int:
+    # Common short words are one token; longer words split roughly every 6 letters
+    return 1 if length <= 6 else 1 + (length - 1) // 6
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Estimate the token count of text for a model, in one linear pass."""
+    tokens = 0
+    for piece in _PIECE_PATTERN.findall(text):
+        first = piece[0]
+        if first.isascii() and first.isalpha():
+            tokens += _word_tokens(len(piece))
+        elif first == "\n":
+            tokens += (len(piece) + 1) // 2
+        else:
+            # Digit groups, punctuation and non-ASCII characters (accents, CJK,
+            # emoji) are roughly one token each
+            tokens += 1
+    ratio = MODEL_SPECS.get(model, DEFAULT_SPEC)["ratio"]
+    return max(1, round(tokens * ratio))
+
+
+def model_spec(model: str) -> dict:
+    """Context and output limits for a model."""
+    return MODEL_SPECS.get(model, DEFAULT_SPEC)
+
+
+def expected_output_tokens(model: str, transcript_tokens: int) -> int:
+    """Derive a max output token budget from the size of the transcript being analyzed."""
+    spec = model_spec(model)
+    expected = BASE_OUTPUT_TOKENS + int(transcript_tokens * OUTPUT_TOKENS_PER_INPUT_TOKEN)
+    budget = min(max(expected, MIN_OUTPUT_TOKENS), MAX_OUTPUT_TOKENS)
+    return min(budget + spec["reasoning_tokens"], spec["max_output_tokens"])
+
+
+class TokenEstimate(BaseModel):
+    model: str
+    prompt_tokens: int
+    transcript_tokens: int
+    max_output_tokens: Optional[int]  # None: no token budget (the local extractor)
+    context_window: Optional[int]
+    action: Literal["send", "chunk", "reject"]
+    windows: int = 1
+    reason: str
+    tokens_saved: int = 0  # removed from the transcript by the compaction pre-pass
+
+
+def plan_request(
+    model: str,
+    prompt_tokens: int,
+    transcript_tokens: int,
+    chunk_threshold_tokens: int,
+    window_tokens: int,
+    max_transcript_tokens: int,
+    overlap_tokens: int = 0,
+) -> TokenEstimate:
+    """Decide how to handle a request before any network call.
+
+    Args:
+        model: Target model
+        prompt_tokens: Estimated tokens of the full prompt (instructions + transcript)
+        transcript_tokens: Estimated tokens of the transcript alone
+        chunk_threshold_tokens: Transcripts above this are chunked
+        window_tokens: Size of each chunk window
+        overlap_tokens: Tokens repeated between consecutive windows
+        max_transcript_tokens: Transcripts above this are rejected outright
+    """
+    spec = model_spec(model)
+    max_output = expected_output_tokens(model, transcript_tokens)
+
+    def estimate(action: str, reason: str, windows: int = 1, output: int = max_output) -> TokenEstimate:
+        return TokenEstimate(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            transcript_tokens=transcript_tokens,
+            max_output_tokens=output,
+            context_window=spec["context_window"],
+            action=action,
+            windows=windows,
+            reason=reason,
+        )
+
+    if transcript_tokens > max_transcript_tokens:
+        return estimate(
+            "reject",
+            f"Transcript is about {transcript_tokens} tokens; the limit is {max_transcript_tokens}",
+        )
+
+    fits = prompt_tokens + max_output <= spec["context_window"]
+    if transcript_tokens > chunk_threshold_tokens or not fits:
+        step = max(1, window_tokens - min(overlap_tokens, window_tokens // 2))
+        windows = max(1, -(-(transcript_tokens - window_tokens) // step) + 1)
+        reason = (
+            f"Transcript exceeds the chunking threshold of {chunk_threshold_tokens} tokens"
+            if fits else
+            f"Prompt plus output would exceed the {spec['context_window']}-token context window"
+        )
+        return estimate("chunk", reason, windows, expected_output_tokens(model, window_tokens))
+
+    return estimate("send", "Fits in a single request")